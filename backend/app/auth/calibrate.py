@@ -0,0 +1,91 @@
+"""Pick password-hash cost parameters for this machine.
+
+Measures verify time for increasing cost settings and prints the strongest
+settings that stay under the target, as environment variables:
+
+    python -m app.auth.calibrate --target-ms 250
+    python -m app.auth.calibrate --scheme argon2 --memory-kib 131072
+"""
+import time
+import argparse
+import statistics
+from typing import Callable, Optional, Tuple
+
+from app.auth.utils import create_pwd_context
+from app.config import settings
+
+SAMPLE_PASSWORD = "Calibrate-Password-1!"
+
+
+def measure_verify_ms(context, samples: int) -> float:
+    hashed = context.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+        make_context: Callable[[int], object],
+        costs: range,
+        target_ms: float,
+        samples: int
+) -> Optional[Tuple[int, float]]:
+    best = None
+    for cost in costs:
+        elapsed = measure_verify_ms(make_context(cost), samples)
+        print(f"cost={cost:<3} verify={elapsed:.1f}ms")
+        if elapsed > target_ms:
+            break
+        best = (cost, elapsed)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default=settings.PASSWORD_SCHEMES[0])
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--memory-kib", type=int, default=settings.ARGON2_MEMORY_COST)
+    parser.add_argument("--parallelism", type=int, default=settings.ARGON2_PARALLELISM)
+    args = parser.parse_args()
+
+    if args.scheme == "bcrypt":
+        best = calibrate(
+            lambda rounds: create_pwd_context(["bcrypt"], bcrypt_rounds=rounds),
+            range(10, 17),
+            args.target_ms,
+            args.samples
+        )
+        env = {"BCRYPT_ROUNDS": best[0]} if best else {}
+    else:
+        best = calibrate(
+            lambda time_cost: create_pwd_context(
+                ["argon2"],
+                argon2_time_cost=time_cost,
+                argon2_memory_cost=args.memory_kib,
+                argon2_parallelism=args.parallelism
+            ),
+            range(1, 11),
+            args.target_ms,
+            args.samples
+        )
+        env = {
+            "ARGON2_TIME_COST": best[0],
+            "ARGON2_MEMORY_COST": args.memory_kib,
+            "ARGON2_PARALLELISM": args.parallelism,
+        } if best else {}
+
+    if not best:
+        print(f"Even the cheapest {args.scheme} setting exceeds {args.target_ms}ms on this machine")
+        return
+
+    print(f"\n# {args.scheme}: {best[1]:.1f}ms per verify (target {args.target_ms}ms)")
+    for name, value in env.items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
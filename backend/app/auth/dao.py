@@ -1,7 +1,78 @@
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.sql import func
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.auth.models import RefreshSessionModel
 from app.auth.schemas import RefreshSessionUpdate, RefreshSessionCreate
 from app.base_dao import BaseDAO
 
 
 class RefreshSessionDAO(BaseDAO[RefreshSessionModel, RefreshSessionCreate, RefreshSessionUpdate]):
-    model = RefreshSessionModel
\ No newline at end of file
+    model = RefreshSessionModel
+
+    @classmethod
+    async def trim_user_sessions(cls, session: AsyncSession, user_id: uuid.UUID, keep: int) -> int:
+        newest = (
+            select(RefreshSessionModel.id).
+            filter(RefreshSessionModel.user_id == user_id).
+            order_by(RefreshSessionModel.id.desc()).
+            limit(keep)
+        )
+        stmt = (
+            delete(RefreshSessionModel).
+            filter(RefreshSessionModel.user_id == user_id).
+            filter(RefreshSessionModel.id.not_in(newest.scalar_subquery()))
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    @classmethod
+    async def purge_expired(cls, session: AsyncSession, batch_size: int) -> int:
+        expired = (
+            select(RefreshSessionModel.id).
+            filter(RefreshSessionModel.expires_at <= func.now()).
+            limit(batch_size).
+            with_for_update(skip_locked=True)
+        )
+        stmt = delete(RefreshSessionModel).filter(RefreshSessionModel.id.in_(expired.scalar_subquery()))
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    @classmethod
+    async def rotate_token(
+            cls,
+            session: AsyncSession,
+            refresh_token: uuid.UUID,
+            new_refresh_token: uuid.UUID,
+            expires: timedelta
+    ) -> Optional[uuid.UUID]:
+        """Swaps the token in one ``UPDATE``, so two requests presenting the
+        same token cannot both succeed. ``None`` when the token is unknown or
+        expired."""
+        stmt = (
+            update(RefreshSessionModel).
+            filter(RefreshSessionModel.refresh_token == refresh_token).
+            filter(RefreshSessionModel.expires_at > func.now()).
+            values(
+                refresh_token=new_refresh_token,
+                expires_in=expires.total_seconds(),
+                expires_at=func.now() + expires
+            ).
+            returning(RefreshSessionModel.user_id)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def revoke_token(cls, session: AsyncSession, refresh_token: uuid.UUID) -> Optional[uuid.UUID]:
+        stmt = (
+            delete(RefreshSessionModel).
+            filter(RefreshSessionModel.refresh_token == refresh_token).
+            returning(RefreshSessionModel.user_id)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
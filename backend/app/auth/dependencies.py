@@ -2,20 +2,20 @@ from typing import Optional
 import uuid
 
 from fastapi import Depends, HTTPException, status
-import jwt
 
 from app.auth.utils import OAuth2PasswordBearerWithCookie
-from app.config import settings
+from app.auth.keys import token_keys
 from app.users.models import UserModel
 from app.users.service import UserService
 from app.exceptions import InvalidTokenException
 
 
 oauth2_scheme = OAuth2PasswordBearerWithCookie(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearerWithCookie(tokenUrl="/api/auth/login", auto_error=False)
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> Optional[UserModel]:
     try:
-        payload = jwt.decode(token, settings.SECRET, algorithms=settings.ALGORITHMS)
+        payload = token_keys.decode(token)
         user_id = payload.get("sub")
 
         if user_id is None:
@@ -31,6 +31,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Optional[User
     return current_user
 
 
+async def get_optional_user_id(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[uuid.UUID]:
+    """The user id from a valid access token, or None for anonymous callers.
+
+    Only the token is checked, without loading the user, for public
+    endpoints that merely personalise their response.
+    """
+    if token is None:
+        return None
+    try:
+        return uuid.UUID(token_keys.decode(token)["sub"])
+    except Exception:
+        return None
+
+
 async def get_current_superuser(current_user: UserModel = Depends(get_current_user)) -> UserModel:
     if not current_user.is_superuser:
         raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Not enough privileges")
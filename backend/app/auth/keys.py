@@ -0,0 +1,154 @@
+import sys
+import json
+import base64
+import hashlib
+import argparse
+import logging
+from typing import Any, Dict, List, Optional
+
+import jwt
+from jwt.algorithms import get_default_algorithms
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+
+_THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+def _load_private_key(path: str):
+    with open(path, "rb") as file:
+        return serialization.load_pem_private_key(file.read(), password=None)
+
+
+def _load_public_key(path: str):
+    with open(path, "rb") as file:
+        data = file.read()
+    if b"PRIVATE KEY" in data:
+        return serialization.load_pem_private_key(data, password=None).public_key()
+    return serialization.load_pem_public_key(data)
+
+
+def _thumbprint(jwk: Dict[str, str]) -> str:
+    # RFC 7638: SHA-256 over the required members in lexicographic order.
+    members = {name: jwk[name] for name in _THUMBPRINT_MEMBERS[jwk["kty"]]}
+    canonical = json.dumps(members, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha256(canonical.encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class TokenKeyRing:
+    """Signs and verifies JWTs for the configured algorithm.
+
+    With ``RS256``/``EdDSA`` tokens carry a ``kid`` header and the public
+    keys are published through ``jwks()``, so other services can validate
+    tokens without the signing key. Keys listed in ``JWT_PUBLIC_KEY_FILES``
+    are still accepted for verification, which is how a rotated-out key
+    keeps working until the tokens it signed expire.
+
+    Successfully decoded tokens are cached until their ``exp`` so repeated
+    requests with the same token skip signature verification.
+    """
+
+    def __init__(
+            self,
+            algorithm: str,
+            secret: str,
+            private_key_file: Optional[str] = None,
+            public_key_files: Optional[List[str]] = None,
+            cache_size: int = 0
+    ):
+        self.algorithm = algorithm
+        self.kid: Optional[str] = None
+        self.public_keys: Dict[str, Any] = {}
+        self._cache: TTLCache[dict] = TTLCache(cache_size)
+
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            self.signing_key: Any = secret
+            return
+
+        if not private_key_file:
+            raise ValueError(f"JWT_PRIVATE_KEY_FILE is required for {algorithm} tokens")
+
+        self.signing_key = _load_private_key(private_key_file)
+        public_keys = [self.signing_key.public_key()]
+        public_keys += [_load_public_key(path) for path in public_key_files or []]
+
+        for public_key in public_keys:
+            kid = _thumbprint(self._to_jwk(public_key))
+            self.public_keys.setdefault(kid, public_key)
+            if self.kid is None:
+                self.kid = kid
+        log.info("JWT signing keys loaded", extra={"algorithm": algorithm, "kid": self.kid, "keys": len(self.public_keys)})
+
+    @classmethod
+    def from_settings(cls) -> "TokenKeyRing":
+        return cls(
+            algorithm=settings.ALGORITHMS,
+            secret=settings.SECRET,
+            private_key_file=settings.JWT_PRIVATE_KEY_FILE,
+            public_key_files=settings.JWT_PUBLIC_KEY_FILES,
+            cache_size=settings.JWT_VERIFY_CACHE_SIZE
+        )
+
+    def _to_jwk(self, public_key) -> Dict[str, str]:
+        return get_default_algorithms()[self.algorithm].to_jwk(public_key, as_dict=True)
+
+    def encode(self, payload: dict) -> str:
+        headers = {"kid": self.kid} if self.kid else None
+        return jwt.encode(payload, self.signing_key, algorithm=self.algorithm, headers=headers)
+
+    def decode(self, token: str) -> dict:
+        payload = self._cache.get(token)
+        if payload is not None:
+            return dict(payload)
+
+        if self.kid is None:
+            key = self.signing_key
+        else:
+            key = self.public_keys.get(jwt.get_unverified_header(token).get("kid"))
+            if key is None:
+                raise jwt.InvalidTokenError("Unknown signing key")
+
+        payload = jwt.decode(token, key, algorithms=[self.algorithm])
+        if "exp" in payload:
+            self._cache.set(token, payload, payload["exp"])
+        return dict(payload)
+
+    def jwks(self) -> dict:
+        return {
+            "keys": [
+                {**self._to_jwk(public_key), "kid": kid, "alg": self.algorithm, "use": "sig"}
+                for kid, public_key in self.public_keys.items()
+            ]
+        }
+
+
+token_keys = TokenKeyRing.from_settings()
+
+
+def generate_private_key(algorithm: str) -> bytes:
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a PEM private key for JWT signing")
+    parser.add_argument("--algorithm", choices=ASYMMETRIC_ALGORITHMS, default="EdDSA")
+    args = parser.parse_args()
+    sys.stdout.write(generate_private_key(args.algorithm).decode())
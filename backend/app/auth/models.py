@@ -14,6 +14,7 @@ class RefreshSessionModel(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     refresh_token: Mapped[uuid.UUID] = mapped_column(UUID, index=True)
     expires_in: Mapped[int]
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), index=True)
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
 
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey("user.id", ondelete="CASCADE"))
\ No newline at end of file
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey("user.id", ondelete="CASCADE"), index=True)
\ No newline at end of file
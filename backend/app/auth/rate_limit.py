@@ -0,0 +1,191 @@
+import math
+import time
+import logging
+import ipaddress
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Tuple
+
+from fastapi import Request
+from prometheus_client import Counter
+
+from app.config import settings
+from app.exceptions import TooManyRequestsException
+
+log = logging.getLogger(__name__)
+
+LOGIN_ATTEMPTS_BLOCKED = Counter(
+    "login_attempts_blocked_total",
+    "Login attempts rejected by the rate limiter before credentials were checked",
+    ["scope"]
+)
+
+
+class BaseRateLimitStore(ABC):
+    """Token buckets keyed by an arbitrary string.
+
+    ``acquire`` takes one token from the bucket and returns 0, or returns
+    the number of seconds until a token becomes available. ``refund`` puts
+    a token taken by ``acquire`` back.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> float:
+        ...
+
+    @abstractmethod
+    async def refund(self, key: str, capacity: int) -> None:
+        ...
+
+
+class InMemoryRateLimitStore(BaseRateLimitStore):
+    """Per-process buckets, least recently used keys are evicted past ``max_keys``."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self.buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return retry_after
+
+    async def refund(self, key: str, capacity: int) -> None:
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            tokens, updated_at = bucket
+            self.buckets[key] = (min(capacity, tokens + 1), updated_at)
+
+
+_REDIS_ACQUIRE = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+_REDIS_REFUND = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens then
+    redis.call('HSET', KEYS[1], 'tokens', math.min(tonumber(ARGV[1]), tokens + 1))
+end
+"""
+
+
+class RedisRateLimitStore(BaseRateLimitStore):
+    """Buckets shared by all workers; a bucket expires once it would be full again."""
+
+    prefix = "rate_limit:"
+
+    def __init__(self, url: str):
+        from redis import asyncio as aioredis
+
+        self.redis = aioredis.from_url(url, decode_responses=True)
+        self._acquire = self.redis.register_script(_REDIS_ACQUIRE)
+        self._refund = self.redis.register_script(_REDIS_REFUND)
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> float:
+        retry_after = await self._acquire(
+            keys=[f"{self.prefix}{key}"],
+            args=[capacity, refill_per_second, time.time()]
+        )
+        return float(retry_after)
+
+    async def refund(self, key: str, capacity: int) -> None:
+        await self._refund(keys=[f"{self.prefix}{key}"], args=[capacity])
+
+
+class LoginRateLimiter:
+    """Counts failed logins per client IP and per target email.
+
+    Every attempt takes a token up front, so a burst of concurrent guesses
+    is limited before any password is checked; ``succeeded`` gives the
+    tokens back, so only failed attempts stay charged.
+    """
+
+    def __init__(self, store: BaseRateLimitStore):
+        self.store = store
+
+    @staticmethod
+    def _limits(ip: str, email: str):
+        return (
+            ("ip", ip, settings.LOGIN_RATE_LIMIT_IP_CAPACITY, settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE),
+            ("email", email.lower(), settings.LOGIN_RATE_LIMIT_EMAIL_CAPACITY, settings.LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE),
+        )
+
+    async def check(self, ip: str, email: str) -> None:
+        """Raises ``TooManyRequestsException`` when either the client IP or the
+        target email has run out of login attempts."""
+        for scope, value, capacity, per_minute in self._limits(ip, email):
+            retry_after = await self.store.acquire(f"login:{scope}:{value}", capacity, per_minute / 60)
+            if retry_after > 0:
+                LOGIN_ATTEMPTS_BLOCKED.labels(scope=scope).inc()
+                log.warning("Login attempt rate limited", extra={"scope": scope, "retry_after": retry_after})
+                raise TooManyRequestsException(math.ceil(retry_after))
+
+    async def succeeded(self, ip: str, email: str) -> None:
+        for scope, value, capacity, _ in self._limits(ip, email):
+            await self.store.refund(f"login:{scope}:{value}", capacity)
+
+
+trusted_proxies = [ipaddress.ip_network(proxy) for proxy in settings.TRUSTED_PROXIES]
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def client_ip(request: Request) -> str:
+    """The address login attempts are counted against.
+
+    Uvicorn runs with ``proxy_headers=False``, so ``request.client`` is the
+    TCP peer. Only when that peer is in ``TRUSTED_PROXIES`` is
+    ``X-Forwarded-For`` read, right to left, skipping trusted hops; the
+    first untrusted address is the client. Anything left of it could have
+    been sent by the client itself.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted(peer):
+        return peer
+
+    forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(forwarded):
+        if not _is_trusted(hop):
+            return hop
+    return forwarded[0] if forwarded else peer
+
+
+def create_login_rate_limiter(backend: str = settings.LOGIN_RATE_LIMIT_BACKEND) -> LoginRateLimiter:
+    if backend == "redis":
+        return LoginRateLimiter(RedisRateLimitStore(settings.REDIS_URL))
+    return LoginRateLimiter(InMemoryRateLimitStore(settings.LOGIN_RATE_LIMIT_MAX_KEYS))
+
+
+login_rate_limiter = create_login_rate_limiter()
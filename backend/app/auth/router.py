@@ -3,6 +3,8 @@ from fastapi import APIRouter, Depends, Request, Response, status, BackgroundTas
 from fastapi.security import  OAuth2PasswordRequestForm
 
 from app.auth.service import AuthService
+from app.auth.keys import token_keys
+from app.auth.rate_limit import client_ip, login_rate_limiter
 from app.auth.schemas import Token
 from app.auth.dependencies import get_current_active_user
 from app.users.models import UserModel
@@ -34,11 +36,19 @@ async def register(user: UserCreate) -> User:
 
 
 @router.post("/login")
-async def login(response:Response, credentials: OAuth2PasswordRequestForm = Depends()) -> Token:
-    user = await AuthService.authenticate_user(credentials.username, credentials.password)
+async def login(
+        request: Request,
+        response:Response,
+        background_tasks: BackgroundTasks,
+        credentials: OAuth2PasswordRequestForm = Depends()
+) -> Token:
+    ip = client_ip(request)
+    await login_rate_limiter.check(ip, credentials.username)
+    user = await AuthService.authenticate_user(credentials.username, credentials.password, background_tasks)
     if not user:
         log.warning("Failed login attempt", extra={"email": credentials.username})
         raise InvalidCredentialsException
+    await login_rate_limiter.succeeded(ip, credentials.username)
     token = await AuthService.create_token(user.id)
     response.set_cookie(
         'access_token',
@@ -90,6 +100,12 @@ async def refresh_token(request: Request, response: Response) -> Token:
     return new_token
 
 
+@router.get("/.well-known/jwks.json")
+async def get_jwks(response: Response) -> dict:
+    response.headers["Cache-Control"] = f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}"
+    return token_keys.jwks()
+
+
 @router.post("/verify")
 async def verify_user(token: str):
     await AuthService.verify_user(token)
@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, Field
@@ -7,6 +8,7 @@ from pydantic import BaseModel, Field
 class RefreshSessionCreate(BaseModel):
     refresh_token: uuid.UUID
     expires_in: int
+    expires_at: datetime
     user_id: uuid.UUID
 
 
@@ -1,15 +1,16 @@
 import uuid
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-import jwt
-from fastapi import HTTPException, status
+from fastapi import BackgroundTasks, HTTPException, status
 
-from app.auth.utils import is_valid_password
-from app.auth.schemas import Token, RefreshSessionCreate, RefreshSessionUpdate
-from app.auth.models import RefreshSessionModel
+from app.auth.utils import verify_and_update_password
+from app.auth.keys import token_keys
+from app.auth.schemas import Token
 from app.auth.dao import  RefreshSessionDAO
+from app.auth.session_store import BaseSessionStore, create_session_store
 
 from app.users.models import UserModel
 from app.users.dao import UserDao
@@ -21,6 +22,8 @@ from app.exceptions import InvalidTokenException, TokenExpiredException
 log = logging.getLogger(__name__)
 
 class AuthService:
+    session_store: BaseSessionStore = create_session_store()
+
     @classmethod
     async def create_token(cls, user_id: uuid.UUID) -> Token:
         access_token = cls._create_access_token(user_id)
@@ -29,16 +32,7 @@ class AuthService:
         )
         refresh_token = cls._create_refresh_token()
 
-        async with async_session_maker() as session:
-            await RefreshSessionDAO.add(
-                session,
-                RefreshSessionCreate(
-                    user_id=user_id,
-                    refresh_token=refresh_token,
-                    expires_in=refresh_token_expires.total_seconds()
-                )
-            )
-            await session.commit()
+        await cls.session_store.create(user_id, refresh_token, refresh_token_expires)
         log.info("Token created for user", extra={"user_id": str(user_id)})
         return Token(access_token=access_token, refresh_token=refresh_token, token_type='bearer')
 
@@ -51,7 +45,7 @@ class AuthService:
     @classmethod
     async def verify_user(cls, token: str) -> UserModel:
         try:
-            payload = jwt.decode(token, settings.SECRET, algorithms=settings.ALGORITHMS)
+            payload = token_keys.decode(token)
             user_id = payload.get("sub")
             expire_time =  payload.get("exp")
 
@@ -85,67 +79,94 @@ class AuthService:
 
     @classmethod
     async def abort_all_sessions(cls, user_id: uuid.UUID):
-        async with async_session_maker() as session:
-            await RefreshSessionDAO.delete(session, RefreshSessionModel.user_id == user_id)
-            await session.commit()
+        await cls.session_store.revoke_all(user_id)
         log.info("All sessions aborted for user", extra={"user_id": str(user_id)})
 
 
     @classmethod
-    async def authenticate_user(cls, email: str, password: str) -> Optional[UserModel]:
+    async def authenticate_user(
+            cls,
+            email: str,
+            password: str,
+            background_tasks: Optional[BackgroundTasks] = None
+    ) -> Optional[UserModel]:
         async with async_session_maker() as session:
             user = await UserDao.find_one_or_none(session, email=email)
-        if user and is_valid_password(password, str(user.hashed_password)):
-            log.info("User authenticated successfully", extra={"email": email})
-            return user
+        if user:
+            is_valid, new_hash = await asyncio.to_thread(
+                verify_and_update_password,
+                password,
+                str(user.hashed_password)
+            )
+            if is_valid:
+                if new_hash and background_tasks is not None:
+                    background_tasks.add_task(cls.rehash_password, user.id, str(user.hashed_password), new_hash)
+                log.info("User authenticated successfully", extra={"email": email})
+                return user
         log.warning("Authentication failed", extra={"email": email})
         return None
 
 
     @classmethod
-    async def refresh_token(cls, token) -> Token:
+    async def rehash_password(cls, user_id: uuid.UUID, old_hash: str, new_hash: str) -> None:
         async with async_session_maker() as session:
-            refresh_session = await RefreshSessionDAO.find_one_or_none(session, RefreshSessionModel.refresh_token == token)
+            # Matching on the old hash keeps a concurrent password change intact.
+            await UserDao.update(
+                session,
+                UserModel.id == user_id,
+                UserModel.hashed_password == old_hash,
+                obj_in={"hashed_password": new_hash}
+            )
+            await session.commit()
+        log.info("Password hash upgraded", extra={"user_id": str(user_id)})
 
-            if refresh_session is None:
-                log.warning("Refresh token not found")
-                raise InvalidTokenException
-            if datetime.now(timezone.utc) >= refresh_session.created_at + timedelta(seconds=refresh_session.expires_in):
-                await RefreshSessionDAO.delete(id=refresh_session.id)
-                log.warning("Refresh token expired", extra={"user_id": str(refresh_session.user_id)})
-                raise TokenExpiredException
 
-            user = await UserDao.find_one_or_none(session, id=refresh_session.user_id)
-            if user is None:
-                log.error("User not found during token refresh", extra={"user_id": str(refresh_session.user_id)})
-                raise InvalidTokenException
+    @classmethod
+    async def refresh_token(cls, token) -> Token:
+        old_refresh_token = cls._parse_refresh_token(token)
+        if old_refresh_token is None:
+            log.warning("Refresh token not found")
+            raise InvalidTokenException
 
-            access_token = cls._create_access_token(user.id)
-            refresh_token_expires = timedelta(
-                days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-            refresh_token = cls._create_refresh_token()
+        refresh_token_expires = timedelta(
+            days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        refresh_token = cls._create_refresh_token()
 
-            await RefreshSessionDAO.update(
-                session,
-                RefreshSessionModel.id == refresh_session.id,
-                obj_in=RefreshSessionUpdate(
-                    refresh_token=refresh_token,
-                    expires_in=refresh_token_expires.total_seconds()
-                )
-            )
-            await session.commit()
-        log.info("Token refreshed for user", extra={"user_id": str(user.id)})
+        user_id = await cls.session_store.rotate(old_refresh_token, refresh_token, refresh_token_expires)
+        access_token = cls._create_access_token(user_id)
+        log.info("Token refreshed for user", extra={"user_id": str(user_id)})
         return Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer")
 
 
     @classmethod
     async def logout(cls, token) -> None:
-        async with async_session_maker() as session:
-            refresh_session = await RefreshSessionDAO.find_one_or_none(session, RefreshSessionModel.refresh_token == token)
-            if refresh_session:
-                await RefreshSessionDAO.delete(session, id=refresh_session.id)
-                log.info("User logged out", extra={"user_id": str(refresh_session.user_id)})
-            await session.commit()
+        refresh_token = cls._parse_refresh_token(token)
+        if refresh_token is None:
+            return
+
+        user_id = await cls.session_store.revoke(refresh_token)
+        if user_id:
+            log.info("User logged out", extra={"user_id": str(user_id)})
+
+
+    @classmethod
+    async def purge_expired_sessions(cls, session_maker=None) -> int:
+        if session_maker is None:
+            session_maker = async_session_maker
+
+        total = 0
+        while True:
+            async with session_maker() as session:
+                deleted = await RefreshSessionDAO.purge_expired(
+                    session,
+                    batch_size=settings.REFRESH_SESSION_PURGE_BATCH_SIZE
+                )
+                await session.commit()
+            total += deleted
+            if deleted < settings.REFRESH_SESSION_PURGE_BATCH_SIZE:
+                break
+        log.info("Expired refresh sessions purged", extra={"count": total})
+        return total
 
 
     @classmethod
@@ -154,7 +175,7 @@ class AuthService:
             "sub": str(user_id),
             "exp": datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         }
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET, algorithm=settings.ALGORITHMS)
+        encoded_jwt = token_keys.encode(to_encode)
         return f'Bearer {encoded_jwt}'
 
 
@@ -164,10 +185,20 @@ class AuthService:
             "sub": str(user_id),
             "exp": datetime.now(timezone.utc) + timedelta(hours=settings.VERIFY_EMAIL_TOKEN_HOURS)
         }
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET, algorithm=settings.ALGORITHMS)
+        encoded_jwt = token_keys.encode(to_encode)
         return f'{encoded_jwt}'
 
 
     @classmethod
     def _create_refresh_token(cls) -> uuid.UUID:
-        return uuid.uuid4()
\ No newline at end of file
+        return uuid.uuid4()
+
+
+    @classmethod
+    def _parse_refresh_token(cls, token) -> Optional[uuid.UUID]:
+        if isinstance(token, uuid.UUID):
+            return token
+        try:
+            return uuid.UUID(token)
+        except (TypeError, ValueError):
+            return None
\ No newline at end of file
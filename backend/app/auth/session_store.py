@@ -0,0 +1,259 @@
+import uuid
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from app.auth.dao import RefreshSessionDAO
+from app.auth.models import RefreshSessionModel
+from app.auth.schemas import RefreshSessionCreate
+from app.database import async_session_maker
+from app.config import settings
+from app.exceptions import InvalidTokenException, TokenExpiredException
+
+log = logging.getLogger(__name__)
+
+
+class BaseSessionStore(ABC):
+    """Storage for refresh sessions used by ``AuthService``.
+
+    ``rotate`` swaps a refresh token for a new one and returns the owner id,
+    raising ``InvalidTokenException`` when the old token cannot be used (the
+    in-memory store reports expiry as ``TokenExpiredException``).
+    """
+
+    @abstractmethod
+    async def create(self, user_id: uuid.UUID, refresh_token: uuid.UUID, expires: timedelta) -> None:
+        ...
+
+    @abstractmethod
+    async def rotate(self, refresh_token: uuid.UUID, new_refresh_token: uuid.UUID, expires: timedelta) -> uuid.UUID:
+        ...
+
+    @abstractmethod
+    async def revoke(self, refresh_token: uuid.UUID) -> Optional[uuid.UUID]:
+        ...
+
+    @abstractmethod
+    async def revoke_all(self, user_id: uuid.UUID) -> None:
+        ...
+
+
+class PostgresSessionStore(BaseSessionStore):
+    def __init__(self, session_maker=None):
+        self.session_maker = session_maker or async_session_maker
+
+    async def create(self, user_id: uuid.UUID, refresh_token: uuid.UUID, expires: timedelta) -> None:
+        async with self.session_maker() as session:
+            await RefreshSessionDAO.add(
+                session,
+                RefreshSessionCreate(
+                    user_id=user_id,
+                    refresh_token=refresh_token,
+                    expires_in=expires.total_seconds(),
+                    expires_at=datetime.now(timezone.utc) + expires
+                )
+            )
+            await RefreshSessionDAO.trim_user_sessions(
+                session,
+                user_id,
+                keep=settings.REFRESH_SESSIONS_PER_USER
+            )
+            await session.commit()
+
+    async def rotate(self, refresh_token: uuid.UUID, new_refresh_token: uuid.UUID, expires: timedelta) -> uuid.UUID:
+        async with self.session_maker() as session:
+            user_id = await RefreshSessionDAO.rotate_token(session, refresh_token, new_refresh_token, expires)
+            if user_id is None:
+                log.warning("Refresh token not found or expired")
+                raise InvalidTokenException
+            await session.commit()
+            return user_id
+
+    async def revoke(self, refresh_token: uuid.UUID) -> Optional[uuid.UUID]:
+        async with self.session_maker() as session:
+            user_id = await RefreshSessionDAO.revoke_token(session, refresh_token)
+            await session.commit()
+            return user_id
+
+    async def revoke_all(self, user_id: uuid.UUID) -> None:
+        async with self.session_maker() as session:
+            await RefreshSessionDAO.delete(session, RefreshSessionModel.user_id == user_id)
+            await session.commit()
+
+
+# Scripts only touch keys passed in KEYS. Token keys hold the owner id, so
+# callers read it first and the scripts check it has not changed since.
+_REDIS_CREATE = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[5])
+local evicted = {}
+local extra = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[6])
+if extra > 0 then
+    evicted = redis.call('ZRANGE', KEYS[2], 0, extra - 1)
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, extra - 1)
+end
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return evicted
+"""
+
+_REDIS_ROTATE = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+redis.call('ZREM', KEYS[3], ARGV[4])
+redis.call('ZADD', KEYS[3], ARGV[3], ARGV[5])
+redis.call('EXPIRE', KEYS[3], ARGV[2])
+return 1
+"""
+
+_REDIS_REVOKE = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[2])
+return 1
+"""
+
+
+class RedisSessionStore(BaseSessionStore):
+    """Refresh sessions in Redis (or any server speaking its protocol).
+
+    Each token is a key holding the owner id with a native TTL, so expired
+    sessions disappear on their own. Rotation reads the owner id and then
+    runs a script over the declared token and per-user keys, which fails if
+    the token changed in between. A per-user sorted set scored by expiry backs ``revoke_all`` and the
+    per-user session cap. An expired token is indistinguishable from an
+    unknown one and is reported as invalid.
+    """
+
+    token_prefix = "refresh_session:"
+    user_prefix = "refresh_sessions:"
+
+    def __init__(self, url: Optional[str] = None, redis=None):
+        if redis is None:
+            from redis import asyncio as aioredis
+
+            redis = aioredis.from_url(url, decode_responses=True)
+        self.redis = redis
+        self._create = self.redis.register_script(_REDIS_CREATE)
+        self._rotate = self.redis.register_script(_REDIS_ROTATE)
+        self._revoke = self.redis.register_script(_REDIS_REVOKE)
+
+    def _token_key(self, refresh_token) -> str:
+        return f"{self.token_prefix}{refresh_token}"
+
+    def _user_key(self, user_id) -> str:
+        return f"{self.user_prefix}{user_id}"
+
+    async def create(self, user_id: uuid.UUID, refresh_token: uuid.UUID, expires: timedelta) -> None:
+        now = time.time()
+        evicted = await self._create(
+            keys=[self._token_key(refresh_token), self._user_key(user_id)],
+            args=[
+                str(user_id),
+                int(expires.total_seconds()),
+                now + expires.total_seconds(),
+                str(refresh_token),
+                now,
+                settings.REFRESH_SESSIONS_PER_USER,
+            ]
+        )
+        if evicted:
+            await self.redis.delete(*(self._token_key(token) for token in evicted))
+
+    async def rotate(self, refresh_token: uuid.UUID, new_refresh_token: uuid.UUID, expires: timedelta) -> uuid.UUID:
+        user_id = await self.redis.get(self._token_key(refresh_token))
+        rotated = user_id is not None and await self._rotate(
+            keys=[self._token_key(refresh_token), self._token_key(new_refresh_token), self._user_key(user_id)],
+            args=[
+                user_id,
+                int(expires.total_seconds()),
+                time.time() + expires.total_seconds(),
+                str(refresh_token),
+                str(new_refresh_token),
+            ]
+        )
+        if not rotated:
+            log.warning("Refresh token not found")
+            raise InvalidTokenException
+        return uuid.UUID(user_id)
+
+    async def revoke(self, refresh_token: uuid.UUID) -> Optional[uuid.UUID]:
+        user_id = await self.redis.get(self._token_key(refresh_token))
+        revoked = user_id is not None and await self._revoke(
+            keys=[self._token_key(refresh_token), self._user_key(user_id)],
+            args=[user_id, str(refresh_token)]
+        )
+        return uuid.UUID(user_id) if revoked else None
+
+    async def revoke_all(self, user_id: uuid.UUID) -> None:
+        user_key = self._user_key(user_id)
+
+        async def delete_sessions(pipe) -> None:
+            tokens = await pipe.zrange(user_key, 0, -1)
+            pipe.multi()
+            pipe.delete(user_key, *(self._token_key(token) for token in tokens))
+
+        # Retried if a session is created or rotated while the index is read.
+        await self.redis.transaction(delete_sessions, user_key)
+
+
+class InMemorySessionStore(BaseSessionStore):
+    """Process-local store for tests and single-worker development."""
+
+    def __init__(self):
+        self.tokens: Dict[uuid.UUID, Tuple[uuid.UUID, float]] = {}
+        self.users: Dict[uuid.UUID, "OrderedDict[uuid.UUID, None]"] = {}
+
+    async def create(self, user_id: uuid.UUID, refresh_token: uuid.UUID, expires: timedelta) -> None:
+        self.tokens[refresh_token] = (user_id, time.monotonic() + expires.total_seconds())
+        user_tokens = self.users.setdefault(user_id, OrderedDict())
+        user_tokens[refresh_token] = None
+
+        for token in list(user_tokens):
+            if len(user_tokens) <= settings.REFRESH_SESSIONS_PER_USER:
+                break
+            del user_tokens[token]
+            self.tokens.pop(token, None)
+
+    async def rotate(self, refresh_token: uuid.UUID, new_refresh_token: uuid.UUID, expires: timedelta) -> uuid.UUID:
+        session = self.tokens.get(refresh_token)
+        if session is None:
+            log.warning("Refresh token not found")
+            raise InvalidTokenException
+
+        user_id, expires_at = session
+        await self.revoke(refresh_token)
+        if time.monotonic() >= expires_at:
+            log.warning("Refresh token expired", extra={"user_id": str(user_id)})
+            raise TokenExpiredException
+
+        await self.create(user_id, new_refresh_token, expires)
+        return user_id
+
+    async def revoke(self, refresh_token: uuid.UUID) -> Optional[uuid.UUID]:
+        session = self.tokens.pop(refresh_token, None)
+        if session is None:
+            return None
+        user_id, _ = session
+        self.users.get(user_id, {}).pop(refresh_token, None)
+        return user_id
+
+    async def revoke_all(self, user_id: uuid.UUID) -> None:
+        for token in self.users.pop(user_id, {}):
+            self.tokens.pop(token, None)
+
+
+def create_session_store(backend: str = settings.SESSION_BACKEND) -> BaseSessionStore:
+    if backend == "redis":
+        return RedisSessionStore(settings.REDIS_URL)
+    if backend == "memory":
+        return InMemorySessionStore()
+    return PostgresSessionStore()
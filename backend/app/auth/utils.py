@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from passlib.context import CryptContext
 from fastapi import  HTTPException, Request, status
@@ -6,8 +6,31 @@ from fastapi.openapi.models import OAuthFlows as OAuthFlowsModel
 from fastapi.security import OAuth2
 from fastapi.security.utils import get_authorization_scheme_param
 
+from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def create_pwd_context(
+        schemes=None,
+        bcrypt_rounds: Optional[int] = None,
+        argon2_time_cost: Optional[int] = None,
+        argon2_memory_cost: Optional[int] = None,
+        argon2_parallelism: Optional[int] = None
+) -> CryptContext:
+    # The first scheme hashes new passwords; hashes made with any other
+    # scheme or with different cost parameters are reported by
+    # verify_and_update and upgraded on the next successful login.
+    return CryptContext(
+        schemes=schemes or settings.PASSWORD_SCHEMES,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds or settings.BCRYPT_ROUNDS,
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost or settings.ARGON2_TIME_COST,
+        argon2__memory_cost=argon2_memory_cost or settings.ARGON2_MEMORY_COST,
+        argon2__parallelism=argon2_parallelism or settings.ARGON2_PARALLELISM,
+    )
+
+
+pwd_context = create_pwd_context()
 
 
 class OAuth2PasswordBearerWithCookie(OAuth2):
@@ -44,5 +67,9 @@ def is_valid_password(plain_password: str, hashed_password: str) -> bool:
     return  pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_hashed_password(password: str) -> str:
     return pwd_context.hash(password)
\ No newline at end of file
@@ -1,8 +1,9 @@
-from typing import Generic, Any, Dict, List, Optional, TypeVar, Union
+from typing import Generic, Any, Dict, List, Optional, Sequence, TypeVar, Union
 from pydantic import BaseModel
 import logging
 
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import any_, bindparam, delete, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.sql import func
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,13 +17,36 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def any_of(column, values: Sequence[Any]):
+    """``column = ANY(:values)`` with the values bound as one array parameter,
+    so every list length shares a single prepared statement, unlike an
+    expanding IN."""
+    return column == any_(bindparam(None, list(values), type_=ARRAY(column.type)))
+
+
 class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     model = None
 
     @classmethod
-    async def find_one_or_none(cls, session: AsyncSession, *filter, **filter_by) -> Optional[ModelType]:
-        stmt = select(cls.model).filter(*filter).filter_by(**filter_by)
+    def _select(cls, columns: Optional[Sequence[str]] = None):
+        # With ``columns`` only those columns are loaded and rows come back
+        # as ``Row`` objects, which expose the same attribute names.
+        if columns:
+            return select(*(getattr(cls.model, column) for column in columns))
+        return select(cls.model)
+
+    @classmethod
+    async def find_one_or_none(
+            cls,
+            session: AsyncSession,
+            *filter,
+            columns: Optional[Sequence[str]] = None,
+            **filter_by
+    ) -> Optional[ModelType]:
+        stmt = cls._select(columns).filter(*filter).filter_by(**filter_by)
         result = await session.execute(stmt)
+        if columns:
+            return result.one_or_none()
         return result.scalars().one_or_none()
 
     @classmethod
@@ -32,14 +56,18 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             offset: int = 30,
             limit: Optional[int] = 100,
             *filter,
+            columns: Optional[Sequence[str]] = None,
+            order_by: Sequence[Any] = (),
             **filter_by
     ) -> List[ModelType]:
-        stmt = select(cls.model).filter(*filter).filter_by(**filter_by).offset(offset)
+        stmt = cls._select(columns).filter(*filter).filter_by(**filter_by).order_by(*order_by).offset(offset)
 
         if limit is not None:
             stmt = stmt.limit(limit)
 
         result = await session.execute(stmt)
+        if columns:
+            return result.all() #type: ignore
         return result.scalars().all() #type: ignore
 
     @classmethod
@@ -67,6 +95,32 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             raise e
             return None
 
+    @classmethod
+    async def add_if_absent(
+            cls,
+            session: AsyncSession,
+            obj_in: Union[CreateSchemaType, Dict[str, Any]],
+            conflict_columns: Sequence[str],
+    ) -> Optional[ModelType]:
+        """``INSERT ... ON CONFLICT (conflict_columns) DO NOTHING RETURNING``.
+
+        Returns None when a row with the same key already exists, so the
+        uniqueness check and the insert are one atomic statement.
+        """
+        if isinstance(obj_in, dict):
+            create_data = obj_in
+        else:
+            create_data = obj_in.model_dump(exclude_unset=True)
+
+        stmt = (
+            pg_insert(cls.model)
+            .values(**create_data)
+            .on_conflict_do_nothing(index_elements=list(conflict_columns))
+            .returning(cls.model)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
     @classmethod
     async def delete(cls, session: AsyncSession, *filter, **filter_by):
         stmt = delete(cls.model).filter(*filter).filter_by(**filter_by)
@@ -93,6 +147,79 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await session.execute(stmt)
         return result.scalars().first()
 
+    @classmethod
+    async def update_where(
+            cls,
+            session: AsyncSession,
+            *where,
+            obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+            returning: bool = True
+    ) -> Union[List[ModelType], int]:
+        """One ``UPDATE ... WHERE`` with existence and ownership in ``where``.
+
+        Returns the updated rows, or the row count with ``returning=False``;
+        an empty result means nothing matched, and only then is it worth a
+        follow-up query to tell "missing" from "not allowed".
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        stmt = update(cls.model).where(*where).values(**update_data)
+        if not returning:
+            result = await session.execute(stmt)
+            return result.rowcount
+
+        result = await session.execute(stmt.returning(cls.model))
+        return result.scalars().all() #type: ignore
+
+    @classmethod
+    async def delete_where(
+            cls,
+            session: AsyncSession,
+            *where,
+            returning: bool = True
+    ) -> Union[List[ModelType], int]:
+        """The ``DELETE`` counterpart of ``update_where``."""
+        stmt = delete(cls.model).where(*where)
+        if not returning:
+            result = await session.execute(stmt)
+            return result.rowcount
+
+        result = await session.execute(stmt.returning(cls.model))
+        return result.scalars().all() #type: ignore
+
+    @classmethod
+    async def archive_where(
+            cls,
+            session: AsyncSession,
+            archive_model: type,
+            *where,
+            delete_rows: bool = True
+    ) -> int:
+        """Copies the matching rows into ``archive_model``, a table with the same
+        columns, and by default deletes them in the same statement
+        (``WITH moved AS (DELETE ... RETURNING *) INSERT ... SELECT``)."""
+        # Generated columns can't be inserted into; the archive table recomputes or omits them.
+        columns = [column.name for column in cls.model.__table__.columns if column.computed is None]
+
+        if delete_rows:
+            source = delete(cls.model).where(*where).returning(*(cls.model.__table__.c[name] for name in columns)).cte("moved")
+            stmt = insert(archive_model).from_select(columns, select(*(source.c[name] for name in columns))).add_cte(source)
+        else:
+            source = select(*(cls.model.__table__.c[name] for name in columns)).where(*where)
+            stmt = insert(archive_model).from_select(columns, source)
+
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    @classmethod
+    async def exists(cls, session: AsyncSession, *filter, **filter_by) -> bool:
+        stmt = select(select(literal(1)).select_from(cls.model).filter(*filter).filter_by(**filter_by).exists())
+        result = await session.execute(stmt)
+        return bool(result.scalar())
+
     @classmethod
     async def count(cls, session: AsyncSession, *filter, **filter_by):
         stmt = select(func.count()).select_from(cls.model).filter(*filter).filter_by(**filter_by)
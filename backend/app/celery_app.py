@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from celery import Celery
 
 from app.config import settings
@@ -8,4 +10,35 @@ celery_app = Celery(
     backend="rpc://"
 )
 
-celery_app.autodiscover_tasks(["app.tasks"])
\ No newline at end of file
+celery_app.autodiscover_tasks(["app.tasks"])
+
+celery_app.conf.beat_schedule = {
+    "collect-orphan-photos": {
+        "task": "app.tasks.S3_tasks.collect_orphan_photos_task",
+        "schedule": timedelta(hours=settings.S3_GC_INTERVAL_HOURS),
+    },
+    "purge-expired-refresh-sessions": {
+        "task": "app.tasks.auth_tasks.purge_expired_sessions_task",
+        "schedule": timedelta(minutes=settings.REFRESH_SESSION_PURGE_INTERVAL_MINUTES),
+    },
+    "deactivate-finished-events": {
+        "task": "app.tasks.events_tasks.deactivate_finished_events_task",
+        "schedule": timedelta(minutes=settings.EVENT_DEACTIVATE_INTERVAL_MINUTES),
+    },
+    "archive-finished-events": {
+        "task": "app.tasks.events_tasks.archive_finished_events_task",
+        "schedule": timedelta(hours=settings.EVENT_ARCHIVE_INTERVAL_HOURS),
+    },
+    "maintain-event-partitions": {
+        "task": "app.tasks.events_tasks.maintain_event_partitions_task",
+        "schedule": timedelta(hours=settings.EVENT_PARTITION_INTERVAL_HOURS),
+    },
+    "refresh-event-rating-prior": {
+        "task": "app.tasks.events_tasks.refresh_rating_prior_task",
+        "schedule": timedelta(hours=settings.EVENT_RATING_PRIOR_INTERVAL_HOURS),
+    },
+    "rebuild-event-ratings": {
+        "task": "app.tasks.events_tasks.rebuild_event_ratings_task",
+        "schedule": timedelta(hours=settings.EVENT_RATING_REBUILD_INTERVAL_HOURS),
+    },
+}
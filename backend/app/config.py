@@ -1,4 +1,4 @@
-from typing import Literal, List
+from typing import Literal, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +8,12 @@ class Settings(BaseSettings):
     URL: str
     MODE: Literal["DEV", "TEST", "PROD"]
     LOG_LEVEL: Literal["ERROR", "WARNING", "INFO", "DEBUG"]
+    LOG_SAMPLE_RATE_2XX: float = 1.0
+    LOG_WARNING_RATE_PER_MINUTE: float = 60
+    LOG_WARNING_BURST: int = 20
+    LOG_WARNING_MAX_KEYS: int = 10000
+    # Bearer token for /metrics; the endpoint is off while it is unset.
+    METRICS_TOKEN: Optional[str] = None
     WORKERS: int
 
     DB_HOST: str
@@ -46,9 +52,34 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     VERIFY_EMAIL_TOKEN_HOURS: int = 2
+    REFRESH_SESSIONS_PER_USER: int = 10
+    REFRESH_SESSION_PURGE_BATCH_SIZE: int = 5000
+    REFRESH_SESSION_PURGE_INTERVAL_MINUTES: int = 60
+    SESSION_BACKEND: Literal["postgres", "redis", "memory"] = "postgres"
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    LOGIN_RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    LOGIN_RATE_LIMIT_IP_CAPACITY: int = 30
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = 10
+    LOGIN_RATE_LIMIT_EMAIL_CAPACITY: int = 10
+    LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE: float = 2
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100000
+    # Reverse proxies (addresses or CIDRs) whose X-Forwarded-For is believed
+    # when working out the client IP for login limits.
+    TRUSTED_PROXIES: List[str] = []
+
+    PASSWORD_SCHEMES: List[str] = ["bcrypt", "argon2"]
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 2
 
     SECRET: str
     ALGORITHMS: str = "HS256"
+    JWT_PRIVATE_KEY_FILE: Optional[str] = None
+    JWT_PUBLIC_KEY_FILES: List[str] = []
+    JWT_VERIFY_CACHE_SIZE: int = 10000
+    JWKS_MAX_AGE_SECONDS: int = 300
 
     SMTP_SERVER: str
     SMTP_PORT: int
@@ -60,6 +91,39 @@ class Settings(BaseSettings):
     S3_SECRET_ACCESS_KEY: str
     S3_BUCKET_NAME: str
 
+    S3_GC_INTERVAL_HOURS: int = 24
+    S3_GC_MIN_AGE_HOURS: int = 24
+    S3_GC_PAGE_SIZE: int = 1000
+    S3_GC_DELETE_PAUSE_SECONDS: float = 1.0
+    # New photos are stored under this prefix; orphan collection only lists it
+    # and refuses to run without one.
+    S3_PHOTO_PREFIX: str = "photos/"
+    S3_GC_DRY_RUN: bool = True
+
+    EVENT_BATCH_MAX_IDS: int = 100
+    EVENT_CLUSTER_CELLS_PER_TILE: int = 8
+    EVENT_CLUSTER_LIMIT: int = 1000
+    EVENT_FACETS_CACHE_SIZE: int = 1000
+    EVENT_FACETS_CACHE_SECONDS: int = 60
+    EVENT_RATING_PRIOR_MEAN: float = 3.5
+    EVENT_RATING_PRIOR_WEIGHT: float = 10
+    EVENT_RATING_PRIOR_TOLERANCE: float = 0.01
+    EVENT_RATING_PRIOR_INTERVAL_HOURS: int = 24
+    EVENT_RATING_RESCORE_BATCH_SIZE: int = 1000
+    EVENT_RATING_REBUILD_INTERVAL_HOURS: int = 168
+    EVENT_RATING_REBUILD_BATCH_SIZE: int = 500
+    EVENT_SUGGEST_MAX_ENTRIES: int = 500000
+    EVENT_SUGGEST_SYNC_SECONDS: int = 30
+    EVENT_SUGGEST_REBUILD_SECONDS: int = 3600
+    EVENT_DEACTIVATE_INTERVAL_MINUTES: int = 15
+    EVENT_DEACTIVATE_BATCH_SIZE: int = 1000
+    EVENT_ARCHIVE_INTERVAL_HOURS: int = 24
+    EVENT_ARCHIVE_AFTER_DAYS: int = 180
+    EVENT_ARCHIVE_BATCH_SIZE: int = 200
+    EVENT_PARTITION_INTERVAL_HOURS: int = 24
+    EVENT_PARTITION_PREMAKE_MONTHS: int = 3
+    EVENT_PARTITION_RETENTION_MONTHS: int = 12
+
     CORS_ORIGINS: List[str]
     CORS_HEADERS: List[str]
     CORS_METHODS: List[str]
@@ -0,0 +1,51 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.events.dao import EventDao
+from app.database import async_session_maker
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+
+class EventArchiveService:
+    """Keeps the live ``events`` table down to current events.
+
+    Finished events are flipped to inactive, which takes them out of the
+    partial search indexes. Once they are ``EVENT_ARCHIVE_AFTER_DAYS`` past
+    their end they move to the ``*_archive`` tables. Both jobs work in small
+    batches, one transaction each, and skip rows locked by requests.
+    """
+
+    @classmethod
+    async def deactivate_finished_events(cls, session_maker=None) -> int:
+        if session_maker is None:
+            session_maker = async_session_maker
+
+        total = 0
+        while True:
+            async with session_maker() as session:
+                updated = await EventDao.deactivate_finished(session, settings.EVENT_DEACTIVATE_BATCH_SIZE)
+                await session.commit()
+            total += updated
+            if updated < settings.EVENT_DEACTIVATE_BATCH_SIZE:
+                break
+        log.info("Finished events deactivated", extra={"count": total})
+        return total
+
+    @classmethod
+    async def archive_finished_events(cls, session_maker=None) -> int:
+        if session_maker is None:
+            session_maker = async_session_maker
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.EVENT_ARCHIVE_AFTER_DAYS)
+        total = 0
+        while True:
+            async with session_maker() as session:
+                archived = await EventDao.archive_finished(session, cutoff, settings.EVENT_ARCHIVE_BATCH_SIZE)
+                await session.commit()
+            total += archived
+            if archived < settings.EVENT_ARCHIVE_BATCH_SIZE:
+                break
+        log.info("Finished events archived", extra={"count": total, "cutoff": cutoff.isoformat()})
+        return total
@@ -1,7 +1,15 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import Float, and_, bindparam, case, cast, delete, literal_column, select, update, func
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, aggregate_order_by, insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased
 
-from app.base_dao import BaseDAO
+from app.base_dao import BaseDAO, any_of
+from app.config import settings
 
 from app.events.models import EventModel
 from app.events.schemas import EventCreateDB, EventUpdateDB
@@ -12,25 +20,440 @@ from app.events.schemas import EventReviewsCreateDB, EventReviewsUpdateDB
 from app.events.models import EventPhotoModel
 from app.events.schemas import EventPhotoCreateDB, EventPhotoUpdateDB
 
+from app.events.models import EventArchiveModel, EventReviewsArchiveModel, EventPhotoArchiveModel
+from app.events.models import EventRatingPriorModel
+from app.events.schemas import EventRatingPriorDB
+
+from app.events.models import EventAddressModel
+from app.events.schemas import EventAddressDB
+from app.users.models import UserEventFavoritesModel, UserEventFavoritesArchiveModel
+from app.users.dao import UserEventFavoritesDao
+
+# Lower bounds of the age rating facet buckets, highest first.
+AGE_RATING_BUCKETS = (18, 16, 12, 6)
+
+PRIOR_ID = 1
+
+RATING_STARS = range(1, 6)
+
+
+def bayesian_score(mean, weight, total, count):
+    """``(weight * mean + total) / (weight + count)``; NULL without reviews."""
+    return case((count > 0, (weight * mean + total) / (weight + count)), else_=None)
+
+
+def stored_prior() -> tuple:
+    """The saved prior as scalar subqueries, falling back to the settings
+    until the first prior refresh has run."""
+    def value(column, default):
+        return func.coalesce(select(column).filter(EventRatingPriorModel.id == PRIOR_ID).scalar_subquery(), default)
+
+    return (
+        value(EventRatingPriorModel.mean, settings.EVENT_RATING_PRIOR_MEAN),
+        value(EventRatingPriorModel.weight, settings.EVENT_RATING_PRIOR_WEIGHT),
+    )
+
+
+def event_key(event_id: uuid.UUID):
+    """``id = :id AND start = <start from event_addresses>``.
+
+    ``id`` alone has to probe the index of every monthly partition; with the
+    start read from the unpartitioned ``event_addresses`` the partitions are
+    pruned at execution time down to the one holding the event.
+    """
+    start = select(EventAddressModel.start).filter(EventAddressModel.event_id == event_id).scalar_subquery()
+    return and_(EventModel.id == event_id, EventModel.start == start)
+
 
 class EventDao(BaseDAO[EventModel, EventCreateDB, EventUpdateDB]):
     model = EventModel
 
+    @classmethod
+    async def delete_returning_photo_names(cls, session: AsyncSession, *where) -> Optional[List[str]]:
+        """Deletes the matching event and returns the object names of its photos,
+        or None when nothing matched.
+
+        The photo select runs in the same statement as the delete and sees the
+        rows before the cascade removes them.
+        """
+        deleted = delete(EventModel).where(*where).returning(EventModel.id).cte("deleted")
+        stmt = (
+            select(deleted.c.id, EventPhotoModel.object_name)
+            .outerjoin(EventPhotoModel, EventPhotoModel.event_id == deleted.c.id)
+        )
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return None
+        return [row.object_name for row in rows if row.object_name is not None]
+
+    @classmethod
+    async def deactivate_finished(cls, session: AsyncSession, batch_size: int) -> int:
+        finished = (
+            select(EventModel.id)
+            .filter(EventModel.is_active == True, EventModel.end < func.now())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return await cls.update_where(
+            session,
+            EventModel.id.in_(finished),
+            obj_in={"is_active": False},
+            returning=False
+        )
+
+    @classmethod
+    async def archive_finished(cls, session: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+        """Moves up to ``batch_size`` inactive events that ended before ``cutoff``
+        to the archive tables along with their reviews, photos and favorites.
+
+        The events are copied first so the archived children can reference
+        them, the children are moved, and only then are the events deleted,
+        so the ON DELETE CASCADE finds nothing left to remove.
+        """
+        result = await session.execute(
+            select(EventModel.id)
+            .filter(EventModel.is_active == False, EventModel.end < cutoff)
+            .order_by(EventModel.end)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        event_ids = result.scalars().all()
+        if not event_ids:
+            return 0
+
+        await cls.archive_where(session, EventArchiveModel, any_of(EventModel.id, event_ids), delete_rows=False)
+        await EventReviewsDao.archive_where(session, EventReviewsArchiveModel, any_of(EventReviewsModel.event_id, event_ids))
+        await EventPhotoDao.archive_where(session, EventPhotoArchiveModel, any_of(EventPhotoModel.event_id, event_ids))
+        await UserEventFavoritesDao.archive_where(
+            session,
+            UserEventFavoritesArchiveModel,
+            any_of(UserEventFavoritesModel.event_id, event_ids)
+        )
+        return await cls.delete_where(session, any_of(EventModel.id, event_ids), returning=False)
+
+    @classmethod
+    async def find_clusters(cls, session: AsyncSession, cell_size: float, limit: int, *filter) -> List[Row]:
+        """One row per non-empty ``cell_size`` degree grid cell: the event
+        count, their centroid and the id of the soonest one. Largest first."""
+        cell = (func.floor(EventModel.longitude / cell_size), func.floor(EventModel.latitude / cell_size))
+        first_id = func.array_agg(aggregate_order_by(EventModel.id, EventModel.start), type_=ARRAY(UUID(as_uuid=True)))[1]
+        stmt = (
+            select(
+                first_id.label("event_id"),
+                func.count().label("count"),
+                func.avg(EventModel.latitude).label("latitude"),
+                func.avg(EventModel.longitude).label("longitude")
+            )
+            .filter(*filter)
+            .group_by(*cell)
+            .order_by(func.count().desc())
+            .limit(limit)
+        )
+        result = await session.execute(stmt)
+        return list(result.all())
+
+    @classmethod
+    async def count_facets(cls, session: AsyncSession, *filter) -> Dict[str, Dict[str, int]]:
+        """Counts the matching events per environment, age rating bucket and
+        whole-star rating band in one GROUPING SETS query."""
+        # Literal bounds keep the CASE identical in SELECT and GROUP BY.
+        age_bucket = case(
+            *((EventModel.age_rating >= literal_column(str(bound)), literal_column(str(bound))) for bound in AGE_RATING_BUCKETS),
+            else_=literal_column("0")
+        )
+        rating_band = func.floor(EventModel.average_rating)
+        keys = (EventModel.environment, age_bucket, rating_band)
+        stmt = (
+            select(func.grouping(*keys), *keys, func.count())
+            .filter(*filter)
+            .group_by(func.grouping_sets(*keys))
+        )
+        result = await session.execute(stmt)
+
+        # grouping() sets a bit for every key left out of the row's set.
+        facets: Dict[str, Dict[str, int]] = {"environment": {}, "age_rating": {}, "rating": {}}
+        for grouping, environment, age, band, count in result.all():
+            if grouping == 0b011:
+                facets["environment"][environment.value] = count
+            elif grouping == 0b101:
+                facets["age_rating"][str(age)] = count
+            else:
+                facets["rating"]["unrated" if band is None else str(int(band))] = count
+        return facets
+
+    @classmethod
+    async def add_favorites(cls, session: AsyncSession, event_id: uuid.UUID, delta: int) -> None:
+        await cls.update_where(
+            session,
+            event_key(event_id),
+            obj_in={"count_favorites": EventModel.count_favorites + delta},
+            returning=False
+        )
+
+    @classmethod
+    async def delete_favorites(cls, session: AsyncSession, *where) -> int:
+        """Deletes the matching favorites and takes each one off its event's
+        ``count_favorites`` in the same statement."""
+        favorite = (
+            delete(UserEventFavoritesModel)
+            .where(*where)
+            .returning(UserEventFavoritesModel.event_id)
+            .cte("favorite")
+        )
+        counted = (
+            update(EventModel)
+            .where(event_key(favorite.c.event_id))
+            .values(count_favorites=EventModel.count_favorites - 1)
+            .cte("counted")
+        )
+        result = await session.execute(select(func.count()).select_from(favorite).add_cte(counted))
+        return result.scalar()
+
+    @staticmethod
+    def rating_delta(old_rating=None, new_rating=None) -> Dict[str, Any]:
+        """SET clauses replacing one review's ``old_rating`` by ``new_rating``
+        (None for an insert or a delete respectively): the count, the total
+        and the two histogram buckets move by that difference, and the
+        average and score are derived from the new values. Column references
+        read the row as it is when the UPDATE locks it, so concurrent review
+        writes cannot lose each other's changes."""
+        count = (new_rating is not None) - (old_rating is not None)
+        total = (new_rating if new_rating is not None else 0) - (old_rating if old_rating is not None else 0)
+        new_count = EventModel.count_reviews + count
+        new_total = EventModel.rating_total + total
+        mean, weight = stored_prior()
+
+        histogram = {}
+        for stars in RATING_STARS:
+            column = getattr(EventModel, f"rating_{stars}")
+            if new_rating is not None:
+                column = column + case((new_rating == stars, 1), else_=0)
+            if old_rating is not None:
+                column = column - case((old_rating == stars, 1), else_=0)
+            histogram[f"rating_{stars}"] = column
+
+        return {
+            "count_reviews": new_count,
+            "rating_total": new_total,
+            "average_rating": case((new_count > 0, cast(new_total, Float) / new_count), else_=None),
+            "rating_score": bayesian_score(mean, weight, new_total, new_count),
+            **histogram,
+        }
+
+    @classmethod
+    async def refresh_ratings(cls, session: AsyncSession, event_ids: List[uuid.UUID]) -> int:
+        """Recomputes ``average_rating``, ``count_reviews``, ``rating_total``,
+        ``rating_score`` and the ``rating_1``..``rating_5`` histogram from the
+        reviews, and ``count_favorites`` from the favorites.
+
+        Only for the rebuild job, which repairs batches of events; review and
+        favorite writes move the counters by their own delta instead. The batch is
+        locked first, so the aggregate is read in a later snapshot that
+        already holds every review whose delta was applied before the lock;
+        a review write that comes after waits and applies its delta on top.
+        """
+        await session.execute(
+            select(EventModel.id)
+            .filter(any_of(EventModel.id, event_ids))
+            .order_by(EventModel.id)
+            .with_for_update()
+        )
+
+        ids = func.unnest(bindparam(None, list(event_ids), type_=ARRAY(EventModel.id.type))).table_valued("id").render_derived(name="ids")
+        stats = (
+            select(
+                ids.c.id.label("event_id"),
+                func.avg(EventReviewsModel.rating).label("average"),
+                func.count(EventReviewsModel.id).label("count"),
+                func.coalesce(func.sum(EventReviewsModel.rating), 0).label("total"),
+                *(func.count(EventReviewsModel.id).filter(EventReviewsModel.rating == stars).label(f"rating_{stars}") for stars in RATING_STARS)
+            )
+            .select_from(ids.outerjoin(EventReviewsModel, EventReviewsModel.event_id == ids.c.id))
+            .group_by(ids.c.id)
+            .subquery()
+        )
+        mean, weight = stored_prior()
+        return await cls.update_where(
+            session,
+            EventModel.id == stats.c.event_id,
+            obj_in={
+                "average_rating": stats.c.average,
+                "count_reviews": stats.c.count,
+                "rating_total": stats.c.total,
+                "rating_score": bayesian_score(mean, weight, stats.c.total, stats.c.count),
+                **{f"rating_{stars}": stats.c[f"rating_{stars}"] for stars in RATING_STARS},
+                "count_favorites": (
+                    select(func.count())
+                    .select_from(UserEventFavoritesModel)
+                    .filter(UserEventFavoritesModel.event_id == EventModel.id)
+                    .scalar_subquery()
+                ),
+                # A repair is not an edit of the event; bumping updated_at
+                # would make every suggest sync reload the whole table.
+                "updated_at": EventModel.updated_at,
+            },
+            returning=False
+        )
+
+    @classmethod
+    async def next_ids(cls, session: AsyncSession, after: Optional[uuid.UUID], batch_size: int) -> List[uuid.UUID]:
+        """The next ``batch_size`` event ids after ``after``, for id-ordered batch jobs."""
+        stmt = select(EventModel.id).order_by(EventModel.id).limit(batch_size)
+        if after is not None:
+            stmt = stmt.filter(EventModel.id > after)
+        return list((await session.execute(stmt)).scalars().all())
+
+    @classmethod
+    async def rescore(
+            cls,
+            session: AsyncSession,
+            mean: float,
+            weight: float,
+            after: Optional[uuid.UUID],
+            batch_size: int
+    ) -> List[uuid.UUID]:
+        """Recomputes ``rating_score`` from the stored total and count for the
+        next ``batch_size`` events by id after ``after`` and returns their ids."""
+        event_ids = await cls.next_ids(session, after, batch_size)
+        if not event_ids:
+            return []
+
+        await cls.update_where(
+            session,
+            any_of(EventModel.id, event_ids),
+            # A new prior is not an edit of the event, so updated_at is kept.
+            obj_in={
+                "rating_score": bayesian_score(mean, weight, EventModel.rating_total, EventModel.count_reviews),
+                "updated_at": EventModel.updated_at,
+            },
+            returning=False
+        )
+        return event_ids
+
+
+class EventAddressDao(BaseDAO[EventAddressModel, EventAddressDB, EventAddressDB]):
+    model = EventAddressModel
+
+
+class EventRatingPriorDao(BaseDAO[EventRatingPriorModel, EventRatingPriorDB, EventRatingPriorDB]):
+    model = EventRatingPriorModel
+
+    @classmethod
+    async def save(cls, session: AsyncSession, mean: float, weight: float) -> None:
+        stmt = pg_insert(EventRatingPriorModel).values(id=PRIOR_ID, mean=mean, weight=weight)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EventRatingPriorModel.id],
+            set_={"mean": stmt.excluded.mean, "weight": stmt.excluded.weight, "updated_at": func.now()}
+        )
+        await session.execute(stmt)
+
 
 class EventReviewsDao(BaseDAO[EventReviewsModel, EventReviewsCreateDB, EventReviewsUpdateDB]):
+    """Review writes that move the event's rating counters in the same
+    statement: the review INSERT/UPDATE/DELETE is a data-modifying CTE and
+    the event UPDATE applies the delta from its RETURNING row."""
+
     model = EventReviewsModel
 
+    @staticmethod
+    def _rate_event(review, old_rating, new_rating):
+        return (
+            update(EventModel)
+            .where(event_key(review.c.event_id))
+            .values(**EventDao.rating_delta(old_rating, new_rating))
+            .cte("rated")
+        )
+
+    @classmethod
+    async def add_rated(cls, session: AsyncSession, obj_in: EventReviewsCreateDB) -> Optional[EventReviewsModel]:
+        """Inserts the review unless the user already reviewed the event;
+        None in that case."""
+        review = (
+            pg_insert(EventReviewsModel)
+            .values(**obj_in.model_dump(exclude_unset=True))
+            .on_conflict_do_nothing(index_elements=["user_id", "event_id"])
+            .returning(*EventReviewsModel.__table__.c)
+            .cte("review")
+        )
+        stmt = select(aliased(EventReviewsModel, review)).add_cte(cls._rate_event(review, None, review.c.rating))
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
     @classmethod
-    async def avg_rating(
+    async def update_rated(cls, session: AsyncSession, *where, obj_in: EventReviewsUpdateDB) -> Optional[EventReviewsModel]:
+        old = select(EventReviewsModel.id, EventReviewsModel.rating).filter(*where).with_for_update().cte("old")
+        review = (
+            update(EventReviewsModel)
+            .where(EventReviewsModel.id == old.c.id)
+            .values(**obj_in.model_dump(exclude_unset=True))
+            .returning(*EventReviewsModel.__table__.c, old.c.rating.label("old_rating"))
+            .cte("review")
+        )
+        stmt = select(aliased(EventReviewsModel, review)).add_cte(
+            cls._rate_event(review, review.c.old_rating, review.c.rating)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
+    @classmethod
+    async def delete_rated(cls, session: AsyncSession, *where) -> int:
+        review = delete(EventReviewsModel).where(*where).returning(*EventReviewsModel.__table__.c).cte("review")
+        stmt = select(func.count()).select_from(review).add_cte(cls._rate_event(review, review.c.rating, None))
+        result = await session.execute(stmt)
+        return result.scalar()
+
+
+class EventPhotoDao(BaseDAO[EventPhotoModel, EventPhotoCreateDB, EventPhotoUpdateDB]):
+    model = EventPhotoModel
+
+    @classmethod
+    async def find_existing_object_names(cls, session: AsyncSession, object_names: List[str]) -> Set[str]:
+        if not object_names:
+            return set()
+
+        # Archived events keep their photos in the bucket.
+        stmt = (
+            select(EventPhotoModel.object_name)
+            .filter(EventPhotoModel.object_name.in_(object_names))
+            .union(
+                select(EventPhotoArchiveModel.object_name)
+                .filter(EventPhotoArchiveModel.object_name.in_(object_names))
+            )
+        )
+        result = await session.execute(stmt)
+        return set(result.scalars().all())
+
+    @classmethod
+    async def find_owned_object_name(
             cls,
             session: AsyncSession,
-            *filter,
-            **filter_by
-    ):
-        stmt = select(func.avg(EventReviewsModel.rating)).filter(*filter).filter_by(**filter_by)
-        avg_rating = await session.execute(stmt)
-        return avg_rating.scalar()
+            photo_id: uuid.UUID,
+            event_id: uuid.UUID,
+            user_id: uuid.UUID
+    ) -> Optional[str]:
+        stmt = (
+            select(EventPhotoModel.object_name)
+            .join(EventModel, EventModel.id == EventPhotoModel.event_id)
+            .filter(
+                EventPhotoModel.id == photo_id,
+                EventPhotoModel.event_id == event_id,
+                EventModel.user_id == user_id
+            )
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
 
+    @classmethod
+    async def find_cover_urls(cls, session: AsyncSession, event_ids: List[uuid.UUID]) -> Dict[uuid.UUID, str]:
+        """The first uploaded photo of every event, in one DISTINCT ON query."""
+        if not event_ids:
+            return {}
 
-class EventPhotoDao(BaseDAO[EventPhotoModel, EventPhotoCreateDB, EventPhotoUpdateDB]):
-    model = EventPhotoModel
\ No newline at end of file
+        stmt = (
+            select(EventPhotoModel.event_id, EventPhotoModel.url)
+            .filter(any_of(EventPhotoModel.event_id, event_ids))
+            .distinct(EventPhotoModel.event_id)
+            .order_by(EventPhotoModel.event_id, EventPhotoModel.created_at, EventPhotoModel.id)
+        )
+        result = await session.execute(stmt)
+        return dict(result.all()) #type: ignore
\ No newline at end of file
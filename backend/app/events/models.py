@@ -4,9 +4,12 @@ from typing import List
 from datetime import datetime
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import ForeignKey, ARRAY, String, TIMESTAMP
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import TSTZRANGE, Range
+from sqlalchemy import ForeignKey, ARRAY, String, TIMESTAMP, UniqueConstraint, CheckConstraint, Index, Computed, text
 
 from app.database import Base
+from app.utils.uuid7 import uuid7
 
 
 class EventEnvironment(str, Enum):
@@ -17,40 +20,188 @@ class EventEnvironment(str, Enum):
 
 class EventModel(Base):
     __tablename__ = "events"
+    # Range partitioned by month on start (app/events/partitions.py), so the
+    # primary key and unique keys include start, address uniqueness lives in
+    # event_addresses, and tables referencing events.id rely on triggers
+    # instead of foreign keys.
+    # Search always filters on is_active, so the search indexes are partial
+    # and only cover live events. See app/index_audit.py.
+    __table_args__ = (
+        Index("events_address_idx", "address", "start", unique=True),
+        # One per sort mode of EventService.search_order, matching its ORDER BY
+        # so a page is read straight off the index.
+        Index("events_active_start_id_idx", "start", "id", postgresql_where=text("is_active")),
+        Index(
+            "events_active_score_idx",
+            text("rating_score DESC NULLS LAST"),
+            text("id DESC"),
+            postgresql_where=text("is_active")
+        ),
+        Index("events_active_reviews_idx", text("count_reviews DESC"), text("id DESC"), postgresql_where=text("is_active")),
+        Index("events_active_favorites_idx", text("count_favorites DESC"), text("id DESC"), postgresql_where=text("is_active")),
+        Index("events_active_environment_start_idx", "environment", "start", postgresql_where=text("is_active")),
+        Index("events_active_end_idx", "end", postgresql_where=text("is_active")),
+        Index("events_inactive_end_idx", "end", postgresql_where=text("NOT is_active")),
+        Index(
+            "events_active_name_trgm_idx",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=text("is_active")
+        ),
+        # Time window overlap and "happening now", optionally narrowed to a
+        # bounding box around the caller.
+        Index(
+            "events_active_during_location_idx",
+            "during",
+            text("point(longitude, latitude)"),
+            postgresql_using="gist",
+            postgresql_where=text("is_active")
+        ),
+        # Map viewport queries, see EventService.get_clusters.
+        Index(
+            "events_active_location_idx",
+            text("point(longitude, latitude)"),
+            postgresql_using="gist",
+            postgresql_where=text("is_active")
+        ),
+        # EventSuggestService.sync reads the rows changed since its last run,
+        # active or not, every EVENT_SUGGEST_SYNC_SECONDS.
+        Index("events_updated_at_idx", "updated_at"),
+        # during below never raises on its own (see greatest), so an end before
+        # start fails here with a check violation that the API maps to 422.
+        CheckConstraint('start <= "end"', name="start_before_end"),
+        {"postgresql_partition_by": "RANGE (start)"},
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, index=True, default=uuid.uuid4)
-    name: Mapped[str] = mapped_column(index=True)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
+    name: Mapped[str] = mapped_column()
     description: Mapped[str] = mapped_column()
-    address: Mapped[str] = mapped_column(index=True)
-    latitude: Mapped[float] = mapped_column(index=True)
-    longitude: Mapped[float] = mapped_column(index=True)
-    capacity: Mapped[int] = mapped_column(index=True)
+    address: Mapped[str] = mapped_column()
+    latitude: Mapped[float] = mapped_column()
+    longitude: Mapped[float] = mapped_column()
+    capacity: Mapped[int] = mapped_column()
     # photo_path: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=True)
-    environment: Mapped[EventEnvironment] = mapped_column(index=True)
-    start: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True),index=True)
-    end: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), index=True)
-    age_rating: Mapped[int] = mapped_column(index=True)
-    average_rating: Mapped[float] = mapped_column(index=True, nullable=True)
+    environment: Mapped[EventEnvironment] = mapped_column()
+    start: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    end: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    during: Mapped[Range[datetime]] = mapped_column(TSTZRANGE, Computed("tstzrange(start, greatest(start, \"end\"), '[)')"))
+    age_rating: Mapped[int] = mapped_column()
+    average_rating: Mapped[float] = mapped_column(nullable=True)
+    # Bayesian average towards EventRatingPriorModel; NULL until reviewed.
+    rating_score: Mapped[float] = mapped_column(nullable=True)
     count_reviews: Mapped[int] = mapped_column(default=0)
+    # Sum of all ratings, so a review write can move the average and score
+    # by its own delta (EventDao.rating_delta).
+    rating_total: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    # Star histogram, moved with the counters by EventDao.rating_delta.
+    rating_1: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_2: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_3: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_4: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_5: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    count_favorites: Mapped[int] = mapped_column(default=0, server_default=text("0"))
     is_active: Mapped[bool] = mapped_column()
 
-    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
+
+
+class EventAddressModel(Base):
+    """One row per live event, outside the partitioned table.
+
+    A unique index on a partitioned table has to include the partition key,
+    so ``address`` alone is unique here instead. The ``events_sync_address``
+    trigger keeps it in line with every insert, update and delete on
+    ``events``; ``EventService.create_new_event`` claims the address first
+    so a taken one is a 409 rather than a constraint error.
+    """
+    __tablename__ = "event_addresses"
+
+    address: Mapped[str] = mapped_column(primary_key=True)
+    event_id: Mapped[uuid.UUID] = mapped_column(unique=True)
+    start: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
 
 
 class EventReviewsModel(Base):
     __tablename__ = "events_reviews"
+    __table_args__ = (UniqueConstraint("user_id", "event_id"),)
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     content: Mapped[str] = mapped_column(nullable=False)
     rating: Mapped[int] = mapped_column(nullable=False)
-    event_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), index=True)
+    event_id: Mapped[uuid.UUID] = mapped_column(index=True)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
 
 
 class EventPhotoModel(Base):
     __tablename__ = "events_photo"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     url: Mapped[str] = mapped_column(nullable=False, unique=True)
     object_name: Mapped[str] = mapped_column(nullable=False, unique=True, index=True)
-    event_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), index=True)
\ No newline at end of file
+    event_id: Mapped[uuid.UUID] = mapped_column(index=True)
+
+
+class EventRatingPriorModel(Base):
+    """The single row holding the prior behind ``events.rating_score``:
+    ``(weight * mean + sum of ratings) / (weight + count_reviews)``."""
+    __tablename__ = "event_rating_prior"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False, default=1)
+    mean: Mapped[float] = mapped_column()
+    weight: Mapped[float] = mapped_column()
+
+
+# Finished events past EVENT_ARCHIVE_AFTER_DAYS are moved here together with
+# their reviews, photo metadata and favorites (see app/events/archive.py).
+# The columns mirror the live tables so rows can be copied as they are.
+
+class EventArchiveModel(Base):
+    __tablename__ = "events_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column()
+    description: Mapped[str] = mapped_column()
+    address: Mapped[str] = mapped_column()
+    latitude: Mapped[float] = mapped_column()
+    longitude: Mapped[float] = mapped_column()
+    capacity: Mapped[int] = mapped_column()
+    environment: Mapped[EventEnvironment] = mapped_column()
+    start: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    end: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    age_rating: Mapped[int] = mapped_column()
+    average_rating: Mapped[float] = mapped_column(nullable=True)
+    rating_score: Mapped[float] = mapped_column(nullable=True)
+    count_reviews: Mapped[int] = mapped_column(default=0)
+    rating_total: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_1: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_2: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_3: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_4: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    rating_5: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    count_favorites: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    is_active: Mapped[bool] = mapped_column()
+    archived_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
+
+
+class EventReviewsArchiveModel(Base):
+    __tablename__ = "events_reviews_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    content: Mapped[str] = mapped_column(nullable=False)
+    rating: Mapped[int] = mapped_column(nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+    event_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("events_archive.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
+
+
+class EventPhotoArchiveModel(Base):
+    __tablename__ = "events_photo_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    url: Mapped[str] = mapped_column(nullable=False)
+    object_name: Mapped[str] = mapped_column(nullable=False, unique=True, index=True)
+    archived_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+    event_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("events_archive.id", ondelete="CASCADE"), index=True)
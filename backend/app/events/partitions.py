@@ -0,0 +1,163 @@
+import re
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session_maker
+from app.config import settings
+from app.events.models import EventModel
+from app.events.archive import EventArchiveService
+
+log = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "events_p"
+DEFAULT_PARTITION = "events_default"
+
+_PARTITION_NAME = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+def months_to_create(existing: List[str], now: datetime, premake: int) -> List[datetime]:
+    """Months from the current one up to ``premake`` ahead without a partition."""
+    current = month_start(now)
+    have = {partition_month(name) for name in existing}
+    return [month for month in (add_months(current, n) for n in range(premake + 1)) if month not in have]
+
+
+def partitions_to_detach(existing: List[str], now: datetime, retention: int) -> List[str]:
+    """Monthly partitions whose whole month lies more than ``retention`` months
+    back. Only candidates: ``EventPartitionService.drop_partition`` decides
+    from their contents."""
+    cutoff = add_months(month_start(now), -retention)
+    return sorted(
+        name for name in existing
+        if partition_month(name) is not None and add_months(partition_month(name), 1) <= cutoff
+    )
+
+
+class EventPartitionService:
+    """Maintains the monthly range partitions of ``events``.
+
+    Partitions are created ``EVENT_PARTITION_PREMAKE_MONTHS`` ahead so
+    inserts never fall into ``events_default``, which only catches the odd
+    event scheduled further out. A partition older than
+    ``EVENT_PARTITION_RETENTION_MONTHS`` is dropped once the archive job has
+    emptied it. Month alone says nothing about whether an event finished (a
+    festival can run for a year), so a partition still holding active or
+    recently ended events, or anything the archive pass left behind, stays
+    attached and is reported as skipped.
+    """
+
+    @classmethod
+    async def list_partitions(cls, session: AsyncSession) -> List[str]:
+        result = await session.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'events'::regclass ORDER BY c.relname"
+        ))
+        return list(result.scalars().all())
+
+    @classmethod
+    async def create_partition(cls, session: AsyncSession, month: datetime) -> str:
+        name = partition_name(month)
+        bounds = {"lower": month, "upper": add_months(month, 1)}
+        values = f"FROM ('{month.isoformat()}') TO ('{bounds['upper'].isoformat()}')"
+
+        # Rows for this month that already sit in the default partition would
+        # make CREATE ... PARTITION OF fail, so they are moved across while the
+        # default partition is detached.
+        result = await session.execute(
+            text(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE start >= :lower AND start < :upper)'),
+            bounds
+        )
+        if not result.scalar():
+            await session.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF events FOR VALUES {values}"))
+            return name
+
+        await session.execute(text(f"ALTER TABLE events DETACH PARTITION {DEFAULT_PARTITION}"))
+        await session.execute(text(f"CREATE TABLE {name} PARTITION OF events FOR VALUES {values}"))
+        columns = ", ".join(f'"{column.name}"' for column in EventModel.__table__.columns if column.computed is None)
+        await session.execute(
+            text(f"INSERT INTO events ({columns}) SELECT {columns} FROM {DEFAULT_PARTITION} WHERE start >= :lower AND start < :upper"),
+            bounds
+        )
+        await session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE start >= :lower AND start < :upper"), bounds)
+        await session.execute(text(f"ALTER TABLE events ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        return name
+
+    @classmethod
+    async def has_live_events(cls, session: AsyncSession, name: str, cutoff: datetime) -> bool:
+        """Whether ``name`` holds events the archive job will not move yet."""
+        result = await session.execute(
+            text(f'SELECT EXISTS (SELECT 1 FROM {name} WHERE is_active OR "end" >= :cutoff)'),
+            {"cutoff": cutoff}
+        )
+        return bool(result.scalar())
+
+    @classmethod
+    async def drop_partition(cls, session: AsyncSession, name: str) -> bool:
+        """Detaches and drops ``name`` in one transaction if it is empty;
+        otherwise rolls back, leaving it attached. Returns whether it was dropped."""
+        await session.execute(text(f"ALTER TABLE events DETACH PARTITION {name}"))
+        result = await session.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})"))
+        if result.scalar():
+            await session.rollback()
+            return False
+        await session.execute(text(f"DROP TABLE {name}"))
+        await session.commit()
+        return True
+
+    @classmethod
+    async def maintain(cls, session_maker=None, now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        if session_maker is None:
+            session_maker = async_session_maker
+        now = now or datetime.now(timezone.utc)
+
+        report: Dict[str, List[str]] = {"created": [], "dropped": [], "skipped": []}
+        async with session_maker() as session:
+            existing = await cls.list_partitions(session)
+
+            for month in months_to_create(existing, now, settings.EVENT_PARTITION_PREMAKE_MONTHS):
+                report["created"].append(await cls.create_partition(session, month))
+                await session.commit()
+
+        candidates = partitions_to_detach(existing, now, settings.EVENT_PARTITION_RETENTION_MONTHS)
+        if candidates:
+            # Same cutoff as the archive pass: whatever it leaves is not ours to drop.
+            await EventArchiveService.archive_finished_events(session_maker)
+            cutoff = now - timedelta(days=settings.EVENT_ARCHIVE_AFTER_DAYS)
+
+        for name in candidates:
+            async with session_maker() as session:
+                if await cls.has_live_events(session, name, cutoff):
+                    log.warning("Event partition past retention still has live events", extra={"partition": name})
+                    report["skipped"].append(name)
+                elif await cls.drop_partition(session, name):
+                    report["dropped"].append(name)
+                else:
+                    log.warning("Event partition past retention is not empty after archiving", extra={"partition": name})
+                    report["skipped"].append(name)
+
+        log.info("Event partitions maintained", extra=report)
+        return report
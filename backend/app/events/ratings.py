@@ -0,0 +1,78 @@
+import logging
+
+from sqlalchemy import select, func
+
+from app.events.dao import EventDao, EventRatingPriorDao, PRIOR_ID
+from app.events.models import EventReviewsModel
+from app.database import async_session_maker
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+
+class EventRatingService:
+    """Keeps the prior behind ``events.rating_score`` in line with the reviews.
+
+    Review writes rescore their own event against the stored prior. This job
+    moves the prior to the current mean of all ratings once it has drifted
+    by ``EVENT_RATING_PRIOR_TOLERANCE`` or the configured weight changed,
+    then rescores every event in id order, one transaction per batch.
+
+    ``rebuild_ratings`` recomputes every rating column, histogram included,
+    from the reviews themselves, and ``count_favorites`` from the favorites,
+    for repairs after manual data changes.
+    """
+
+    @classmethod
+    async def refresh_prior(cls, session_maker=None) -> int:
+        if session_maker is None:
+            session_maker = async_session_maker
+
+        weight = settings.EVENT_RATING_PRIOR_WEIGHT
+        async with session_maker() as session:
+            mean = (await session.execute(select(func.avg(EventReviewsModel.rating)))).scalar()
+            if mean is None:
+                log.info("No reviews yet, rating prior left unchanged")
+                return 0
+
+            mean = float(mean)
+            prior = await EventRatingPriorDao.find_one_or_none(session, id=PRIOR_ID)
+            if prior is not None and prior.weight == weight and abs(prior.mean - mean) < settings.EVENT_RATING_PRIOR_TOLERANCE:
+                log.info("Rating prior unchanged", extra={"mean": prior.mean, "current_mean": mean})
+                return 0
+
+            await EventRatingPriorDao.save(session, mean, weight)
+            await session.commit()
+
+        total = 0
+        after = None
+        while True:
+            async with session_maker() as session:
+                rescored = await EventDao.rescore(session, mean, weight, after, settings.EVENT_RATING_RESCORE_BATCH_SIZE)
+                await session.commit()
+            total += len(rescored)
+            if len(rescored) < settings.EVENT_RATING_RESCORE_BATCH_SIZE:
+                break
+            after = rescored[-1]
+        log.info("Rating prior refreshed", extra={"mean": mean, "weight": weight, "count": total})
+        return total
+
+    @classmethod
+    async def rebuild_ratings(cls, session_maker=None) -> int:
+        if session_maker is None:
+            session_maker = async_session_maker
+
+        total = 0
+        after = None
+        while True:
+            async with session_maker() as session:
+                event_ids = await EventDao.next_ids(session, after, settings.EVENT_RATING_REBUILD_BATCH_SIZE)
+                if event_ids:
+                    await EventDao.refresh_ratings(session, event_ids)
+                    await session.commit()
+            total += len(event_ids)
+            if len(event_ids) < settings.EVENT_RATING_REBUILD_BATCH_SIZE:
+                break
+            after = event_ids[-1]
+        log.info("Event ratings rebuilt", extra={"count": total})
+        return total
@@ -1,22 +1,32 @@
 import uuid
 import io
+import asyncio
 import logging
 from PIL import Image
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Query, status
 
-from app.events.schemas import EventCreate, Event, EventUpdate, EventSearch
+from app.events.schemas import EventCreate, Event, EventUpdate, EventSearch, EventBatch, EventCluster, EventSearchPage
+from app.events.schemas import EventSuggestion
 from app.events.schemas import EventReviews, EventReviewsCreate, EventReviewsUpdate
 from app.events.schemas import EventPhoto
 from app.events.service import EventService, EventReviewsService
+from app.events.models import EventModel
 from app.users.models import UserModel
-from app.auth.dependencies import get_current_active_user, get_current_organizer
+from app.auth.dependencies import get_current_active_user, get_current_organizer, get_optional_user_id
+from app.responses import ORMRenderer
 
 log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/events", tags=['events'])
 
+event_renderer = ORMRenderer(Event, EventModel)
+photo_renderer = ORMRenderer(EventPhoto)
+review_renderer = ORMRenderer(EventReviews)
+cluster_renderer = ORMRenderer(EventCluster)
+suggestion_renderer = ORMRenderer(EventSuggestion)
+
 
 @router.post("/")
 async def create_event(
@@ -29,7 +39,7 @@ async def create_event(
 
 @router.get("/{event_id}/photo")
 async def get_photos(event_id: uuid.UUID, offset: int, limit: int) -> List[EventPhoto]:
-    return await EventService.get_photos(event_id, offset, limit)
+    return photo_renderer.response(await EventService.get_photos(event_id, offset, limit))
 
 
 @router.post("/{event_id}/photo")
@@ -82,19 +92,93 @@ async def delete_photo(
     return {"message": "The photo was successfully deleted"}
 
 
+FIELDS_QUERY = Query(None, description="Comma-separated list of fields to return, e.g. id,name,latitude,longitude,start")
+INCLUDE_COVER_QUERY = Query(False, description="Add the URL of the first photo as cover_photo")
+INCLUDE_FAVORITE_QUERY = Query(False, description="Add is_favorite for the signed-in user")
+
+
+def extras_renderer(columns: Optional[tuple], include_cover: bool, include_favorite: bool) -> ORMRenderer:
+    if columns:
+        columns += ("cover_photo",) * include_cover + ("is_favorite",) * include_favorite
+    return event_renderer.only(columns)
+
+
+@router.get("/suggest")
+async def suggest_events(
+        q: str = Query(..., min_length=1, max_length=100),
+        limit: int = Query(10, ge=1, le=20)
+) -> List[EventSuggestion]:
+    return suggestion_renderer.response(EventService.suggest(q, limit))
+
+
+@router.get("/clusters")
+async def get_event_clusters(
+        west: float = Query(..., ge=-180, le=180),
+        south: float = Query(..., ge=-90, le=90),
+        east: float = Query(..., ge=-180, le=180),
+        north: float = Query(..., ge=-90, le=90),
+        zoom: int = Query(..., ge=0, le=22)
+) -> List[EventCluster]:
+    return cluster_renderer.response(await EventService.get_clusters(west, south, east, north, zoom))
+
+
+@router.post("/batch")
+async def get_events_batch(
+        batch: EventBatch,
+        fields: Optional[str] = FIELDS_QUERY
+) -> List[Event]:
+    columns = event_renderer.columns(fields)
+    return event_renderer.only(columns).response(await EventService.get_events_by_ids(batch.ids, columns))
+
+
 @router.get("/{event_id}")
-async def get_event(event_id: uuid.UUID) -> Event:
-    return await EventService.get_event(event_uuid=event_id)
+async def get_event(
+        event_id: uuid.UUID,
+        fields: Optional[str] = FIELDS_QUERY,
+        include_cover: bool = INCLUDE_COVER_QUERY,
+        include_favorite: bool = INCLUDE_FAVORITE_QUERY,
+        user_id: Optional[uuid.UUID] = Depends(get_optional_user_id)
+) -> Event:
+    columns = event_renderer.columns(fields)
+    db_event = await EventService.get_event(
+        event_uuid=event_id,
+        columns=columns,
+        cover_photo=include_cover,
+        user_id=user_id if include_favorite else None
+    )
+    return extras_renderer(columns, include_cover, include_favorite).response_one(db_event)
 
 
 @router.post("/search")
 async def get_events(
         offset: int,
         limit: int,
-        event: EventSearch
-) -> List[Event]:
+        event: EventSearch,
+        fields: Optional[str] = FIELDS_QUERY,
+        include_cover: bool = INCLUDE_COVER_QUERY,
+        include_favorite: bool = INCLUDE_FAVORITE_QUERY,
+        include_facets: bool = Query(
+            False,
+            description="Return {items, facets} with counts per environment, age rating and rating band"
+        ),
+        user_id: Optional[uuid.UUID] = Depends(get_optional_user_id)
+) -> Union[List[Event], EventSearchPage]:
     log.debug("Search events", extra={"offset": offset, "limit": limit, "search_params": event.model_dump(exclude_none=True)})
-    return await EventService.get_events(event, offset, limit)
+    columns = event_renderer.columns(fields)
+    events_query = EventService.get_events(
+        event,
+        offset,
+        limit,
+        columns,
+        cover_photo=include_cover,
+        user_id=user_id if include_favorite else None
+    )
+    renderer = extras_renderer(columns, include_cover, include_favorite)
+    if not include_facets:
+        return renderer.response(await events_query)
+
+    db_events, facets = await asyncio.gather(events_query, EventService.get_facets(event))
+    return renderer.response_page(db_events, facets=facets)
 
 
 @router.put("/{event_id}")
@@ -118,9 +202,9 @@ async def delete_event(
 
 
 @router.get("/{event_id}/reviews")
-async def get_reviews(event_id: uuid.UUID, offset: int, limit: int):
+async def get_reviews(event_id: uuid.UUID, offset: int, limit: int) -> List[EventReviews]:
     log.debug("Getting event reviews", extra={"event_id": str(event_id), "offset": offset, "limit": limit})
-    return await EventReviewsService.get_reviews(offset, limit, event_id=event_id)
+    return review_renderer.response(await EventReviewsService.get_reviews(offset, limit, event_id=event_id))
 
 
 @router.post("/{event_id}/reviews")
@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import ClassVar, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 from app.events.models import EventEnvironment
 
@@ -35,6 +36,12 @@ class EventCreate(EventBase):
 
 
     model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="after")
+    def check_start_before_end(self) -> "EventCreate":
+        if self.start > self.end:
+            raise ValueError("start must not be after end")
+        return self
     
     
 class EventCreateDB(EventBase):
@@ -48,15 +55,82 @@ class EventUpdateDB(EventBase):
 
 class EventUpdate(EventBase):
     # photo_path: Optional[list] = Field(None)
-    pass
+
+    # Only checkable when both are sent; the events_start_before_end_check
+    # constraint covers a partial update against the stored value.
+    @model_validator(mode="after")
+    def check_start_before_end(self) -> "EventUpdate":
+        if self.start is not None and self.end is not None and self.start > self.end:
+            raise ValueError("start must not be after end")
+        return self
 
 
 class Event(EventCreate):
+    # Not columns of EventModel: attached per request or not stored at all,
+    # so rows without them render null.
+    row_extras: ClassVar[Tuple[str, ...]] = ("photo_path", "cover_photo", "is_favorite")
+
     id: uuid.UUID
     user_id: uuid.UUID
     photo_path: Optional[list] = Field(None)
     average_rating: Optional[float] = Field(None)
+    rating_score: Optional[float] = Field(None)
     count_reviews: Optional[int] = Field(None)
+    rating_1: Optional[int] = Field(None)
+    rating_2: Optional[int] = Field(None)
+    rating_3: Optional[int] = Field(None)
+    rating_4: Optional[int] = Field(None)
+    rating_5: Optional[int] = Field(None)
+    count_favorites: Optional[int] = Field(None)
+    cover_photo: Optional[str] = Field(None)
+    is_favorite: Optional[bool] = Field(None)
+
+
+class EventBatch(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1)
+
+
+class EventAddressDB(BaseModel):
+    address: str
+    event_id: uuid.UUID
+    start: datetime
+
+
+class EventRatingPriorDB(BaseModel):
+    mean: float
+    weight: float
+
+
+class EventFacets(BaseModel):
+    environment: Dict[str, int]
+    age_rating: Dict[str, int]
+    rating: Dict[str, int]
+
+
+class EventSearchPage(BaseModel):
+    items: List[Event]
+    facets: EventFacets
+
+
+class EventSuggestion(BaseModel):
+    id: uuid.UUID
+    name: str
+    address: str
+
+
+class EventCluster(BaseModel):
+    event_id: uuid.UUID
+    count: int
+    latitude: float
+    longitude: float
+
+
+class EventSort(str, Enum):
+    start = "start"
+    rating = "rating"
+    reviews = "reviews"
+    distance = "distance"
+    popularity = "popularity"
 
 
 class EventSearch(BaseModel):
@@ -67,6 +141,24 @@ class EventSearch(BaseModel):
     start: Optional[datetime] = Field(None)
     age_rating: Optional[int] = Field(None, ge=1, le=18)
     average_rating: Optional[int] = Field(None, ge=1, le=5)
+    upcoming: bool = Field(True, description="Only events that have not ended yet")
+    window_start: Optional[datetime] = Field(None, description="Events overlapping [window_start, window_end)")
+    window_end: Optional[datetime] = Field(None)
+    happening_now: bool = Field(False, description="Only events in progress right now")
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    radius_km: Optional[float] = Field(None, gt=0, le=100)
+    sort: EventSort = Field(EventSort.start, description="distance sorts from latitude/longitude")
+
+    @model_validator(mode="after")
+    def check_window_and_location(self) -> "EventSearch":
+        if self.window_start and self.window_end and self.window_start >= self.window_end:
+            raise ValueError("window_start must be before window_end")
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be given together")
+        if self.latitude is None and (self.radius_km is not None or self.sort == EventSort.distance):
+            raise ValueError("radius_km and sort=distance need latitude and longitude")
+        return self
 
 
 class EventReviewsBase(BaseModel):
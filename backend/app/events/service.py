@@ -1,40 +1,89 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
+import math
+import time
 import uuid
 import logging
 
 from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import TSTZRANGE
 
-from app.events.dao import EventDao, EventReviewsDao, EventPhotoDao
+from app.events.dao import event_key, EventDao, EventAddressDao, EventReviewsDao, EventPhotoDao
 from app.events.models import EventModel, EventReviewsModel, EventPhotoModel
-from app.events.schemas import EventCreate, Event, EventCreateDB, EventUpdate, EventUpdateDB, EventSearch
+from app.events.schemas import EventAddressDB, EventCreate, Event, EventCreateDB, EventUpdate, EventUpdateDB, EventSearch, EventSort
+from app.config import settings
+from app.base_dao import any_of
 from app.events.schemas import EventReviews, EventReviewsUpdateDB, EventReviewsCreateDB, EventReviewsCreate, EventReviewsUpdate
 from app.events.schemas import EventPhoto
+from app.users.dao import UserEventFavoritesDao
 from app.database import async_session_maker
+from app.utils.cache import TTLCache
+from app.utils.uuid7 import uuid7
+from app.responses import RowWithExtras
+from app.events.suggest import Suggestion, suggest_index
 from app.tasks.S3_tasks import EventPhotoTasks
 
 log = logging.getLogger(__name__)
 
+KM_PER_DEGREE = 111.32
+
+# SQLSTATE of a CHECK constraint violation.
+CHECK_VIOLATION = "23514"
+
+# Facet counts by search filters. They are the same for every page of a
+# search, so paging through results reuses them.
+facet_cache: TTLCache[Dict[str, Dict[str, int]]] = TTLCache(settings.EVENT_FACETS_CACHE_SIZE)
+
+
+def within_box(west: float, south: float, east: float, north: float):
+    """Events inside the box; answerable by the GiST index on
+    ``point(longitude, latitude)``."""
+    box = func.box(func.point(west, south), func.point(east, north))
+    return func.point(EventModel.longitude, EventModel.latitude).op("<@", is_comparison=True)(box)
+
+
+def within_radius(latitude: float, longitude: float, radius_km: float):
+    """Events inside the bounding box of the circle."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    lon_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return within_box(longitude - lon_delta, latitude - lat_delta, longitude + lon_delta, latitude + lat_delta)
+
+
+async def event_write_error(session, event_uuid: uuid.UUID, user_id: uuid.UUID) -> HTTPException:
+    """Tells a missing event from someone else's after a conditional write
+    matched no rows; the successful path never pays for this query."""
+    if await EventDao.exists(session, event_key(event_uuid)):
+        log.warning("User does not have permission to modify event", extra={"event_id": str(event_uuid), "user_id": str(user_id)})
+        return HTTPException(status.HTTP_403_FORBIDDEN, detail="Insufficient rights to modify the event")
+
+    log.warning("Event not found", extra={"event_id": str(event_uuid), "user_id": str(user_id)})
+    return HTTPException(status.HTTP_404_NOT_FOUND, detail="Event not found")
+
 
 class EventService:
     @classmethod
     async def create_new_event(cls, user_id: uuid.UUID, new_event: EventCreate) -> Event:
         async with async_session_maker() as session:
-            event_exist = await EventDao.find_one_or_none(
+            event_id = uuid7()
+            # Claimed before the insert so a taken address is a 409; the
+            # events_sync_address trigger finds the row already in place.
+            claimed = await EventAddressDao.add_if_absent(
                 session,
-                address=new_event.address
+                EventAddressDB(address=new_event.address, event_id=event_id, start=new_event.start),
+                conflict_columns=["address"]
             )
-            if event_exist:
+
+            if claimed is None:
                 raise HTTPException(status.HTTP_409_CONFLICT, detail="Event the already")
 
             db_event = await EventDao.add(
                 session,
-                EventCreateDB(
-                    **new_event.model_dump(),
-                    user_id=user_id,
-                )
+                {**EventCreateDB(**new_event.model_dump(), user_id=user_id).model_dump(exclude_unset=True), "id": event_id}
             )
 
             await session.commit()
+            suggest_index.put(Suggestion(db_event.id, db_event.name, db_event.address), db_event.is_active)
             log.info("The event has registered", extra={"user_id": db_event.id})
             return db_event
 
@@ -44,7 +93,7 @@ class EventService:
         async with async_session_maker() as session:
             db_event = await EventDao.find_one_or_none(
                 session,
-                id=event_uuid
+                event_key(event_uuid)
             )
             if not db_event:
                 raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Event not found")
@@ -69,7 +118,7 @@ class EventService:
         async with async_session_maker() as session:
             db_event = await EventDao.find_one_or_none(
                 session,
-                id=event_uuid
+                event_key(event_uuid)
             )
             if not db_event:
                 raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Event not found")
@@ -88,88 +137,245 @@ class EventService:
     @classmethod
     async def delete_photo(cls, event_uuid: uuid.UUID, photo_uuid: uuid.UUID, user_id: uuid.UUID):
         async with async_session_maker() as session:
-            db_event = await EventDao.find_one_or_none(
-                session,
-                id=event_uuid
-            )
-            if not db_event:
-                raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Event not found")
+            object_name = await EventPhotoDao.find_owned_object_name(session, photo_uuid, event_uuid, user_id)
 
-            if db_event.user_id != user_id:
-                raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Insufficient rights to modify the event")
+            if object_name is None:
+                if await EventDao.exists(session, event_key(event_uuid), user_id=user_id):
+                    raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Photo not found")
+                raise await event_write_error(session, event_uuid, user_id)
 
-            db_photo = await EventPhotoDao.find_one_or_none(session, id=photo_uuid)
+            EventPhotoTasks.delete_photos_task.delay(photo_names=[object_name])
+            log.debug("Delete photo", extra={"photo_id": photo_uuid})
 
-            if db_photo is None:
-                raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Photo not found")
 
-            EventPhotoTasks.delete_photos_task.delay(photo_names=[db_photo.object_name])
-            log.debug("Delete photo", extra={"photo_id": photo_uuid})
+    @classmethod
+    async def _attach_extras(
+            cls,
+            session,
+            db_events: list,
+            cover_photo: bool = False,
+            user_id: Optional[uuid.UUID] = None
+    ) -> list:
+        """Adds ``cover_photo`` and ``is_favorite`` to a page of events with one
+        grouped query per relation instead of one query per event."""
+        if not db_events or not (cover_photo or user_id):
+            return db_events
+
+        event_ids = [db_event.id for db_event in db_events]
+        covers = await EventPhotoDao.find_cover_urls(session, event_ids) if cover_photo else {}
+        favorites = await UserEventFavoritesDao.find_favorite_event_ids(session, user_id, event_ids) if user_id else set()
 
+        return [
+            RowWithExtras(
+                db_event,
+                cover_photo=covers.get(db_event.id),
+                is_favorite=db_event.id in favorites if user_id else None
+            )
+            for db_event in db_events
+        ]
 
     @classmethod
-    async def get_event(cls, event_uuid: uuid.UUID) -> Event:
+    async def get_event(
+            cls,
+            event_uuid: uuid.UUID,
+            columns: Optional[Sequence[str]] = None,
+            cover_photo: bool = False,
+            user_id: Optional[uuid.UUID] = None
+    ) -> Event:
         async with async_session_maker() as session:
-            db_event = await EventDao.find_one_or_none(session, id=event_uuid)
+            db_event = await EventDao.find_one_or_none(session, event_key(event_uuid), columns=columns)
 
             if db_event is None:
                 log.warning("Event not found", extra={"event_id": str(event_uuid)})
                 raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Event not found")
 
             log.debug("Event fetched", extra={"event_id": str(event_uuid)})
+            [db_event] = await cls._attach_extras(session, [db_event], cover_photo, user_id)
             return db_event
 
     @classmethod
-    async def get_events(cls, event: EventSearch, offset: int, limit: int) -> List[Event]:
+    async def get_events_by_ids(
+            cls,
+            event_ids: List[uuid.UUID],
+            columns: Optional[Sequence[str]] = None
+    ) -> List[Event]:
+        """Loads the events in one query and returns them in the order of
+        ``event_ids``; duplicates are collapsed and unknown ids skipped."""
+        event_ids = list(dict.fromkeys(event_ids))
+        if len(event_ids) > settings.EVENT_BATCH_MAX_IDS:
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"No more than {settings.EVENT_BATCH_MAX_IDS} ids per request"
+            )
+
+        async with async_session_maker() as session:
+            db_events = await EventDao.find_all(
+                session,
+                0,
+                None,
+                any_of(EventModel.id, event_ids),
+                columns=columns
+            )
+
+        by_id = {db_event.id: db_event for db_event in db_events}
+        log.debug("Events fetched by ids", extra={"requested": len(event_ids), "found": len(by_id)})
+        return [by_id[event_id] for event_id in event_ids if event_id in by_id]
+
+    @classmethod
+    async def get_clusters(
+            cls,
+            west: float,
+            south: float,
+            east: float,
+            north: float,
+            zoom: int
+    ) -> list:
+        """Upcoming events in the box grouped on a grid of
+        ``EVENT_CLUSTER_CELLS_PER_TILE`` cells per map tile at ``zoom``, so the
+        response size depends on the viewport rather than the event count."""
+        if west >= east or south >= north:
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="The box must have west < east and south < north"
+            )
+
+        cell_size = 360 / (2 ** zoom * settings.EVENT_CLUSTER_CELLS_PER_TILE)
+        async with async_session_maker() as session:
+            clusters = await EventDao.find_clusters(
+                session,
+                cell_size,
+                settings.EVENT_CLUSTER_LIMIT,
+                EventModel.is_active == True,
+                EventModel.end >= func.now(),
+                within_box(west, south, east, north)
+            )
+
+        log.debug("Event clusters fetched", extra={"zoom": zoom, "count": len(clusters)})
+        return clusters
+
+    @classmethod
+    def suggest(cls, query: str, limit: int) -> List[Suggestion]:
+        return suggest_index.search(query, limit)
+
+    @classmethod
+    def search_filters(cls, event: EventSearch) -> list:
+        filters = [EventModel.is_active == True]
+
+        if event.upcoming:
+            filters.append(EventModel.end >= func.now())
+        if event.name:
+            filters.append(EventModel.name.ilike(f"%{event.name}%"))
+        if event.capacity is not None:
+            filters.append(EventModel.capacity >= event.capacity)
+        if event.environment is not None:
+            filters.append(EventModel.environment == event.environment)
+        if event.start is not None:
+            filters.append(EventModel.start >= event.start)
+        if event.age_rating is not None:
+            filters.append(EventModel.age_rating >= event.age_rating)
+        if event.average_rating is not None:
+            filters.append(EventModel.average_rating >= event.average_rating)
+        if event.window_start is not None or event.window_end is not None:
+            # A missing bound is NULL, which tstzrange treats as unbounded.
+            window = func.tstzrange(event.window_start, event.window_end, "[)", type_=TSTZRANGE)
+            filters.append(EventModel.during.overlaps(window))
+        if event.happening_now:
+            filters.append(EventModel.during.contains(func.now()))
+        if event.radius_km is not None:
+            filters.append(within_radius(event.latitude, event.longitude, event.radius_km))
+        return filters
+
+    @classmethod
+    def search_order(cls, event: EventSearch) -> list:
+        """ORDER BY for ``event.sort``. Each ends on ``id`` so pages never
+        overlap, and each has a matching partial index on ``events``."""
+        if event.sort == EventSort.rating:
+            return [EventModel.rating_score.desc().nulls_last(), EventModel.id.desc()]
+        if event.sort == EventSort.reviews:
+            return [EventModel.count_reviews.desc(), EventModel.id.desc()]
+        if event.sort == EventSort.popularity:
+            return [EventModel.count_favorites.desc(), EventModel.id.desc()]
+        if event.sort == EventSort.distance:
+            # Planar distance in degrees; a GiST KNN scan orders by it directly.
+            here = func.point(event.longitude, event.latitude)
+            return [func.point(EventModel.longitude, EventModel.latitude).op("<->")(here), EventModel.id]
+        return [EventModel.start, EventModel.id]
+
+    @classmethod
+    async def get_events(
+            cls,
+            event: EventSearch,
+            offset: int,
+            limit: int,
+            columns: Optional[Sequence[str]] = None,
+            cover_photo: bool = False,
+            user_id: Optional[uuid.UUID] = None
+    ) -> List[Event]:
         async with async_session_maker() as session:
-            filters = [EventModel.is_active == True]
-
-            if event.name:
-                filters.append(EventModel.name.ilike(f"%{event.name}%"))
-            if event.capacity is not None:
-                filters.append(EventModel.capacity >= event.capacity)
-            if event.environment is not None:
-                filters.append(EventModel.environment == event.environment)
-            if event.start is not None:
-                filters.append(EventModel.start >= event.start)
-            if event.age_rating is not None:
-                filters.append(EventModel.age_rating >= event.age_rating)
-            if event.average_rating is not None:
-                filters.append(EventModel.average_rating >= event.average_rating)
+            filters = cls.search_filters(event)
 
             db_events = await EventDao.find_all(
                 session,
                 offset,
                 limit,
-                *filters
+                *filters,
+                columns=columns,
+                order_by=cls.search_order(event)
             )
 
             log.debug("Events fetched", extra={"count": len(db_events), "offset": offset, "limit": limit})
-            return db_events
+            return await cls._attach_extras(session, db_events, cover_photo, user_id)
 
+    @classmethod
+    def facet_key(cls, event: EventSearch) -> str:
+        """Only the fields that reach ``search_filters``: the sort order, and the
+        location when it only feeds the distance sort, don't change the counts."""
+        exclude = {"sort"}
+        if event.radius_km is None:
+            exclude |= {"latitude", "longitude"}
+        return event.model_dump_json(exclude=exclude)
 
     @classmethod
-    async def update_event(cls, event_uuid: uuid.UUID, new_event: EventUpdate, user_id: uuid.UUID) -> Event:
-        async with async_session_maker() as session:
-            db_event = await EventDao.find_one_or_none(session, id=event_uuid)
+    async def get_facets(cls, event: EventSearch) -> Dict[str, Dict[str, int]]:
+        key = cls.facet_key(event)
+        facets = facet_cache.get(key)
+        if facets is not None:
+            return facets
 
-            if db_event is None:
-                log.warning("Event not found for update", extra={"event_id": str(event_uuid)})
-                raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Event not found")
+        async with async_session_maker() as session:
+            facets = await EventDao.count_facets(session, *cls.search_filters(event))
 
-            if db_event.user_id != user_id:
-                log.warning("User does not have permission to update event", extra={"event_id": str(event_uuid), "user_id": str(user_id)})
-                raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Insufficient rights to modify the event")
+        facet_cache.set(key, facets, time.time() + settings.EVENT_FACETS_CACHE_SECONDS)
+        return facets
 
-            update_event = await EventDao.update(
-                session,
-                EventModel.id == event_uuid,
-                obj_in=EventUpdateDB(
-                    **new_event.model_dump()
+    @classmethod
+    async def update_event(cls, event_uuid: uuid.UUID, new_event: EventUpdate, user_id: uuid.UUID) -> Event:
+        async with async_session_maker() as session:
+            try:
+                updated = await EventDao.update_where(
+                    session,
+                    event_key(event_uuid),
+                    EventModel.user_id == user_id,
+                    obj_in=EventUpdateDB(
+                        **new_event.model_dump()
+                    )
                 )
-            )
+            except IntegrityError as e:
+                if getattr(e.orig, "sqlstate", None) == CHECK_VIOLATION:
+                    # A partial update moved end before the stored start, or
+                    # start after the stored end (events_start_before_end_check).
+                    log.warning("Event would end before it starts", extra={"event_id": str(event_uuid), "user_id": str(user_id)})
+                    raise HTTPException(status.HTTP_422_UNPROCESSABLE_CONTENT, detail="start must not be after end")
+                # The new address belongs to another event (events_sync_address).
+                log.warning("Event address already taken", extra={"event_id": str(event_uuid), "user_id": str(user_id)})
+                raise HTTPException(status.HTTP_409_CONFLICT, detail="Event the already")
 
+            if not updated:
+                raise await event_write_error(session, event_uuid, user_id)
+
+            [update_event] = updated
             await session.commit()
+            suggest_index.put(Suggestion(update_event.id, update_event.name, update_event.address), update_event.is_active)
             log.info("Event updated", extra={"event_id": str(event_uuid), "user_id": str(user_id)})
             return update_event
 
@@ -177,20 +383,20 @@ class EventService:
     @classmethod
     async def delete_event(cls, event_uuid: uuid.UUID, user_id: uuid.UUID) -> None:
         async with async_session_maker() as session:
-            db_event = await EventDao.find_one_or_none(session, id=event_uuid, user_id=user_id)
-
-            if db_event is None:
-                log.warning("Event not found for deletion", extra={"event_id": str(event_uuid), "user_id": str(user_id)})
-                raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Event not found")
-
-            db_photos = await EventPhotoDao.find_all(session, 0, None, EventPhotoModel.event_id==db_event.id)
-
-            photo_names = [photo.object_name for photo in db_photos]
+            photo_names = await EventDao.delete_returning_photo_names(
+                session,
+                event_key(event_uuid),
+                EventModel.user_id == user_id
+            )
 
-            EventPhotoTasks.delete_photos_task.delay(photo_names=photo_names)
+            if photo_names is None:
+                raise await event_write_error(session, event_uuid, user_id)
 
-            await EventDao.delete(session, id=db_event.id)
             await session.commit()
+            suggest_index.remove(event_uuid)
+
+            if photo_names:
+                EventPhotoTasks.delete_photos_task.delay(photo_names=photo_names)
             log.info("Event deleted", extra={"event_id": str(event_uuid), "user_id": str(user_id), "photos_count": len(photo_names)})
 
 
@@ -203,13 +409,7 @@ class EventReviewsService:
             new_review: EventReviewsCreate
     ) -> EventReviews:
         async with async_session_maker() as session:
-            exist_review = await EventReviewsDao.find_one_or_none(session, user_id=user_id, event_id=event_id)
-
-            if exist_review:
-                log.warning("Review already exists", extra={"user_id": str(user_id), "event_id": str(event_id)})
-                raise HTTPException(status.HTTP_409_CONFLICT, detail="Review the already")
-
-            db_review = await EventReviewsDao.add(
+            db_review = await EventReviewsDao.add_rated(
                 session,
                 obj_in=EventReviewsCreateDB(
                     **new_review.model_dump(),
@@ -217,14 +417,11 @@ class EventReviewsService:
                     event_id=event_id
                 )
             )
-            await session.commit()
 
-            await EventDao.update(
-                session,
-                EventModel.id == event_id,
-                obj_in={"average_rating": await EventReviewsDao.avg_rating(session, event_id=event_id),
-                        "count_reviews": await EventReviewsDao.count(session, event_id=event_id)}
-            )
+            if db_review is None:
+                log.warning("Review already exists", extra={"user_id": str(user_id), "event_id": str(event_id)})
+                raise HTTPException(status.HTTP_409_CONFLICT, detail="Review the already")
+
             await session.commit()
             log.info("Review created", extra={"user_id": str(user_id), "event_id": str(event_id), "rating": new_review.rating})
         return db_review
@@ -259,26 +456,19 @@ class EventReviewsService:
     @classmethod
     async def put_review(cls, user_id: uuid.UUID, event_id: uuid.UUID, edit_event: EventReviewsUpdate) -> EventReviews:
         async with async_session_maker() as session:
-            db_event = await EventReviewsDao.find_one_or_none(session, user_id=user_id, event_id=event_id)
-
-            if not db_event:
-                log.warning("Review not found for update", extra={"user_id": str(user_id), "event_id": str(event_id)})
-                raise HTTPException(status.HTTP_404_NOT_FOUND, detail="review not found")
-
-            db_edit_event = await EventReviewsDao.update(
+            db_edit_event = await EventReviewsDao.update_rated(
                 session,
-                EventReviewsModel.id == db_event.id,
+                EventReviewsModel.user_id == user_id,
+                EventReviewsModel.event_id == event_id,
                 obj_in=EventReviewsUpdateDB(
                     **edit_event.model_dump()
                 )
             )
-            await session.commit()
 
-            await EventDao.update(
-                session,
-                EventModel.id == event_id,
-                obj_in={"average_rating": await EventReviewsDao.avg_rating(session, event_id=event_id)}
-            )
+            if db_edit_event is None:
+                log.warning("Review not found for update", extra={"user_id": str(user_id), "event_id": str(event_id)})
+                raise HTTPException(status.HTTP_404_NOT_FOUND, detail="review not found")
+
             await session.commit()
             log.info("Review updated", extra={"user_id": str(user_id), "event_id": str(event_id), "rating": edit_event.rating})
         return db_edit_event
@@ -287,20 +477,15 @@ class EventReviewsService:
     @classmethod
     async def delete_review(cls, user_id: uuid.UUID, event_id: uuid.UUID):
         async with async_session_maker() as session:
-            db_event = await EventReviewsDao.find_one_or_none(session, user_id=user_id, event_id=event_id)
+            deleted = await EventReviewsDao.delete_rated(
+                session,
+                EventReviewsModel.user_id == user_id,
+                EventReviewsModel.event_id == event_id
+            )
 
-            if not db_event:
+            if not deleted:
                 log.warning("Review not found for deletion", extra={"user_id": str(user_id), "event_id": str(event_id)})
                 raise HTTPException(status.HTTP_404_NOT_FOUND, detail="review not found")
 
-            await EventReviewsDao.delete(session, id=db_event.id)
-            await session.commit()
-
-            await EventDao.update(
-                session,
-                EventModel.id == event_id,
-                obj_in={"average_rating": await EventReviewsDao.avg_rating(session, event_id=event_id),
-                        "count_reviews": await EventReviewsDao.count(session, event_id=event_id)}
-            )
             await session.commit()
             log.info("Review deleted", extra={"user_id": str(user_id), "event_id": str(event_id)})
\ No newline at end of file
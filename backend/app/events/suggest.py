@@ -0,0 +1,211 @@
+import sys
+import uuid
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from prometheus_client import Gauge
+from sqlalchemy import select, func
+
+from app.events.dao import EventDao
+from app.events.models import EventModel
+from app.database import async_session_maker
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+SUGGEST_INDEX_ENTRIES = Gauge("event_suggest_index_entries", "Prefix keys held by the event suggest index")
+SUGGEST_INDEX_BYTES = Gauge("event_suggest_index_bytes", "Approximate memory held by the event suggest index")
+
+# Keys start at each of the first MAX_WORDS words, so "fest" finds "Summer fest".
+MAX_WORDS = 8
+# A list slot plus the (key, id) tuple around each key.
+ENTRY_OVERHEAD = 8 + sys.getsizeof((None, None))
+
+
+class Suggestion(NamedTuple):
+    id: uuid.UUID
+    name: str
+    address: str
+
+
+def normalize(value: str) -> str:
+    return " ".join(value.casefold().split())
+
+
+def index_keys(name: str, address: str) -> Set[str]:
+    keys = set()
+    for value in (name, address):
+        words = normalize(value).split(" ")
+        for start in range(min(len(words), MAX_WORDS)):
+            keys.add(" ".join(words[start:]))
+    keys.discard("")
+    return keys
+
+
+class EventSuggestIndex:
+    """Name and address prefixes of active events in a sorted list.
+
+    A lookup is a binary search to the first key at or after the query and a
+    walk forward while keys still start with it, so it never touches the
+    database. Each process keeps its own copy; ``EventSuggestService`` fills
+    it at startup and applies changes from other processes. Past
+    ``max_entries`` keys new events are left out rather than letting the
+    index grow without bound.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: List[Tuple[str, uuid.UUID]] = []
+        self.events: Dict[uuid.UUID, Suggestion] = {}
+        self.size_bytes = 0
+
+    def replace(self, events: Iterable[Suggestion]) -> None:
+        entries: List[Tuple[str, uuid.UUID]] = []
+        indexed: Dict[uuid.UUID, Suggestion] = {}
+        size_bytes = 0
+        for event in events:
+            keys = index_keys(event.name, event.address)
+            if len(entries) + len(keys) > self.max_entries:
+                log.warning("Event suggest index is full", extra={"max_entries": self.max_entries, "events": len(indexed)})
+                break
+            entries.extend((key, event.id) for key in keys)
+            indexed[event.id] = event
+            size_bytes += self._size(keys)
+
+        entries.sort()
+        self.entries, self.events, self.size_bytes = entries, indexed, size_bytes
+        self._report()
+
+    def put(self, event: Suggestion, is_active: bool = True) -> None:
+        self.remove(event.id)
+        if not is_active:
+            return
+
+        keys = index_keys(event.name, event.address)
+        if len(self.entries) + len(keys) > self.max_entries:
+            log.warning("Event suggest index is full", extra={"max_entries": self.max_entries, "event_id": str(event.id)})
+            return
+
+        for key in keys:
+            insort(self.entries, (key, event.id))
+        self.events[event.id] = event
+        self.size_bytes += self._size(keys)
+        self._report()
+
+    def remove(self, event_id: uuid.UUID) -> None:
+        event = self.events.pop(event_id, None)
+        if event is None:
+            return
+
+        keys = index_keys(event.name, event.address)
+        for key in keys:
+            position = bisect_left(self.entries, (key, event_id))
+            if position < len(self.entries) and self.entries[position] == (key, event_id):
+                del self.entries[position]
+        self.size_bytes -= self._size(keys)
+        self._report()
+
+    def search(self, query: str, limit: int) -> List[Suggestion]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        found: Dict[uuid.UUID, Suggestion] = {}
+        position = bisect_left(self.entries, (prefix,))
+        while position < len(self.entries) and len(found) < limit:
+            key, event_id = self.entries[position]
+            if not key.startswith(prefix):
+                break
+            found.setdefault(event_id, self.events[event_id])
+            position += 1
+        return list(found.values())
+
+    @staticmethod
+    def _size(keys: Set[str]) -> int:
+        return sum(sys.getsizeof(key) + ENTRY_OVERHEAD for key in keys)
+
+    def _report(self) -> None:
+        SUGGEST_INDEX_ENTRIES.set(len(self.entries))
+        SUGGEST_INDEX_BYTES.set(self.size_bytes)
+
+
+suggest_index = EventSuggestIndex(settings.EVENT_SUGGEST_MAX_ENTRIES)
+
+
+class EventSuggestService:
+    """Keeps ``suggest_index`` in line with the ``events`` table.
+
+    Writes handled by this process update the index directly. Every
+    ``EVENT_SUGGEST_SYNC_SECONDS`` the rows updated since the last sync are
+    applied, which covers writes from other processes and the deactivation
+    job. Deletes are only visible to a full rebuild, which runs every
+    ``EVENT_SUGGEST_REBUILD_SECONDS``.
+    """
+
+    # Rows committed by transactions that started before a sync carry an
+    # older updated_at, so each sync reaches back this far.
+    SYNC_OVERLAP = timedelta(minutes=1)
+
+    synced_at: Optional[datetime] = None
+
+    @classmethod
+    async def rebuild(cls, index: EventSuggestIndex = suggest_index, session_maker=None) -> int:
+        if session_maker is None:
+            session_maker = async_session_maker
+
+        async with session_maker() as session:
+            started_at = (await session.execute(select(func.localtimestamp()))).scalar()
+            rows = await EventDao.find_all(
+                session,
+                0,
+                None,
+                EventModel.is_active == True,
+                columns=("id", "name", "address")
+            )
+
+        index.replace(Suggestion(row.id, row.name, row.address) for row in rows)
+        cls.synced_at = started_at
+        log.info("Event suggest index built", extra={"events": len(index.events), "bytes": index.size_bytes})
+        return len(index.events)
+
+    @classmethod
+    async def sync(cls, index: EventSuggestIndex = suggest_index, session_maker=None) -> int:
+        if cls.synced_at is None:
+            return await cls.rebuild(index, session_maker)
+        if session_maker is None:
+            session_maker = async_session_maker
+
+        async with session_maker() as session:
+            started_at = (await session.execute(select(func.localtimestamp()))).scalar()
+            rows = await EventDao.find_all(
+                session,
+                0,
+                None,
+                EventModel.updated_at >= cls.synced_at - cls.SYNC_OVERLAP,
+                columns=("id", "name", "address", "is_active")
+            )
+
+        for row in rows:
+            index.put(Suggestion(row.id, row.name, row.address), row.is_active)
+        cls.synced_at = started_at
+        log.debug("Event suggest index synced", extra={"changed": len(rows)})
+        return len(rows)
+
+    @classmethod
+    async def run(cls, index: EventSuggestIndex = suggest_index) -> None:
+        """Background loop started from the app lifespan."""
+        since_rebuild = 0.0
+        while True:
+            await asyncio.sleep(settings.EVENT_SUGGEST_SYNC_SECONDS)
+            since_rebuild += settings.EVENT_SUGGEST_SYNC_SECONDS
+            try:
+                if since_rebuild >= settings.EVENT_SUGGEST_REBUILD_SECONDS:
+                    await cls.rebuild(index)
+                    since_rebuild = 0.0
+                else:
+                    await cls.sync(index)
+            except Exception:
+                log.exception("Event suggest index refresh failed")
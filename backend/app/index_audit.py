@@ -0,0 +1,154 @@
+"""Index audit for the events tables.
+
+Reads ``pg_stat_user_indexes`` to report indexes that were never scanned or
+are covered by another index, then prints the plan Postgres picks for each
+search shape ``EventService.get_events`` can produce:
+
+    python -m app.index_audit
+    python -m app.index_audit --analyze --tables events events_reviews
+
+Scan counts are cumulative since the last ``pg_stat_reset()``; run it
+against a database that has served real traffic.
+"""
+import json
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.database import async_session_maker
+from app.events.models import EventModel, EventEnvironment
+from app.events.schemas import EventSearch
+from app.events.service import EventService
+
+DEFAULT_TABLES = ["events", "events_reviews", "events_photo", "user_event_favorite", "user"]
+
+
+def search_shapes() -> Dict[str, EventSearch]:
+    now = datetime.now(timezone.utc)
+    return {
+        "default": EventSearch(),
+        "start": EventSearch(start=now),
+        "environment+start": EventSearch(environment=EventEnvironment.outdoor, start=now),
+        "name": EventSearch(name="fest"),
+        "capacity+age_rating": EventSearch(capacity=50, age_rating=12),
+        "average_rating": EventSearch(average_rating=4),
+        "window": EventSearch(window_start=now, window_end=now + timedelta(hours=4)),
+        "happening_now": EventSearch(happening_now=True),
+        "happening_now+near": EventSearch(happening_now=True, latitude=55.75, longitude=37.62, radius_km=5),
+    }
+
+
+class IndexInfo(NamedTuple):
+    table: str
+    name: str
+    scans: int
+    size: int
+    is_unique: bool
+    method: str
+    columns: List[int]
+    predicate: Optional[str]
+    definition: str
+
+
+INDEX_STATS = text("""
+    SELECT s.relname, s.indexrelname, s.idx_scan, pg_relation_size(s.indexrelid),
+           i.indisunique OR i.indisprimary, am.amname, i.indkey::int2[],
+           pg_get_expr(i.indpred, i.indrelid), pg_get_indexdef(s.indexrelid)
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    JOIN pg_class c ON c.oid = s.indexrelid
+    JOIN pg_am am ON am.oid = c.relam
+    WHERE s.relname = ANY(:tables)
+    ORDER BY s.relname, s.indexrelname
+""")
+
+
+def find_unused(indexes: List[IndexInfo]) -> List[IndexInfo]:
+    """Never scanned and not enforcing a constraint."""
+    return [index for index in indexes if index.scans == 0 and not index.is_unique]
+
+
+def find_redundant(indexes: List[IndexInfo]) -> Dict[str, str]:
+    """Maps an index to another one on the same table that serves every query
+    it could: same method and predicate, and its columns as a prefix."""
+    redundant = {}
+    for index in indexes:
+        if index.is_unique or index.method != "btree":
+            continue
+        for other in indexes:
+            if (
+                other.name == index.name
+                or other.table != index.table
+                or other.method != index.method
+                or other.predicate != index.predicate
+                or other.columns[:len(index.columns)] != index.columns
+            ):
+                continue
+            # With identical columns keep the constraint, else the first name.
+            if len(other.columns) == len(index.columns) and not other.is_unique and other.name > index.name:
+                continue
+            redundant[index.name] = other.name
+            break
+    return redundant
+
+
+def plan_nodes(plan: dict) -> Iterator[str]:
+    node = plan["Node Type"]
+    if "Index Name" in plan:
+        node = f"{node} using {plan['Index Name']}"
+    yield node
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def compile_literal(stmt) -> str:
+    # Named paramstyle keeps ``%`` in ILIKE patterns from being doubled.
+    return str(stmt.compile(dialect=postgresql.dialect(paramstyle="named"), compile_kwargs={"literal_binds": True}))
+
+
+async def audit(tables: List[str], analyze: bool, limit: int) -> None:
+    async with async_session_maker() as session:
+        result = await session.execute(INDEX_STATS, {"tables": tables})
+        indexes = [IndexInfo(*row) for row in result.all()]
+
+        print(f"{'index':<45} {'scans':>10} {'size':>10}")
+        for index in indexes:
+            print(f"{index.name:<45} {index.scans:>10} {index.size / 2 ** 20:>8.1f}MB")
+
+        print("\nUnused (no scans, no constraint):")
+        for index in find_unused(indexes):
+            print(f"  {index.definition}")
+
+        print("\nRedundant:")
+        for name, covered_by in find_redundant(indexes).items():
+            print(f"  {name} is covered by {covered_by}")
+
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        connection = await session.connection()
+        print("\nSearch plans:")
+        for shape, event in search_shapes().items():
+            stmt = select(EventModel).filter(*EventService.search_filters(event)).offset(0).limit(limit)
+            result = await connection.exec_driver_sql(f"EXPLAIN ({options}) {compile_literal(stmt)}")
+            plan = result.scalar()
+            plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+            timing = f" actual={plan['Execution Time']:.2f}ms" if analyze else ""
+            print(f"  {shape:<22} cost={plan['Plan']['Total Cost']:<10}{timing}")
+            print(f"    {' -> '.join(plan_nodes(plan['Plan']))}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", nargs="+", default=DEFAULT_TABLES)
+    parser.add_argument("--analyze", action="store_true", help="run EXPLAIN ANALYZE instead of EXPLAIN")
+    parser.add_argument("--limit", type=int, default=30, help="page size used for the search shapes")
+    args = parser.parse_args()
+    asyncio.run(audit(args.tables, args.analyze, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,98 @@
+import copy
+import time
+import atexit
+import logging
+import queue
+from datetime import datetime, timezone
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Tuple
+
+import orjson
 
 from app.config import settings
+from app.utils.cache import TTLCache
+
+_RECORD_ATTRS = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with every ``extra={...}`` field at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+
+        return orjson.dumps(data, default=str).decode()
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per ``(logger, message template)`` for WARNING records.
+
+    A flood of identical warnings (failed logins, rate-limited clients) is
+    cut down to ``per_minute`` records after an initial ``burst``; the next
+    record that gets through carries the number of dropped ones in
+    ``suppressed``. Other levels are never dropped.
+
+    A bucket is forgotten once it would have refilled, and at most
+    ``max_keys`` are kept, so messages formatted before logging (a new
+    template per record) cannot grow the filter without bound.
+    """
+
+    def __init__(self, per_minute: float, burst: int, max_keys: int = 10000):
+        super().__init__()
+        self.rate = per_minute / 60
+        self.burst = burst
+        self.refill_seconds = burst / self.rate
+        self.buckets: TTLCache[Tuple[float, float, int]] = TTLCache(max_keys)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.time()
+        tokens, updated_at, suppressed = self.buckets.get(key) or (self.burst, now, 0)
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+        if tokens < 1:
+            self.buckets.set(key, (tokens, now, suppressed + 1), now + self.refill_seconds)
+            return False
+
+        if suppressed:
+            record.suppressed = suppressed
+        self.buckets.set(key, (tokens - 1, now, 0), now + self.refill_seconds)
+        return True
+
+
+class LogQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike QueueHandler.prepare this keeps the message and the
+        # traceback apart, so the formatter on the listener side can still
+        # render them as separate fields.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+LOG_FORMATTER = "json" if settings.MODE == "PROD" else "colored"
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -19,12 +111,15 @@ LOGGING_CONFIG = {
                 "CRITICAL": "purple",
             },
         },
+        "json": {
+            "()": JsonFormatter,
+        },
     },
 
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
-            "formatter": "colored",
+            "formatter": LOG_FORMATTER,
         },
     },
 
@@ -34,5 +129,37 @@ LOGGING_CONFIG = {
     },
 }
 
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener():
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def set_logging():
-    dictConfig(LOGGING_CONFIG)
\ No newline at end of file
+    """Applies ``LOGGING_CONFIG`` and moves the root handlers behind a queue.
+
+    Loggers only enqueue records; a ``QueueListener`` thread formats them and
+    does the actual I/O, so logging never blocks the event loop on stderr.
+    """
+    global _listener
+
+    _stop_listener()
+    dictConfig(LOGGING_CONFIG)
+
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    queue_handler = LogQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(settings.LOG_WARNING_RATE_PER_MINUTE, settings.LOG_WARNING_BURST, settings.LOG_WARNING_MAX_KEYS))
+    root.handlers = [queue_handler]
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
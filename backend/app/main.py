@@ -1,17 +1,24 @@
 import uvicorn
+import asyncio
 import logging
+import secrets
+from contextlib import asynccontextmanager
+from typing import Optional
 
-from fastapi import FastAPI, APIRouter, Request, Depends
-from fastapi.responses import Response
+from fastapi import FastAPI, APIRouter, Request, Depends, Header, HTTPException, Response, status
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.auth.router import router as auth_router
 from app.users.router import router as users_router
 from app.events.router import router as events_router
+from app.events.suggest import EventSuggestService
 from app.config import settings
 from app.log_config import set_logging
+from app.middleware import RequestLoggingMiddleware
 from app.auth.dependencies import get_current_superuser
 
 set_logging()
@@ -24,8 +31,23 @@ api_router.include_router(auth_router)
 api_router.include_router(users_router)
 api_router.include_router(events_router)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await EventSuggestService.rebuild()
+    except Exception:
+        # The refresh loop retries; suggestions stay empty until then.
+        log.exception("Event suggest index build failed")
+    refresh = asyncio.create_task(EventSuggestService.run())
+    yield
+    refresh.cancel()
+
+
 app = FastAPI(
-    title="CityVibe API"
+    title="CityVibe API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -36,22 +58,7 @@ app.add_middleware(
     allow_headers=settings.CORS_HEADERS,
 )
 
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    response: Response = await call_next(request)
-    log.info(
-        "method=%s path=%s status=%s",
-        request.method,
-        request.url.path,
-        response.status_code,
-        extra={
-            "method": request.method,
-            "path": request.url.path,
-            "status": response.status_code
-        }
-    )
-    return response
+app.add_middleware(RequestLoggingMiddleware, sample_rate_2xx=settings.LOG_SAMPLE_RATE_2XX)
 
 
 @app.post("/push/send")
@@ -62,6 +69,18 @@ async def send_push(message: str, header: str, current_user = Depends(get_curren
 app.include_router(api_router)
 app.mount('/static', StaticFiles(directory='app/templates/static'), name='static')
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)) -> Response:
+    """Prometheus scrape endpoint; hidden unless ``METRICS_TOKEN`` is set and
+    then only served to ``Authorization: Bearer <METRICS_TOKEN>``."""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not secrets.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        log.warning("Metrics request rejected")
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/verify")
 async def verify_page(request: Request):
     log.debug("Verify email page accessed")
@@ -74,7 +93,9 @@ if __name__ == "__main__":
             port=settings.PORT,
             reload=False,
             workers=settings.WORKERS,
-            access_log=False
+            access_log=False,
+            # The client IP for login limits comes from auth.rate_limit.client_ip.
+            proxy_headers=False
         )
     else:
         UVICORN_PARAMS = dict(
@@ -82,7 +103,9 @@ if __name__ == "__main__":
             port=settings.PORT,
             reload=False,
             workers=settings.WORKERS,
-            access_log=False
+            access_log=False,
+            # The client IP for login limits comes from auth.rate_limit.client_ip.
+            proxy_headers=False
         )
     log.info("App is starting", extra={
         "host": settings.HOST,
@@ -0,0 +1,65 @@
+import time
+import random
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+log = logging.getLogger(__name__)
+
+
+class RequestLoggingMiddleware:
+    """Logs method, route template, status, duration and response size.
+
+    Plain ASGI so the response is streamed through untouched, unlike
+    ``@app.middleware("http")`` which runs every request through
+    ``BaseHTTPMiddleware``. Successful responses are logged for a
+    ``sample_rate_2xx`` fraction of requests; everything else always is.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate_2xx: float = 1.0):
+        self.app = app
+        self.sample_rate_2xx = sample_rate_2xx
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not log.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._log(scope, response["status"], response["size"], time.perf_counter() - started)
+
+    def _log(self, scope: Scope, status_code: int, size: int, duration: float) -> None:
+        if 200 <= status_code < 300 and random.random() >= self.sample_rate_2xx:
+            return
+
+        # FastAPI stores the matched route in the scope; fall back to the raw
+        # path for mounts and 404s.
+        route = getattr(scope.get("route"), "path", scope["path"])
+        duration_ms = round(duration * 1000, 2)
+        log.info(
+            "method=%s route=%s status=%s duration_ms=%s size=%s",
+            scope["method"],
+            route,
+            status_code,
+            duration_ms,
+            size,
+            extra={
+                "method": scope["method"],
+                "route": route,
+                "status": status_code,
+                "duration_ms": duration_ms,
+                "size": size
+            }
+        )
@@ -0,0 +1,55 @@
+"""edit: add events during range with gist index
+
+Revision ID: 3f6b8d2e0c57
+Revises: 7e2d5c9b1a86
+Create Date: 2026-10-19 19:40:08.512364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6b8d2e0c57'
+down_revision: Union[str, Sequence[str], None] = '7e2d5c9b1a86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nothing checked the order before; such rows need a human to decide
+    # which of the two timestamps is wrong.
+    backwards = op.get_bind().execute(sa.text(
+        "SELECT id, start, \"end\" FROM events WHERE \"end\" < start ORDER BY start LIMIT 20"
+    )).all()
+    if backwards:
+        raise RuntimeError(
+            "Events ending before they start block events_start_before_end_check:\n"
+            + "\n".join(f"{row.id}: start={row.start} end={row.end}" for row in backwards)
+        )
+    op.create_check_constraint(op.f('events_start_before_end_check'), 'events', 'start <= "end"')
+    # greatest() keeps the expression from raising, so a bad write hits the
+    # check constraint (a 422) rather than a range error.
+    op.add_column(
+        'events',
+        sa.Column('during', postgresql.TSTZRANGE(), sa.Computed("tstzrange(start, greatest(start, \"end\"), '[)')"), nullable=False)
+    )
+    op.create_index(
+        'events_active_during_location_idx',
+        'events',
+        ['during', sa.text('point(longitude, latitude)')],
+        unique=False,
+        postgresql_using='gist',
+        postgresql_where=sa.text('is_active')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('events_active_during_location_idx', table_name='events')
+    op.drop_column('events', 'during')
+    op.drop_constraint(op.f('events_start_before_end_check'), 'events', type_='check')
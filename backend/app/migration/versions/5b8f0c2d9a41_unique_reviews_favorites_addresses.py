@@ -0,0 +1,67 @@
+"""add: unique keys for reviews, favorites and event addresses
+
+Revision ID: 5b8f0c2d9a41
+Revises: efdc3148340b
+Create Date: 2026-10-19 14:20:41.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8f0c2d9a41'
+down_revision: Union[str, Sequence[str], None] = 'efdc3148340b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, columns that must be unique together)
+UNIQUE_KEYS = [
+    ('events_reviews', ['user_id', 'event_id']),
+    ('user_event_favorite', ['user_id', 'event_id']),
+    ('events', ['address']),
+]
+
+REPORT_LIMIT = 20
+
+
+def find_duplicates(table: str, columns: Sequence[str]) -> list:
+    key = ", ".join(columns)
+    return op.get_bind().execute(sa.text(
+        f"SELECT {key}, count(*) AS rows, array_agg(id ORDER BY created_at, id) AS ids "
+        f"FROM {table} GROUP BY {key} HAVING count(*) > 1 "
+        f"ORDER BY count(*) DESC LIMIT {REPORT_LIMIT}"
+    )).all()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The application only checked for duplicates before inserting, so
+    # concurrent requests may have slipped some through. Which of two
+    # reviews or events to keep is not ours to decide here, so the upgrade
+    # stops and lists them; resolve them by hand and run it again.
+    report = []
+    for table, columns in UNIQUE_KEYS:
+        for row in find_duplicates(table, columns):
+            report.append(f"{table} ({', '.join(columns)}): {row}")
+    if report:
+        raise RuntimeError(
+            f"Duplicate rows block the unique keys (first {REPORT_LIMIT} per table, ids oldest first):\n"
+            + "\n".join(report)
+        )
+
+    op.create_unique_constraint(op.f('events_reviews_user_id_key'), 'events_reviews', ['user_id', 'event_id'])
+    op.create_unique_constraint(op.f('user_event_favorite_user_id_key'), 'user_event_favorite', ['user_id', 'event_id'])
+    op.drop_index(op.f('events_address_idx'), table_name='events')
+    op.create_index(op.f('events_address_idx'), 'events', ['address'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('events_address_idx'), table_name='events')
+    op.create_index(op.f('events_address_idx'), 'events', ['address'], unique=False)
+    op.drop_constraint(op.f('user_event_favorite_user_id_key'), 'user_event_favorite', type_='unique')
+    op.drop_constraint(op.f('events_reviews_user_id_key'), 'events_reviews', type_='unique')
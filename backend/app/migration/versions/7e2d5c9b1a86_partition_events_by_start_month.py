@@ -0,0 +1,193 @@
+"""edit: partition events by start month
+
+Revision ID: 7e2d5c9b1a86
+Revises: d41a6b8e2f73
+Create Date: 2026-10-19 18:12:53.420917
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2d5c9b1a86'
+down_revision: Union[str, Sequence[str], None] = 'd41a6b8e2f73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_MONTHS = 3
+
+CHILD_TABLES = ['events_reviews', 'events_photo', 'user_event_favorite']
+
+INDEXES = [
+    "CREATE INDEX events_active_start_idx ON events (start) WHERE is_active",
+    "CREATE INDEX events_active_environment_start_idx ON events (environment, start) WHERE is_active",
+    "CREATE INDEX events_active_average_rating_idx ON events (average_rating) WHERE is_active",
+    "CREATE INDEX events_active_name_trgm_idx ON events USING gin (name gin_trgm_ops) WHERE is_active",
+    "CREATE INDEX events_active_end_idx ON events (\"end\") WHERE is_active",
+    "CREATE INDEX events_inactive_end_idx ON events (\"end\") WHERE NOT is_active",
+    "CREATE INDEX events_user_id_idx ON events (user_id)",
+]
+INDEX_NAMES = [statement.split()[2] for statement in INDEXES]
+
+# A partitioned table can only have unique keys that include the partition
+# key, so nothing can reference events(id) with a foreign key any more.
+# These triggers keep the ON DELETE CASCADE and the insert-time check.
+TRIGGERS = """
+CREATE FUNCTION events_delete_children() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    -- An UPDATE that changes start to another month moves the row between
+    -- partitions and fires AFTER DELETE; the event still exists then.
+    IF EXISTS (SELECT 1 FROM events WHERE id = OLD.id) THEN
+        RETURN OLD;
+    END IF;
+    DELETE FROM events_reviews WHERE event_id = OLD.id;
+    DELETE FROM events_photo WHERE event_id = OLD.id;
+    DELETE FROM user_event_favorite WHERE event_id = OLD.id;
+    RETURN OLD;
+END $$;
+
+CREATE TRIGGER events_delete_children AFTER DELETE ON events
+    FOR EACH ROW EXECUTE FUNCTION events_delete_children();
+
+-- Unique indexes on events must include start, so address uniqueness is
+-- kept in event_addresses. A row moved to another partition fires DELETE
+-- and then INSERT; the DELETE leaves the key row to the new version.
+CREATE FUNCTION events_sync_address() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        IF NOT EXISTS (SELECT 1 FROM events WHERE id = OLD.id) THEN
+            DELETE FROM event_addresses WHERE event_id = OLD.id;
+        END IF;
+        RETURN OLD;
+    END IF;
+    -- Another event holding NEW.address fails this with unique_violation.
+    INSERT INTO event_addresses (address, event_id, start) VALUES (NEW.address, NEW.id, NEW.start)
+    ON CONFLICT (event_id) DO UPDATE SET address = EXCLUDED.address, start = EXCLUDED.start, updated_at = now()
+    WHERE (event_addresses.address, event_addresses.start) IS DISTINCT FROM (EXCLUDED.address, EXCLUDED.start);
+    RETURN NEW;
+END $$;
+
+CREATE TRIGGER events_sync_address AFTER INSERT OR DELETE OR UPDATE OF address, start ON events
+    FOR EACH ROW EXECUTE FUNCTION events_sync_address();
+
+CREATE FUNCTION events_check_reference() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    -- start from event_addresses prunes the lookup to one partition.
+    PERFORM 1 FROM events
+    WHERE id = NEW.event_id AND start = (SELECT start FROM event_addresses WHERE event_id = NEW.event_id)
+    FOR KEY SHARE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'event % does not exist', NEW.event_id USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN NEW;
+END $$;
+"""
+
+
+def month_start(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in CHILD_TABLES:
+        op.drop_constraint(op.f(f'{table}_event_id_fkey'), table, type_='foreignkey')
+
+    # Free the index and constraint names for the partitioned table.
+    op.rename_table('events', 'events_unpartitioned')
+    op.drop_constraint(op.f('events_pkey'), 'events_unpartitioned', type_='primary')
+    op.drop_index(op.f('events_address_idx'), table_name='events_unpartitioned')
+    for name in INDEX_NAMES:
+        op.drop_index(name, table_name='events_unpartitioned')
+
+    op.execute("CREATE TABLE events (LIKE events_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (start)")
+    op.create_primary_key(op.f('events_pkey'), 'events', ['id', 'start'])
+    op.create_foreign_key(op.f('events_user_id_fkey'), 'events', 'user', ['user_id'], ['id'], ondelete='CASCADE')
+
+    now = datetime.now(timezone.utc)
+    first = op.get_bind().execute(sa.text("SELECT min(start) FROM events_unpartitioned")).scalar()
+    month = month_start(min(first or now, now))
+    last = add_months(month_start(now), PREMAKE_MONTHS)
+    while month <= last:
+        upper = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE events_p{month:%Y_%m} PARTITION OF events "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+    op.execute("INSERT INTO events SELECT * FROM events_unpartitioned")
+    op.drop_table('events_unpartitioned')
+
+    op.create_table(
+        'event_addresses',
+        sa.Column('address', sa.String(), nullable=False),
+        sa.Column('event_id', sa.Uuid(), nullable=False),
+        sa.Column('start', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('address', name=op.f('event_addresses_pkey')),
+        sa.UniqueConstraint('event_id', name=op.f('event_addresses_event_id_key'))
+    )
+    op.execute("INSERT INTO event_addresses (address, event_id, start) SELECT address, id, start FROM events")
+
+    op.create_index(op.f('events_address_idx'), 'events', ['address', 'start'], unique=True)
+    for statement in INDEXES:
+        op.execute(statement)
+
+    op.execute(TRIGGERS)
+    for table in CHILD_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_check_event BEFORE INSERT OR UPDATE OF event_id ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION events_check_reference()"
+        )
+    op.execute("ANALYZE events")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in CHILD_TABLES:
+        op.execute(f"DROP TRIGGER {table}_check_event ON {table}")
+    op.execute("DROP TRIGGER events_delete_children ON events")
+    op.execute("DROP TRIGGER events_sync_address ON events")
+    op.execute("DROP FUNCTION events_check_reference()")
+    op.execute("DROP FUNCTION events_delete_children()")
+    op.execute("DROP FUNCTION events_sync_address()")
+    op.drop_table('event_addresses')
+
+    op.execute("CREATE TABLE events_unpartitioned (LIKE events INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO events_unpartitioned SELECT * FROM events")
+    # Dropping the parent drops every attached partition with it.
+    op.drop_table('events')
+    op.rename_table('events_unpartitioned', 'events')
+
+    # event_addresses kept addresses unique, so this only trips on rows
+    # written around it; they are reported rather than deleted.
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT address, array_agg(id ORDER BY created_at, id) FROM events "
+        "GROUP BY address HAVING count(*) > 1 LIMIT 20"
+    )).all()
+    if duplicates:
+        raise RuntimeError(
+            "Events sharing an address block the unique address index:\n"
+            + "\n".join(f"{address}: {ids}" for address, ids in duplicates)
+        )
+    op.create_primary_key(op.f('events_pkey'), 'events', ['id'])
+    op.create_foreign_key(op.f('events_user_id_fkey'), 'events', 'user', ['user_id'], ['id'], ondelete='CASCADE')
+    op.create_index(op.f('events_address_idx'), 'events', ['address'], unique=True)
+    for statement in INDEXES:
+        op.execute(statement)
+
+    for table in CHILD_TABLES:
+        op.execute(f"DELETE FROM {table} WHERE NOT EXISTS (SELECT 1 FROM events WHERE events.id = {table}.event_id)")
+        op.create_foreign_key(op.f(f'{table}_event_id_fkey'), table, 'events', ['event_id'], ['id'], ondelete='CASCADE')
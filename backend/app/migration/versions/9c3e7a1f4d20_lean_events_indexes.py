@@ -0,0 +1,80 @@
+"""edit: replace per-column events indexes with partial search indexes
+
+Revision ID: 9c3e7a1f4d20
+Revises: 5b8f0c2d9a41
+Create Date: 2026-10-19 15:02:09.774213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e7a1f4d20'
+down_revision: Union[str, Sequence[str], None] = '5b8f0c2d9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Single-column indexes no search shape uses on its own; events_id_idx
+# duplicates the primary key.
+DROPPED = {
+    'events_id_idx': ['id'],
+    'events_name_idx': ['name'],
+    'events_latitude_idx': ['latitude'],
+    'events_longitude_idx': ['longitude'],
+    'events_capacity_idx': ['capacity'],
+    'events_environment_idx': ['environment'],
+    'events_start_idx': ['start'],
+    'events_end_idx': ['end'],
+    'events_age_rating_idx': ['age_rating'],
+    'events_average_rating_idx': ['average_rating'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_index('events_active_start_idx', 'events', ['start'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index(
+        'events_active_environment_start_idx',
+        'events',
+        ['environment', 'start'],
+        unique=False,
+        postgresql_where=sa.text('is_active')
+    )
+    op.create_index(
+        'events_active_average_rating_idx',
+        'events',
+        ['average_rating'],
+        unique=False,
+        postgresql_where=sa.text('is_active')
+    )
+    op.create_index(
+        'events_active_name_trgm_idx',
+        'events',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+        postgresql_where=sa.text('is_active')
+    )
+    # Backs the ON DELETE CASCADE from "user" and organiser ownership checks.
+    op.create_index(op.f('events_user_id_idx'), 'events', ['user_id'], unique=False)
+
+    for name in DROPPED:
+        op.drop_index(op.f(name), table_name='events')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, columns in DROPPED.items():
+        op.create_index(op.f(name), 'events', columns, unique=False)
+
+    op.drop_index(op.f('events_user_id_idx'), table_name='events')
+    op.drop_index('events_active_name_trgm_idx', table_name='events')
+    op.drop_index('events_active_average_rating_idx', table_name='events')
+    op.drop_index('events_active_environment_start_idx', table_name='events')
+    op.drop_index('events_active_start_idx', table_name='events')
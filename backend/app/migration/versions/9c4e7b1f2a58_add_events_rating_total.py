@@ -0,0 +1,40 @@
+"""edit: add events rating_total
+
+Revision ID: 9c4e7b1f2a58
+Revises: f4a2c8e6d913
+Create Date: 2026-10-19 23:41:07.215384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e7b1f2a58'
+down_revision: Union[str, Sequence[str], None] = 'f4a2c8e6d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def backfill(table: str, reviews: str) -> None:
+    op.execute(
+        f"UPDATE {table} SET rating_total = r.total "
+        f"FROM (SELECT event_id, sum(rating) AS total FROM {reviews} GROUP BY event_id) r "
+        f"WHERE {table}.id = r.event_id"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('events', 'events_archive'):
+        op.add_column(table, sa.Column('rating_total', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    backfill('events', 'events_reviews')
+    backfill('events_archive', 'events_reviews_archive')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('events', 'events_archive'):
+        op.drop_column(table, 'rating_total')
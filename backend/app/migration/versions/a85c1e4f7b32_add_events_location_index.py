@@ -0,0 +1,35 @@
+"""edit: add events location gist index
+
+Revision ID: a85c1e4f7b32
+Revises: 3f6b8d2e0c57
+Create Date: 2026-10-19 20:31:44.107295
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a85c1e4f7b32'
+down_revision: Union[str, Sequence[str], None] = '3f6b8d2e0c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'events_active_location_idx',
+        'events',
+        [sa.text('point(longitude, latitude)')],
+        unique=False,
+        postgresql_using='gist',
+        postgresql_where=sa.text('is_active')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('events_active_location_idx', table_name='events')
@@ -0,0 +1,28 @@
+"""edit: add events updated_at index
+
+Revision ID: b81d5e3c7f29
+Revises: 9c4e7b1f2a58
+Create Date: 2026-10-20 10:12:44.601928
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d5e3c7f29'
+down_revision: Union[str, Sequence[str], None] = '9c4e7b1f2a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('events_updated_at_idx'), 'events', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('events_updated_at_idx'), table_name='events')
@@ -0,0 +1,62 @@
+"""edit: add events count_favorites and sort indexes
+
+Revision ID: c27e9f3a5d18
+Revises: a85c1e4f7b32
+Create Date: 2026-10-19 21:14:27.660193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27e9f3a5d18'
+down_revision: Union[str, Sequence[str], None] = 'a85c1e4f7b32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('count_favorites', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('events_archive', sa.Column('count_favorites', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.execute(
+        "UPDATE events SET count_favorites = f.count "
+        "FROM (SELECT event_id, count(*) AS count FROM user_event_favorite GROUP BY event_id) f "
+        "WHERE events.id = f.event_id"
+    )
+    op.execute(
+        "UPDATE events_archive SET count_favorites = f.count "
+        "FROM (SELECT event_id, count(*) AS count FROM user_event_favorite_archive GROUP BY event_id) f "
+        "WHERE events_archive.id = f.event_id"
+    )
+
+    op.drop_index('events_active_start_idx', table_name='events')
+    op.drop_index('events_active_average_rating_idx', table_name='events')
+    op.create_index('events_active_start_id_idx', 'events', ['start', 'id'], postgresql_where=sa.text('is_active'))
+    op.create_index(
+        'events_active_rating_idx', 'events', [sa.text('average_rating DESC NULLS LAST'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_active')
+    )
+    op.create_index(
+        'events_active_reviews_idx', 'events', [sa.text('count_reviews DESC'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_active')
+    )
+    op.create_index(
+        'events_active_favorites_idx', 'events', [sa.text('count_favorites DESC'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_active')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('events_active_favorites_idx', table_name='events')
+    op.drop_index('events_active_reviews_idx', table_name='events')
+    op.drop_index('events_active_rating_idx', table_name='events')
+    op.drop_index('events_active_start_id_idx', table_name='events')
+    op.create_index('events_active_average_rating_idx', 'events', ['average_rating'], postgresql_where=sa.text('is_active'))
+    op.create_index('events_active_start_idx', 'events', ['start'], postgresql_where=sa.text('is_active'))
+    op.drop_column('events_archive', 'count_favorites')
+    op.drop_column('events', 'count_favorites')
@@ -0,0 +1,112 @@
+"""add: event archive tables
+
+Revision ID: d41a6b8e2f73
+Revises: 9c3e7a1f4d20
+Create Date: 2026-10-19 16:41:27.092551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a6b8e2f73'
+down_revision: Union[str, Sequence[str], None] = '9c3e7a1f4d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('events_archive',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=False),
+    sa.Column('environment', postgresql.ENUM('indoor', 'outdoor', 'semi_door', name='eventenvironment', create_type=False), nullable=False),
+    sa.Column('start', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('end', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('age_rating', sa.Integer(), nullable=False),
+    sa.Column('average_rating', sa.Float(), nullable=True),
+    sa.Column('count_reviews', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('events_archive_user_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('events_archive_pkey'))
+    )
+    op.create_index(op.f('events_archive_user_id_idx'), 'events_archive', ['user_id'], unique=False)
+
+    op.create_table('events_reviews_archive',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('content', sa.String(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('event_id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events_archive.id'], name=op.f('events_reviews_archive_event_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('events_reviews_archive_user_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('events_reviews_archive_pkey'))
+    )
+    op.create_index(op.f('events_reviews_archive_event_id_idx'), 'events_reviews_archive', ['event_id'], unique=False)
+    op.create_index(op.f('events_reviews_archive_user_id_idx'), 'events_reviews_archive', ['user_id'], unique=False)
+
+    op.create_table('events_photo_archive',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('object_name', sa.String(), nullable=False),
+    sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('event_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events_archive.id'], name=op.f('events_photo_archive_event_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('events_photo_archive_pkey'))
+    )
+    op.create_index(op.f('events_photo_archive_event_id_idx'), 'events_photo_archive', ['event_id'], unique=False)
+    op.create_index(op.f('events_photo_archive_object_name_idx'), 'events_photo_archive', ['object_name'], unique=True)
+
+    op.create_table('user_event_favorite_archive',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('event_id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events_archive.id'], name=op.f('user_event_favorite_archive_event_id_fkey'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('user_event_favorite_archive_user_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('user_event_favorite_archive_pkey'))
+    )
+    op.create_index(op.f('user_event_favorite_archive_event_id_idx'), 'user_event_favorite_archive', ['event_id'], unique=False)
+    op.create_index(op.f('user_event_favorite_archive_user_id_idx'), 'user_event_favorite_archive', ['user_id'], unique=False)
+
+    # Deactivation looks for live events that have ended, archiving for
+    # inactive ones past the retention window; search filters on end too.
+    op.create_index('events_active_end_idx', 'events', ['end'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('events_inactive_end_idx', 'events', ['end'], unique=False, postgresql_where=sa.text('NOT is_active'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('events_inactive_end_idx', table_name='events')
+    op.drop_index('events_active_end_idx', table_name='events')
+    op.drop_index(op.f('user_event_favorite_archive_user_id_idx'), table_name='user_event_favorite_archive')
+    op.drop_index(op.f('user_event_favorite_archive_event_id_idx'), table_name='user_event_favorite_archive')
+    op.drop_table('user_event_favorite_archive')
+    op.drop_index(op.f('events_photo_archive_object_name_idx'), table_name='events_photo_archive')
+    op.drop_index(op.f('events_photo_archive_event_id_idx'), table_name='events_photo_archive')
+    op.drop_table('events_photo_archive')
+    op.drop_index(op.f('events_reviews_archive_user_id_idx'), table_name='events_reviews_archive')
+    op.drop_index(op.f('events_reviews_archive_event_id_idx'), table_name='events_reviews_archive')
+    op.drop_table('events_reviews_archive')
+    op.drop_index(op.f('events_archive_user_id_idx'), table_name='events_archive')
+    op.drop_table('events_archive')
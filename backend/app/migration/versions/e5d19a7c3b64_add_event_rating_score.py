@@ -0,0 +1,62 @@
+"""edit: add events rating_score and event_rating_prior
+
+Revision ID: e5d19a7c3b64
+Revises: c27e9f3a5d18
+Create Date: 2026-10-19 22:05:51.338720
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d19a7c3b64'
+down_revision: Union[str, Sequence[str], None] = 'c27e9f3a5d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIOR_MEAN = 3.5
+PRIOR_WEIGHT = 10
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_rating_prior',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('mean', sa.Float(), nullable=False),
+    sa.Column('weight', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('event_rating_prior_pkey'))
+    )
+    op.execute(
+        "INSERT INTO event_rating_prior (id, mean, weight) "
+        f"SELECT 1, coalesce(avg(rating), {PRIOR_MEAN}), {PRIOR_WEIGHT} FROM events_reviews"
+    )
+
+    op.add_column('events', sa.Column('rating_score', sa.Float(), nullable=True))
+    op.add_column('events_archive', sa.Column('rating_score', sa.Float(), nullable=True))
+    op.execute(
+        "UPDATE events SET rating_score = (p.weight * p.mean + average_rating * count_reviews) / (p.weight + count_reviews) "
+        "FROM event_rating_prior p WHERE p.id = 1 AND count_reviews > 0"
+    )
+
+    op.drop_index('events_active_rating_idx', table_name='events')
+    op.create_index(
+        'events_active_score_idx', 'events', [sa.text('rating_score DESC NULLS LAST'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_active')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('events_active_score_idx', table_name='events')
+    op.create_index(
+        'events_active_rating_idx', 'events', [sa.text('average_rating DESC NULLS LAST'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_active')
+    )
+    op.drop_column('events_archive', 'rating_score')
+    op.drop_column('events', 'rating_score')
+    op.drop_table('event_rating_prior')
@@ -0,0 +1,43 @@
+"""add: refresh session expires_at
+
+Revision ID: efdc3148340b
+Revises: 23df4a2134dc
+Create Date: 2026-10-19 09:00:15.805208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'efdc3148340b'
+down_revision: Union[str, Sequence[str], None] = '23df4a2134dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expired sessions are dead weight; drop them before the backfill so the
+    # UPDATE below only touches live rows.
+    op.execute(
+        "DELETE FROM refresh_session "
+        "WHERE created_at + expires_in * interval '1 second' <= now()"
+    )
+    op.add_column('refresh_session', sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE refresh_session "
+        "SET expires_at = created_at + expires_in * interval '1 second'"
+    )
+    op.alter_column('refresh_session', 'expires_at', nullable=False)
+    op.create_index(op.f('refresh_session_expires_at_idx'), 'refresh_session', ['expires_at'], unique=False)
+    op.create_index(op.f('refresh_session_user_id_idx'), 'refresh_session', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('refresh_session_user_id_idx'), table_name='refresh_session')
+    op.drop_index(op.f('refresh_session_expires_at_idx'), table_name='refresh_session')
+    op.drop_column('refresh_session', 'expires_at')
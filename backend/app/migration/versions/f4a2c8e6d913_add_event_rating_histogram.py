@@ -0,0 +1,46 @@
+"""edit: add events rating histogram columns
+
+Revision ID: f4a2c8e6d913
+Revises: e5d19a7c3b64
+Create Date: 2026-10-19 22:48:16.904151
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a2c8e6d913'
+down_revision: Union[str, Sequence[str], None] = 'e5d19a7c3b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [f'rating_{stars}' for stars in range(1, 6)]
+
+
+def backfill(table: str, reviews: str) -> None:
+    counts = ", ".join(f"count(*) FILTER (WHERE rating = {stars}) AS rating_{stars}" for stars in range(1, 6))
+    assignments = ", ".join(f"{column} = r.{column}" for column in COLUMNS)
+    op.execute(
+        f"UPDATE {table} SET {assignments} "
+        f"FROM (SELECT event_id, {counts} FROM {reviews} GROUP BY event_id) r "
+        f"WHERE {table}.id = r.event_id"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('events', 'events_archive'):
+        for column in COLUMNS:
+            op.add_column(table, sa.Column(column, sa.Integer(), server_default=sa.text('0'), nullable=False))
+    backfill('events', 'events_reviews')
+    backfill('events_archive', 'events_reviews_archive')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('events', 'events_archive'):
+        for column in reversed(COLUMNS):
+            op.drop_column(table, column)
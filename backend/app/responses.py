@@ -0,0 +1,128 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, get_args
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter, create_model
+
+
+class RowWithExtras:
+    """A row plus attributes that were loaded separately, e.g. by a grouped
+    query for the whole page. Works for ORM instances and ``Row`` objects."""
+
+    __slots__ = ("row", "extras")
+
+    def __init__(self, row: Any, **extras: Any):
+        self.row = row
+        self.extras = extras
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self.extras:
+            return self.extras[name]
+        return getattr(self.row, name)
+
+
+class ORMRenderer:
+    """Renders ORM rows as JSON for a response schema.
+
+    ``dump_rows`` reads the schema's fields straight off the rows and hands
+    them to orjson, skipping the per-object Pydantic validation and
+    ``jsonable_encoder`` pass FastAPI runs for ``response_model``. It is
+    meant for rows coming from our own tables, which already satisfy the
+    schema. ``dump_validated`` goes through a prebuilt ``TypeAdapter`` for
+    content that does need validating.
+
+    With a ``model`` the renderer also backs sparse fieldsets: ``columns``
+    turns a ``fields=a,b`` query value into the table columns to select and
+    ``only`` returns a renderer for the matching trimmed schema.
+
+    Fields typed as another schema are rendered from the row's attribute of
+    the same name, e.g. an eagerly loaded relationship.
+
+    Every field must be an attribute of the row, so schema and column drift
+    fails loudly. The exceptions are the schema's ``row_extras``, fields
+    attached by ``RowWithExtras`` only when requested, which render null
+    when the row lacks them.
+    """
+
+    def __init__(self, schema: Type[BaseModel], model: Optional[type] = None, extras: Optional[Tuple[str, ...]] = None):
+        self.schema = schema
+        self.fields: Tuple[str, ...] = tuple(schema.model_fields)
+        if extras is None:
+            extras = getattr(schema, "row_extras", ())
+        self.extras: Tuple[str, ...] = tuple(field for field in self.fields if field in extras)
+        self.adapter = TypeAdapter(List[schema])
+        self.selectable: Tuple[str, ...] = tuple(
+            field for field in self.fields
+            if model is not None and field in model.__table__.columns
+        )
+        self._trimmed: Dict[Tuple[str, ...], "ORMRenderer"] = {}
+        self.nested: Dict[str, "ORMRenderer"] = {}
+        for field, info in schema.model_fields.items():
+            for candidate in (info.annotation, *get_args(info.annotation)):
+                if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+                    self.nested[field] = ORMRenderer(candidate)
+
+    def columns(self, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """Returns the requested columns in schema order, always with ``id``,
+        or None when every field is wanted."""
+        if not fields:
+            return None
+
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested.difference(self.selectable)
+        if unknown:
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+
+        requested.add("id")
+        return tuple(field for field in self.selectable if field in requested)
+
+    def only(self, columns: Optional[Tuple[str, ...]]) -> "ORMRenderer":
+        if not columns:
+            return self
+
+        renderer = self._trimmed.get(columns)
+        if renderer is None:
+            trimmed = create_model(
+                f"{self.schema.__name__}Fields",
+                __config__=self.schema.model_config,
+                **{
+                    field: (self.schema.model_fields[field].annotation, self.schema.model_fields[field])
+                    for field in columns
+                }
+            )
+            renderer = self._trimmed[columns] = ORMRenderer(trimmed, extras=self.extras)
+        return renderer
+
+    def to_dict(self, row: Any) -> dict:
+        data = {
+            field: getattr(row, field, None) if field in self.extras else getattr(row, field)
+            for field in self.fields
+        }
+        for field, renderer in self.nested.items():
+            if data[field] is not None:
+                data[field] = renderer.to_dict(data[field])
+        return data
+
+    def dump_rows(self, rows: Iterable[Any]) -> bytes:
+        return orjson.dumps([self.to_dict(row) for row in rows], option=orjson.OPT_UTC_Z)
+
+    def dump_row(self, row: Any) -> bytes:
+        return orjson.dumps(self.to_dict(row), option=orjson.OPT_UTC_Z)
+
+    def dump_validated(self, rows: Iterable[Any]) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(rows, from_attributes=True))
+
+    def response(self, rows: Iterable[Any]) -> Response:
+        return Response(self.dump_rows(rows), media_type="application/json")
+
+    def response_one(self, row: Any) -> Response:
+        return Response(self.dump_row(row), media_type="application/json")
+
+    def response_page(self, rows: Iterable[Any], **extra: Any) -> Response:
+        """``{"items": [...], **extra}``, for results that come with metadata."""
+        content = orjson.dumps({"items": [self.to_dict(row) for row in rows], **extra}, option=orjson.OPT_UTC_Z)
+        return Response(content, media_type="application/json")
@@ -1,7 +1,9 @@
 from typing import List, Optional
 import uuid
+import asyncio
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 
 from app.database import async_session_maker
 from app.events.schemas import EventPhotoCreateDB
@@ -48,7 +50,7 @@ class EventPhotoService:
                 async with cls._get_s3_client() as s3_client:
                     for photo in photos:
 
-                        photo_name = f"{uuid.uuid4()}.png"
+                        photo_name = f"{settings.S3_PHOTO_PREFIX}{uuid.uuid4()}.png"
 
                         url = await s3_client.upload_file(
                             file=photo,
@@ -88,4 +90,64 @@ class EventPhotoService:
             log.info("Photos deleted from S3 successfully", extra={"count": len(photo_names)})
         except Exception as e:
             log.error(f"Error deleting photos from S3: {str(e)}", extra={"count": len(photo_names)})
-            raise
\ No newline at end of file
+            raise
+
+
+    @classmethod
+    async def collect_orphans(cls, dry_run: bool = True, session_maker=None) -> dict:
+        """Removes bucket objects that no ``events_photo`` row points to.
+
+        The bucket is walked page by page and every page is diffed against the
+        database with a single ``IN`` query, so memory stays bounded by the page
+        size no matter how large the bucket is. Objects younger than
+        ``S3_GC_MIN_AGE_HOURS`` are skipped: an upload task writes the rows only
+        after all of its files are in the bucket. Only ``S3_PHOTO_PREFIX`` is
+        listed, so objects other code keeps in the bucket are never touched.
+        """
+        if not settings.S3_PHOTO_PREFIX:
+            raise ValueError("S3_PHOTO_PREFIX is empty; refusing to collect orphans across the whole bucket")
+        if session_maker is None:
+            session_maker = async_session_maker
+
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.S3_GC_MIN_AGE_HOURS)
+        report = {
+            "dry_run": dry_run,
+            "scanned": 0,
+            "skipped_recent": 0,
+            "orphaned": 0,
+            "deleted": 0,
+            "sample": [],
+        }
+
+        log.info("Starting orphan photo collection", extra={"dry_run": dry_run, "cutoff": cutoff.isoformat()})
+        async with cls._get_s3_client() as s3_client:
+            async for page in s3_client.iter_objects(
+                    prefix=settings.S3_PHOTO_PREFIX,
+                    page_size=settings.S3_GC_PAGE_SIZE
+            ):
+                report["scanned"] += len(page)
+                candidates = [obj["Key"] for obj in page if obj["LastModified"] < cutoff]
+                report["skipped_recent"] += len(page) - len(candidates)
+
+                if not candidates:
+                    continue
+
+                async with session_maker() as session:
+                    known = await EventPhotoDao.find_existing_object_names(session, candidates)
+
+                orphans = [name for name in candidates if name not in known]
+                if not orphans:
+                    continue
+
+                report["orphaned"] += len(orphans)
+                report["sample"].extend(orphans[:20 - len(report["sample"])])
+
+                if dry_run:
+                    continue
+
+                await s3_client.delete_files(object_names=orphans)
+                report["deleted"] += len(orphans)
+                await asyncio.sleep(settings.S3_GC_DELETE_PAUSE_SECONDS)
+
+        log.info("Orphan photo collection finished", extra={k: v for k, v in report.items() if k != "sample"})
+        return report
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 import uuid
 import asyncio
 import logging
@@ -6,6 +6,7 @@ import logging
 from app.celery_app import celery_app
 from app.services.S3_service import EventPhotoService
 from app.celery_db import get_celery_async_session_maker, reset_celery_db
+from app.config import settings
 
 log = logging.getLogger(__name__)
 
@@ -36,3 +37,18 @@ class EventPhotoTasks:
             raise
 
 
+    @staticmethod
+    @celery_app.task
+    def collect_orphan_photos_task(dry_run: Optional[bool] = None):
+        if dry_run is None:
+            dry_run = settings.S3_GC_DRY_RUN
+
+        log.info("Celery task: Collecting orphan photos in S3", extra={"dry_run": dry_run})
+        try:
+            reset_celery_db()
+            report = asyncio.run(EventPhotoService.collect_orphans(dry_run, get_celery_async_session_maker()))
+            log.info("Celery task completed: Orphan photos collected", extra={"orphaned": report["orphaned"], "deleted": report["deleted"]})
+            return report
+        except Exception as e:
+            log.error(f"Celery task failed: {str(e)}", extra={"dry_run": dry_run})
+            raise
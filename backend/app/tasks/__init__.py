@@ -1,2 +1,4 @@
 from .email_tasks import *
-from .S3_tasks import *
\ No newline at end of file
+from .S3_tasks import *
+from .auth_tasks import *
+from .events_tasks import *
\ No newline at end of file
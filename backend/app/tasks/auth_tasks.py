@@ -0,0 +1,26 @@
+import asyncio
+import logging
+
+from app.celery_app import celery_app
+from app.auth.service import AuthService
+from app.celery_db import get_celery_async_session_maker, reset_celery_db
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+
+@celery_app.task
+def purge_expired_sessions_task():
+    if settings.SESSION_BACKEND != "postgres":
+        # Redis expires its sessions on its own; the memory store is per process.
+        log.info("Celery task skipped: refresh sessions are not stored in Postgres", extra={"backend": settings.SESSION_BACKEND})
+        return 0
+    log.info("Celery task: Purging expired refresh sessions")
+    try:
+        reset_celery_db()
+        count = asyncio.run(AuthService.purge_expired_sessions(get_celery_async_session_maker()))
+        log.info("Celery task completed: Expired refresh sessions purged", extra={"count": count})
+        return count
+    except Exception as e:
+        log.error(f"Celery task failed: {str(e)}")
+        raise
\ No newline at end of file
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+from app.celery_app import celery_app
+from app.events.archive import EventArchiveService
+from app.events.partitions import EventPartitionService
+from app.events.ratings import EventRatingService
+from app.celery_db import get_celery_async_session_maker, reset_celery_db
+
+log = logging.getLogger(__name__)
+
+
+@celery_app.task
+def deactivate_finished_events_task():
+    log.info("Celery task: Deactivating finished events")
+    try:
+        reset_celery_db()
+        count = asyncio.run(EventArchiveService.deactivate_finished_events(get_celery_async_session_maker()))
+        log.info("Celery task completed: Finished events deactivated", extra={"count": count})
+        return count
+    except Exception as e:
+        log.error(f"Celery task failed: {str(e)}")
+        raise
+
+
+@celery_app.task
+def archive_finished_events_task():
+    log.info("Celery task: Archiving finished events")
+    try:
+        reset_celery_db()
+        count = asyncio.run(EventArchiveService.archive_finished_events(get_celery_async_session_maker()))
+        log.info("Celery task completed: Finished events archived", extra={"count": count})
+        return count
+    except Exception as e:
+        log.error(f"Celery task failed: {str(e)}")
+        raise
+
+
+@celery_app.task
+def maintain_event_partitions_task():
+    log.info("Celery task: Maintaining event partitions")
+    try:
+        reset_celery_db()
+        report = asyncio.run(EventPartitionService.maintain(get_celery_async_session_maker()))
+        log.info("Celery task completed: Event partitions maintained", extra=report)
+        return report
+    except Exception as e:
+        log.error(f"Celery task failed: {str(e)}")
+        raise
+
+
+@celery_app.task
+def refresh_rating_prior_task():
+    log.info("Celery task: Refreshing the event rating prior")
+    try:
+        reset_celery_db()
+        count = asyncio.run(EventRatingService.refresh_prior(get_celery_async_session_maker()))
+        log.info("Celery task completed: Event rating prior refreshed", extra={"count": count})
+        return count
+    except Exception as e:
+        log.error(f"Celery task failed: {str(e)}")
+        raise
+
+
+@celery_app.task
+def rebuild_event_ratings_task():
+    log.info("Celery task: Rebuilding event ratings")
+    try:
+        reset_celery_db()
+        count = asyncio.run(EventRatingService.rebuild_ratings(get_celery_async_session_maker()))
+        log.info("Celery task completed: Event ratings rebuilt", extra={"count": count})
+        return count
+    except Exception as e:
+        log.error(f"Celery task failed: {str(e)}")
+        raise
@@ -1,4 +1,11 @@
-from app.base_dao import BaseDAO
+import uuid
+from typing import List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+
+from app.base_dao import BaseDAO, any_of
 
 from app.users.models import UserModel, UserEventFavoritesModel
 from app.users.schemas import UserCreateDB, UserUpdateDB, UserEventFavoritesCreateDB, UserEventFavoritesUpdateDB
@@ -9,4 +16,40 @@ class UserDao(BaseDAO[UserModel, UserCreateDB, UserUpdateDB]):
 
 
 class UserEventFavoritesDao(BaseDAO[UserEventFavoritesModel, UserEventFavoritesCreateDB, UserEventFavoritesUpdateDB]):
-    model = UserEventFavoritesModel
\ No newline at end of file
+    model = UserEventFavoritesModel
+
+    @classmethod
+    async def find_all_with_event(
+            cls,
+            session: AsyncSession,
+            user_id: uuid.UUID,
+            offset: int = 0,
+            limit: Optional[int] = 10
+    ) -> List[UserEventFavoritesModel]:
+        stmt = (
+            select(UserEventFavoritesModel)
+            .join(UserEventFavoritesModel.event)
+            .options(contains_eager(UserEventFavoritesModel.event))
+            .filter(UserEventFavoritesModel.user_id == user_id)
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().all() #type: ignore
+
+    @classmethod
+    async def find_favorite_event_ids(
+            cls,
+            session: AsyncSession,
+            user_id: uuid.UUID,
+            event_ids: List[uuid.UUID]
+    ) -> Set[uuid.UUID]:
+        if not event_ids:
+            return set()
+
+        stmt = select(UserEventFavoritesModel.event_id).filter(
+            UserEventFavoritesModel.user_id == user_id,
+            any_of(UserEventFavoritesModel.event_id, event_ids)
+        )
+        result = await session.execute(stmt)
+        return set(result.scalars().all())
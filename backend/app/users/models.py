@@ -1,15 +1,19 @@
 import uuid
+from datetime import datetime
 
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import false, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import false, ForeignKey, UniqueConstraint, TIMESTAMP
+from sqlalchemy.sql import func
 
 from app.database import Base
+from app.utils.uuid7 import uuid7
+from app.events.models import EventModel
 
 
 class UserModel(Base):
     __tablename__ = "user"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, index=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, index=True, default=uuid7)
     email: Mapped[str] = mapped_column(unique=True, index=True)
     hashed_password: Mapped[str]
     username: Mapped[str]
@@ -21,7 +25,22 @@ class UserModel(Base):
 
 class UserEventFavoritesModel(Base):
     __tablename__ = "user_event_favorite"
+    __table_args__ = (UniqueConstraint("user_id", "event_id"),)
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, index=True, default=uuid.uuid4)
-    event_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), index=True)
-    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
\ No newline at end of file
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, index=True, default=uuid7)
+    event_id: Mapped[uuid.UUID] = mapped_column(index=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
+
+    event: Mapped[EventModel] = relationship(
+        primaryjoin="foreign(UserEventFavoritesModel.event_id) == EventModel.id",
+        lazy="raise"
+    )
+
+
+class UserEventFavoritesArchiveModel(Base):
+    __tablename__ = "user_event_favorite_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    archived_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+    event_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("events_archive.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), index=True)
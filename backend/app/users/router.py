@@ -1,28 +1,38 @@
 import uuid
 import logging
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Query, Response
 
 from app.auth.dependencies import get_current_active_user, get_current_superuser
 from app.auth.service import AuthService
 from app.users.service import UserService, UserEventFavoritesService
-from app.users.schemas import User, UserUpdate, UserEventFavoritesCreate, UserEventFavorites
-from app.users.models import UserModel
+from app.users.schemas import User, UserUpdate, UserEventFavoritesCreate, UserEventFavorites, UserEventFavoritesWithEvent
+from app.users.models import UserModel, UserEventFavoritesModel
+from app.responses import ORMRenderer
 
 log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+user_renderer = ORMRenderer(User, UserModel)
+favorite_renderer = ORMRenderer(UserEventFavorites, UserEventFavoritesModel)
+favorite_event_renderer = ORMRenderer(UserEventFavoritesWithEvent)
+
+FIELDS_QUERY = Query(None, description="Comma-separated list of fields to return, e.g. id,username")
+
+
 @router.get("/")
 async def get_users_list(
         offset: int = 0,
         limit: int = 100,
+        fields: Optional[str] = FIELDS_QUERY,
         current_superuser_user: UserModel = Depends(get_current_superuser)
 ) -> List[User]:
     log.info("Getting users list", extra={"offset": offset, "limit": limit})
-    users_list = await UserService.get_users_list(offset=offset, limit=limit)
-    return users_list
+    columns = user_renderer.columns(fields)
+    users_list = await UserService.get_users_list(offset=offset, limit=limit, columns=columns)
+    return user_renderer.only(columns).response(users_list)
 
 
 @router.get("/me")
@@ -56,10 +66,12 @@ async def delete_current_user(
 @router.get("/{user_id}")
 async def get_user(
         user_id: uuid.UUID,
+        fields: Optional[str] = FIELDS_QUERY,
         current_user: UserModel = Depends(get_current_superuser)
 ) -> User:
     log.info("Superuser accessing user profile", extra={"target_user_id": str(user_id), "superuser_id": str(current_user.id)})
-    return await UserService.get_user(user_id)
+    columns = user_renderer.columns(fields)
+    return user_renderer.only(columns).response_one(await UserService.get_user(user_id, columns))
 
 @router.put("/{user_id}")
 async def update_user(
@@ -76,6 +88,7 @@ async def delete_user(
     current_user: UserModel = Depends(get_current_superuser)
 ):
     log.info("Superuser deleting user", extra={"user_id": str(user_id), "superuser_id": str(current_user.id)})
+    await AuthService.abort_all_sessions(user_id)
     await UserService.delete_user_from_superuser(user_id)
     return {"message": "User was deleted"}
 
@@ -92,9 +105,12 @@ async def add_new_favorite(
 async def get_favorites(
         offset: int,
         limit: int,
+        embed: Optional[Literal["event"]] = None,
         current_user: UserModel = Depends(get_current_active_user),
-) -> List[UserEventFavorites]:
-    return await UserEventFavoritesService.get_favorites(current_user.id, offset, limit)
+) -> List[UserEventFavoritesWithEvent]:
+    favorites = await UserEventFavoritesService.get_favorites(current_user.id, offset, limit, embed_event=embed == "event")
+    renderer = favorite_event_renderer if embed == "event" else favorite_renderer
+    return renderer.response(favorites)
 
 
 @router.delete("/me/favorites{event_id}")
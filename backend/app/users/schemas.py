@@ -3,6 +3,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 
+from app.events.schemas import Event
+
 
 class UserBase(BaseModel):
     email: Optional[str] = Field(None)
@@ -52,6 +54,10 @@ class UserEventFavorites(UserEventFavoritesBase):
     id: Optional[uuid.UUID] = Field(None)
 
 
+class UserEventFavoritesWithEvent(UserEventFavorites):
+    event: Optional[Event] = Field(None)
+
+
 class UserEventFavoritesCreate(BaseModel):
     event_id: uuid.UUID = Field(...)
 
@@ -1,13 +1,16 @@
 import uuid
-from typing import List
+import asyncio
+from typing import List, Optional, Sequence
 import logging
 
 from fastapi import HTTPException, status
 
 from app.auth.utils import get_hashed_password
 from app.users.schemas import UserCreate, UserCreateDB, UserUpdateDB, UserUpdate, User, UserEventFavoritesCreateDB, UserEventFavorites
-from app.users.models import UserModel
+from app.users.models import UserModel, UserEventFavoritesModel
 from app.users.dao import UserDao, UserEventFavoritesDao
+from app.events.dao import EventDao, EventReviewsDao
+from app.events.models import EventReviewsModel
 from app.database import async_session_maker
 
 log = logging.getLogger(__name__)
@@ -17,33 +20,35 @@ class UserService:
     @classmethod
     async def register_new_user(cls, new_user: UserCreate) -> User:
         async with async_session_maker() as session:
-            user_exist = await UserDao.find_one_or_none(session, email=new_user.email)
-
-            if user_exist:
-                raise HTTPException(status.HTTP_409_CONFLICT, "User already exists")
-
-            db_user = await UserDao.add(
+            db_user = await UserDao.add_if_absent(
                 session,
                 UserCreateDB(
                     **new_user.model_dump(),
-                    hashed_password=get_hashed_password(new_user.password),
+                    hashed_password=await asyncio.to_thread(get_hashed_password, new_user.password),
                     is_superuser= False,
                     is_verified = False
-                )
+                ),
+                conflict_columns=["email"]
             )
+
+            if db_user is None:
+                raise HTTPException(status.HTTP_409_CONFLICT, "User already exists")
+
             await session.commit()
             log.info("The user has registered", extra={"user_id": db_user.id, "email": db_user.email})
             return db_user
 
 
     @classmethod
-    async def get_user(cls, user_id: uuid.UUID) -> User:
+    async def get_user(cls, user_id: uuid.UUID, columns: Optional[Sequence[str]] = None) -> User:
         async with async_session_maker() as session:
-            db_user = await UserDao.find_one_or_none(session, id=user_id)
+            db_user = await UserDao.find_one_or_none(session, id=user_id, columns=columns)
             if db_user is None:
                 log.warning("User not found", extra={"user_id": str(user_id)})
                 raise HTTPException(status.HTTP_404_NOT_FOUND, detail="user not found")
             log.debug("User fetched", extra={"user_id": str(db_user.id)})
+            if columns:
+                return db_user
             return User(
                 id=db_user.id,
                 email=db_user.email,
@@ -70,7 +75,7 @@ class UserService:
                         exclude={'is_active', 'is_verified', 'is_superuser'},
                         exclude_unset=True
                     ),
-                    hashed_password=get_hashed_password(user.password)
+                    hashed_password=await asyncio.to_thread(get_hashed_password, user.password)
                 )
             else:
                 user_in = UserUpdateDB(**user.model_dump())
@@ -101,9 +106,16 @@ class UserService:
 
 
     @classmethod
-    async def get_users_list(cls, *filter, offset: int = 0, limit: int = 100, **filter_by) -> List[UserModel]:
+    async def get_users_list(
+            cls,
+            *filter,
+            offset: int = 0,
+            limit: int = 100,
+            columns: Optional[Sequence[str]] = None,
+            **filter_by
+    ) -> List[UserModel]:
         async with async_session_maker() as session:
-            users = await UserDao.find_all(session, offset, limit, *filter, **filter_by)
+            users = await UserDao.find_all(session, offset, limit, *filter, columns=columns, **filter_by)
         if users is None:
             log.warning("Users not found")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Users not found")
@@ -136,6 +148,10 @@ class UserService:
             if db_user is None:
                 log.warning("User not found for superuser deletion", extra={"user_id": str(user_id)})
             else:
+                # The FK cascade would drop the user's reviews and favorites
+                # without moving the counters of the events they point at.
+                await EventReviewsDao.delete_rated(session, EventReviewsModel.user_id == user_id)
+                await EventDao.delete_favorites(session, UserEventFavoritesModel.user_id == user_id)
                 await UserDao.delete(session, UserModel.id == user_id)
                 log.info("User deleted by superuser", extra={"user_id": str(user_id), "email": db_user.email})
             await session.commit()
@@ -145,28 +161,38 @@ class UserEventFavoritesService:
     @classmethod
     async def add_new_favorite(cls, user_id: uuid.UUID, event_id: uuid.UUID) -> UserEventFavorites:
         async with async_session_maker() as session:
-            favorite_exist = await UserEventFavoritesDao.find_one_or_none(session, user_id=user_id, event_id=event_id)
-
-            if favorite_exist:
-                log.warning("Event already in favorites", extra={"user_id": str(user_id), "event_id": str(event_id)})
-                raise HTTPException(status.HTTP_409_CONFLICT, "The event has already been added to favorites")
-
-            db_favorites = await UserEventFavoritesDao.add(
+            db_favorites = await UserEventFavoritesDao.add_if_absent(
                 session,
                 obj_in={
                     "user_id": user_id,
                     "event_id": event_id
-                }
+                },
+                conflict_columns=["user_id", "event_id"]
             )
+
+            if db_favorites is None:
+                log.warning("Event already in favorites", extra={"user_id": str(user_id), "event_id": str(event_id)})
+                raise HTTPException(status.HTTP_409_CONFLICT, "The event has already been added to favorites")
+
+            await EventDao.add_favorites(session, event_id, 1)
             await session.commit()
         log.debug("Added to favorite", extra={"user_id": str(user_id), "event_id": str(event_id)})
         return db_favorites
 
 
     @classmethod
-    async def get_favorites(cls, user_id: uuid.UUID, offset: int = 0, limit: int = 10) -> List[UserEventFavorites]:
+    async def get_favorites(
+            cls,
+            user_id: uuid.UUID,
+            offset: int = 0,
+            limit: int = 10,
+            embed_event: bool = False
+    ) -> List[UserEventFavorites]:
         async with async_session_maker() as session:
-            db_favorites = await UserEventFavoritesDao.find_all(session, offset, limit, user_id=user_id)
+            if embed_event:
+                db_favorites = await UserEventFavoritesDao.find_all_with_event(session, user_id, offset, limit)
+            else:
+                db_favorites = await UserEventFavoritesDao.find_all(session, offset, limit, user_id=user_id)
         log.debug("Favorites fetched", extra={"number_favorites": len(db_favorites)})
         return db_favorites
 
@@ -174,6 +200,15 @@ class UserEventFavoritesService:
     @classmethod
     async def delete_favorite(cls, user_id: uuid.UUID, event_id: uuid.UUID):
         async with async_session_maker() as session:
-            await UserEventFavoritesDao.delete(session, user_id=user_id, event_id=event_id)
+            deleted = await UserEventFavoritesDao.delete_where(
+                session,
+                UserEventFavoritesModel.user_id == user_id,
+                UserEventFavoritesModel.event_id == event_id,
+                returning=False
+            )
+            if not deleted:
+                log.warning("Favorite not found for deletion", extra={"user_id": str(user_id), "event_id": str(event_id)})
+                raise HTTPException(status.HTTP_404_NOT_FOUND, detail="The event is not in favorites")
+            await EventDao.add_favorites(session, event_id, -1)
             await session.commit()
         log.debug("Favorite deleted", extra={"user_id": str(user_id), "event_id": str(event_id)})
\ No newline at end of file
@@ -1,5 +1,5 @@
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, List
 import logging
 
 from aiobotocore.session import get_session
@@ -11,6 +11,8 @@ from app.config import settings
 
 log = logging.getLogger(__name__)
 
+S3_DELETE_BATCH_LIMIT = 1000
+
 
 class S3Client:
     def __init__(
@@ -108,14 +110,21 @@ class S3Client:
         log.info("Deleting multiple files from S3", extra={"count": len(object_names)})
         try:
             async with self._get_client() as client:
-                delete_payload = {
-                    "Objects": [{'Key': name} for name in object_names],
-                    "Quiet": True
-                }
-                await client.delete_objects(
-                    Bucket=self.bucket_name,
-                    Delete=delete_payload
-                )
+                for i in range(0, len(object_names), S3_DELETE_BATCH_LIMIT):
+                    batch = object_names[i:i + S3_DELETE_BATCH_LIMIT]
+                    delete_payload = {
+                        "Objects": [{'Key': name} for name in batch],
+                        "Quiet": True
+                    }
+                    response = await client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete=delete_payload
+                    )
+                    if response.get("Errors"):
+                        log.warning(
+                            "Some files were not deleted from S3",
+                            extra={"count": len(response["Errors"]), "first_key": response["Errors"][0].get("Key")}
+                        )
             log.info("Files deleted from S3 successfully", extra={"count": len(object_names)})
         except ClientError as e:
             log.error(f"S3 batch delete error: {str(e)}", extra={"count": len(object_names)})
@@ -128,4 +137,23 @@ class S3Client:
             raise HTTPException(
                 status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Unexpected S3 error"
-            )
\ No newline at end of file
+            )
+
+
+    async def iter_objects(self, prefix: str = "", page_size: int = 1000) -> AsyncIterator[List[dict]]:
+        """Yields the bucket listing one ``list_objects_v2`` page at a time,
+        so callers never hold more than ``page_size`` keys in memory."""
+        log.info("Listing files in S3", extra={"prefix": prefix, "page_size": page_size})
+        try:
+            async with self._get_client() as client:
+                paginator = client.get_paginator("list_objects_v2")
+                pages = paginator.paginate(
+                    Bucket=self.bucket_name,
+                    Prefix=prefix,
+                    PaginationConfig={"PageSize": page_size}
+                )
+                async for page in pages:
+                    yield page.get("Contents", [])
+        except ClientError as e:
+            log.error(f"S3 list error: {str(e)}", extra={"prefix": prefix})
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail="S3 list error")
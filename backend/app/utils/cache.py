@@ -0,0 +1,50 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[ValueType]):
+    """Bounded LRU cache whose entries carry their own expiry time.
+
+    Expiry is a ``time.time()`` timestamp so callers can pass token ``exp``
+    claims straight through. Expired entries are dropped on access; the
+    least recently used entry is evicted once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, ValueType]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[ValueType]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: ValueType, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
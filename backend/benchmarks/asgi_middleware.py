@@ -0,0 +1,95 @@
+"""Per-request overhead of request logging middleware.
+
+Drives a one-route FastAPI app directly through its ASGI interface (no
+sockets) in three variants: bare, the old ``@app.middleware("http")`` hook
+and ``RequestLoggingMiddleware``. Log records are handled by a
+``NullHandler`` so the numbers cover the middleware itself, not stderr:
+
+    python -m benchmarks.asgi_middleware --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI, Request
+
+from app.middleware import RequestLoggingMiddleware
+
+bench_log = logging.getLogger("benchmarks.asgi_middleware")
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/events/{event_id}")
+    async def get_event(event_id: int) -> dict:
+        return {"id": event_id, "name": "event"}
+
+    if variant == "http_middleware":
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            response = await call_next(request)
+            bench_log.info(
+                "method=%s path=%s status=%s",
+                request.method,
+                request.url.path,
+                response.status_code,
+                extra={"method": request.method, "path": request.url.path, "status": response.status_code}
+            )
+            return response
+    elif variant == "asgi_middleware":
+        app.add_middleware(RequestLoggingMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/events/1",
+        "raw_path": b"/events/1",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+async def run(requests: int) -> None:
+    for name in ("app.middleware", bench_log.name):
+        logger = logging.getLogger(name)
+        logger.handlers = [logging.NullHandler()]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    baseline = None
+    for variant in ("bare", "http_middleware", "asgi_middleware"):
+        per_request = await drive(build_app(variant), requests)
+        baseline = baseline or per_request
+        print(f"{variant:<16} {per_request * 1e6:8.1f}us/request  overhead={(per_request - baseline) * 1e6:+7.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
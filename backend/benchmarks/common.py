@@ -0,0 +1,31 @@
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50": statistics.median(ordered),
+        "p95": ordered[int(len(ordered) * 0.95) - 1],
+        "p99": ordered[int(len(ordered) * 0.99) - 1],
+        "max": ordered[-1],
+    }
+
+
+def print_report(name: str, samples: List[float]) -> None:
+    stats = percentiles(samples)
+    print(
+        f"{name:<40} n={len(samples):<6} "
+        + " ".join(f"{key}={value * 1000:.3f}ms" for key, value in stats.items())
+    )
+
+
+@contextmanager
+def stopwatch(samples: List[float]) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - started)
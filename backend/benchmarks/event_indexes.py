@@ -0,0 +1,109 @@
+"""Write and search latency on ``events`` with whatever indexes are in place.
+
+Run once before and once after ``alembic upgrade 9c3e7a1f4d20`` (the lean
+events indexes) against a throwaway database and compare the reports:
+
+    MODE=TEST python -m benchmarks.event_indexes --rows 1000000
+"""
+import argparse
+import asyncio
+import uuid
+
+from sqlalchemy import select, text
+
+from app.database import async_session_maker
+from app.events.dao import EventDao
+from app.events.models import EventModel
+from app.events.service import EventService
+from app.index_audit import search_shapes
+from app.utils.uuid7 import uuid7
+from benchmarks.common import print_report, stopwatch
+
+SEED_CHUNK = 200_000
+
+
+async def seed(rows: int, user_id: uuid.UUID) -> None:
+    async with async_session_maker() as session:
+        await session.execute(
+            text(
+                'INSERT INTO "user" (id, email, hashed_password, username, is_active, is_verified, is_superuser, is_organizer) '
+                "VALUES (:id, :email, '', 'bench', true, true, false, true)"
+            ),
+            {"id": user_id, "email": f"bench-{user_id}@example.com"}
+        )
+        for start in range(0, rows, SEED_CHUNK):
+            await session.execute(
+                text(
+                    "INSERT INTO events (id, name, description, address, latitude, longitude, capacity, environment, "
+                    "start, \"end\", age_rating, average_rating, count_reviews, is_active, user_id) "
+                    "SELECT gen_random_uuid(), 'event ' || md5(n::text), 'benchmark', :prefix || n, "
+                    "55 + random(), 37 + random(), 1 + (random() * 199)::int, "
+                    "(ARRAY['indoor', 'outdoor', 'semi_door'])[1 + (random() * 2)::int]::eventenvironment, "
+                    "now() + (random() * 400 - 200) * interval '1 day', now() + (random() * 400 - 199) * interval '1 day', "
+                    "1 + (random() * 17)::int, 1 + random() * 4, 0, random() < 0.3, :user_id "
+                    "FROM generate_series(:first, :last) AS n"
+                ),
+                {"prefix": f"bench-{user_id}-", "user_id": user_id, "first": start, "last": min(start + SEED_CHUNK, rows) - 1}
+            )
+            await session.commit()
+            print(f"seeded {min(start + SEED_CHUNK, rows)}/{rows}")
+        await session.execute(text("ANALYZE events"))
+        await session.commit()
+
+
+async def run(rows: int, samples: int, keep: bool) -> None:
+    user_id = uuid.uuid4()
+    await seed(rows, user_id)
+
+    async with async_session_maker() as session:
+        for shape, event in search_shapes().items():
+            timings = []
+            for offset in range(samples):
+                with stopwatch(timings):
+                    await EventDao.find_all(session, offset, 30, *EventService.search_filters(event))
+            print_report(f"search {shape}", timings)
+
+        timings = []
+        for n in range(samples):
+            with stopwatch(timings):
+                await EventDao.add(
+                    session,
+                    {
+                        "id": uuid7(), "name": f"insert {n}", "description": "benchmark",
+                        "address": f"bench-{user_id}-insert-{n}", "latitude": 55.7, "longitude": 37.6,
+                        "capacity": 100, "environment": "outdoor", "start": text("now()"), "end": text("now()"),
+                        "age_rating": 12, "is_active": True, "user_id": user_id,
+                    }
+                )
+                await session.commit()
+        print_report("insert", timings)
+
+        result = await session.execute(select(EventModel.id).filter(EventModel.user_id == user_id).limit(samples))
+        timings = []
+        for event_id in result.scalars().all():
+            with stopwatch(timings):
+                await EventDao.update_where(
+                    session,
+                    EventModel.id == event_id,
+                    obj_in={"capacity": 150, "average_rating": 4.5},
+                    returning=False
+                )
+                await session.commit()
+        print_report("update", timings)
+
+        size = await session.execute(text("SELECT pg_indexes_size('events')"))
+        print(f"events index size: {size.scalar() / 2 ** 20:.1f}MB")
+
+    if not keep:
+        async with async_session_maker() as session:
+            await session.execute(text('DELETE FROM "user" WHERE id = :id'), {"id": user_id})
+            await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.samples, args.keep))
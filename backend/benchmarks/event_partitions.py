@@ -0,0 +1,119 @@
+"""Search latency on a monthly range-partitioned events copy vs a flat one.
+
+Builds two scratch tables shaped like ``events`` (one plain, one
+partitioned by ``start`` month), fills both with the same rows and times
+the ``start >= X`` search the default listing issues, plus a lookup by id,
+on the partitioned copy both bare and with ``start`` read from a key table
+the way ``app.events.dao.event_key`` reads it from ``event_addresses``:
+
+    MODE=TEST python -m benchmarks.event_partitions --rows 10000000
+    MODE=TEST python -m benchmarks.event_partitions --rows 50000000
+
+The tables are dropped afterwards unless ``--keep`` is given.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.database import async_session_maker
+from app.events.partitions import add_months, month_start
+from benchmarks.common import print_report, stopwatch
+
+FLAT = "bench_events_flat"
+PARTITIONED = "bench_events_partitioned"
+KEYS = "bench_event_keys"
+SEED_CHUNK = 1_000_000
+SPAN_DAYS = 730
+
+COLUMNS = "id uuid NOT NULL, name varchar NOT NULL, start timestamptz NOT NULL, \"end\" timestamptz NOT NULL, is_active boolean NOT NULL"
+
+
+async def create_tables(session, now: datetime) -> None:
+    await session.execute(text(f"CREATE TABLE {FLAT} ({COLUMNS}, PRIMARY KEY (id))"))
+    await session.execute(text(f"CREATE TABLE {PARTITIONED} ({COLUMNS}, PRIMARY KEY (id, start)) PARTITION BY RANGE (start)"))
+
+    month = month_start(now - timedelta(days=SPAN_DAYS))
+    while month <= now:
+        upper = add_months(month, 1)
+        await session.execute(text(
+            f"CREATE TABLE {PARTITIONED}_{month:%Y_%m} PARTITION OF {PARTITIONED} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        month = upper
+    await session.execute(text(f"CREATE TABLE {PARTITIONED}_default PARTITION OF {PARTITIONED} DEFAULT"))
+
+
+async def seed(session, rows: int, now: datetime) -> None:
+    for first in range(0, rows, SEED_CHUNK):
+        last = min(first + SEED_CHUNK, rows) - 1
+        await session.execute(
+            text(
+                f"INSERT INTO {FLAT} SELECT gen_random_uuid(), 'event ' || n, "
+                ":now - random() * :span * interval '1 day' AS start, :now, true "
+                "FROM generate_series(:first, :last) AS n"
+            ),
+            {"now": now, "span": SPAN_DAYS, "first": first, "last": last}
+        )
+        await session.commit()
+        print(f"seeded {last + 1}/{rows}")
+    await session.execute(text(f"UPDATE {FLAT} SET \"end\" = start + interval '3 hours', is_active = start > :cutoff"),
+                          {"cutoff": now - timedelta(days=1)})
+    await session.execute(text(f"INSERT INTO {PARTITIONED} SELECT * FROM {FLAT}"))
+    await session.execute(text(f"CREATE TABLE {KEYS} AS SELECT id AS event_id, start FROM {FLAT}"))
+    await session.execute(text(f"ALTER TABLE {KEYS} ADD PRIMARY KEY (event_id)"))
+    await session.execute(text(f"ANALYZE {KEYS}"))
+    for table in (FLAT, PARTITIONED):
+        await session.execute(text(f"CREATE INDEX ON {table} (start) WHERE is_active"))
+        await session.execute(text(f"ANALYZE {table}"))
+    await session.commit()
+
+
+async def run(rows: int, samples: int, keep: bool) -> None:
+    now = datetime.now(timezone.utc)
+    async with async_session_maker() as session:
+        await create_tables(session, now)
+        await session.commit()
+        await seed(session, rows, now)
+
+        ids = (await session.execute(text(f"SELECT id FROM {FLAT} TABLESAMPLE SYSTEM (1) LIMIT :n"), {"n": samples})).scalars().all()
+        for table in (FLAT, PARTITIONED):
+            for days in (7, 90):
+                timings = []
+                for offset in range(samples):
+                    with stopwatch(timings):
+                        await session.execute(
+                            text(f"SELECT * FROM {table} WHERE is_active AND start >= :since ORDER BY start OFFSET :offset LIMIT 30"),
+                            {"since": now - timedelta(days=days), "offset": offset * 30 % 3000}
+                        )
+                print_report(f"{table} start>=-{days}d", timings)
+
+            timings = []
+            for event_id in ids:
+                with stopwatch(timings):
+                    await session.execute(text(f"SELECT * FROM {table} WHERE id = :id"), {"id": event_id})
+            print_report(f"{table} by id", timings)
+
+        timings = []
+        for event_id in ids:
+            with stopwatch(timings):
+                await session.execute(
+                    text(f"SELECT * FROM {PARTITIONED} WHERE id = :id AND start = (SELECT start FROM {KEYS} WHERE event_id = :id)"),
+                    {"id": event_id}
+                )
+        print_report(f"{PARTITIONED} by id+key", timings)
+
+    if not keep:
+        async with async_session_maker() as session:
+            await session.execute(text(f"DROP TABLE {FLAT}, {PARTITIONED}, {KEYS}"))
+            await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="leave the scratch tables in place")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.samples, args.keep))
@@ -0,0 +1,84 @@
+"""Top-N latency of event search per sort mode.
+
+Seeds ``events`` the way ``benchmarks.event_indexes`` does, gives the rows
+some review and favorite counts, then times the first and a deep page of
+``EventService.get_events``'s query for every ``EventSort``:
+
+    MODE=TEST python -m benchmarks.event_sorting --rows 1000000
+
+Pass ``--explain`` to print the plan of each first page; every mode should
+read a partial index in order and stop at LIMIT without a Sort node.
+"""
+import argparse
+import asyncio
+import json
+import uuid
+
+from sqlalchemy import select, text
+
+from app.database import async_session_maker
+from app.events.dao import EventDao
+from app.events.models import EventModel
+from app.events.schemas import EventSearch, EventSort
+from app.events.service import EventService
+from app.index_audit import compile_literal, plan_nodes
+from benchmarks.common import print_report, stopwatch
+from benchmarks.event_indexes import seed
+
+PAGE = 30
+
+
+def search(sort: EventSort) -> EventSearch:
+    location = {"latitude": 55.5, "longitude": 37.5} if sort == EventSort.distance else {}
+    return EventSearch(sort=sort, **location)
+
+
+async def run(rows: int, samples: int, explain: bool, keep: bool) -> None:
+    user_id = uuid.uuid4()
+    await seed(rows, user_id)
+
+    async with async_session_maker() as session:
+        await session.execute(
+            text(
+                "UPDATE events SET count_reviews = (random() * 2000)::int, count_favorites = (random() * 500)::int "
+                "WHERE user_id = :user_id"
+            ),
+            {"user_id": user_id}
+        )
+        await session.execute(text("ANALYZE events"))
+        await session.commit()
+
+        for sort in EventSort:
+            event = search(sort)
+            filters = EventService.search_filters(event)
+            order_by = EventService.search_order(event)
+
+            for offset in (0, 100 * PAGE):
+                timings = []
+                for _ in range(samples):
+                    with stopwatch(timings):
+                        await EventDao.find_all(session, offset, PAGE, *filters, order_by=order_by)
+                print_report(f"sort={sort.value} offset={offset}", timings)
+
+            if explain:
+                stmt = select(EventModel).filter(*filters).order_by(*order_by).limit(PAGE)
+                connection = await session.connection()
+                result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compile_literal(stmt)}")
+                plan = result.scalar()
+                plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+                print(f"    {' -> '.join(plan_nodes(plan))}")
+
+    if not keep:
+        async with async_session_maker() as session:
+            await session.execute(text('DELETE FROM "user" WHERE id = :id'), {"id": user_id})
+            await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--explain", action="store_true", help="print the plan of each sort mode")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.samples, args.explain, args.keep))
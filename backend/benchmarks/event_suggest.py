@@ -0,0 +1,53 @@
+"""Lookup latency and memory of the in-process event suggest index.
+
+Fills ``EventSuggestIndex`` with synthetic events (no database needed) and
+times prefix lookups of one to four characters:
+
+    python -m benchmarks.event_suggest --events 100000
+"""
+import argparse
+import random
+import string
+import uuid
+
+from app.events.suggest import EventSuggestIndex, Suggestion
+from benchmarks.common import print_report, stopwatch
+
+WORDS = ["summer", "jazz", "night", "festival", "open", "air", "concert", "market", "street", "food", "art", "kids"]
+
+
+def synthetic(count: int):
+    rng = random.Random(42)
+    for n in range(count):
+        name = " ".join(rng.sample(WORDS, 3))
+        address = f"{rng.choice(string.ascii_uppercase)}{''.join(rng.choices(string.ascii_lowercase, k=7))} street {n % 200}"
+        yield Suggestion(uuid.uuid4(), name, address)
+
+
+def run(events: int, samples: int) -> None:
+    index = EventSuggestIndex(max_entries=events * 16)
+    index.replace(synthetic(events))
+    print(f"events={len(index.events)} keys={len(index.entries)} approx={index.size_bytes / 2 ** 20:.1f}MB")
+
+    rng = random.Random(7)
+    for length in (1, 2, 3, 4):
+        timings = []
+        for _ in range(samples):
+            query = rng.choice(WORDS)[:length]
+            with stopwatch(timings):
+                index.search(query, 10)
+        print_report(f"search prefix len={length}", timings)
+
+    timings = []
+    for suggestion in synthetic(samples):
+        with stopwatch(timings):
+            index.put(suggestion)
+    print_report("put", timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.events, args.samples)
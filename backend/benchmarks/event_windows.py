@@ -0,0 +1,73 @@
+"""Time-window overlap search: ``during`` GiST index vs the two-column form.
+
+Seeds ``events`` the way ``benchmarks.event_indexes`` does, then times the
+same windows written as ``during && tstzrange(a, b)`` (what
+``EventService.search_filters`` issues) and as ``start < b AND "end" > a``
+(B-tree indexes on start and end), with and without a location box:
+
+    MODE=TEST python -m benchmarks.event_windows --rows 1000000
+"""
+import argparse
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, text
+
+from app.database import async_session_maker
+from app.events.dao import EventDao
+from app.events.models import EventModel
+from app.events.schemas import EventSearch
+from app.events.service import EventService, within_radius
+from benchmarks.common import print_report, stopwatch
+from benchmarks.event_indexes import seed
+
+WINDOWS = {"4h": timedelta(hours=4), "1d": timedelta(days=1), "7d": timedelta(days=7)}
+
+
+def two_column(start: datetime, end: datetime) -> list:
+    return [EventModel.is_active == True, and_(EventModel.start < end, EventModel.end > start)]
+
+
+async def run(rows: int, samples: int, keep: bool) -> None:
+    user_id = uuid.uuid4()
+    await seed(rows, user_id)
+    now = datetime.now(timezone.utc)
+
+    async with async_session_maker() as session:
+        for label, length in WINDOWS.items():
+            for near in (False, True):
+                location = {"latitude": 55.5, "longitude": 37.5, "radius_km": 10} if near else {}
+                name = f"{label}{' near' if near else ''}"
+
+                timings = []
+                for n in range(samples):
+                    start = now + timedelta(hours=n)
+                    event = EventSearch(upcoming=False, window_start=start, window_end=start + length, **location)
+                    with stopwatch(timings):
+                        await EventDao.find_all(session, 0, 30, *EventService.search_filters(event))
+                print_report(f"during && {name}", timings)
+
+                timings = []
+                for n in range(samples):
+                    start = now + timedelta(hours=n)
+                    filters = two_column(start, start + length)
+                    if near:
+                        filters.append(within_radius(**location))
+                    with stopwatch(timings):
+                        await EventDao.find_all(session, 0, 30, *filters)
+                print_report(f"start/end {name}", timings)
+
+    if not keep:
+        async with async_session_maker() as session:
+            await session.execute(text('DELETE FROM "user" WHERE id = :id'), {"id": user_id})
+            await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.samples, args.keep))
@@ -0,0 +1,113 @@
+"""Serialization cost of one page of ``/api/events/search``.
+
+Builds ``--page`` transient ``EventModel`` rows (no database) and times:
+
+* ``route-current``: a FastAPI route declared ``-> List[Event]`` returning
+  the rows, i.e. response-model validation plus stdlib ``json`` rendering;
+* ``route-renderer``: the same route returning ``ORMRenderer.response``;
+* ``type-adapter`` / ``orm-to-bytes``: the two ``ORMRenderer`` dump paths
+  on their own.
+
+    python -m benchmarks.list_serialization --page 100
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi import FastAPI
+
+from app.events.models import EventEnvironment, EventModel
+from app.events.schemas import Event
+from app.responses import ORMRenderer
+
+
+def make_rows(count: int) -> List[EventModel]:
+    start = datetime.now(timezone.utc)
+    return [
+        EventModel(
+            id=uuid.uuid4(),
+            name=f"Event {i}",
+            description="Open air concert in the central park " * 4,
+            address=f"Main street {i}",
+            latitude=55.75 + i / 1000,
+            longitude=37.61 + i / 1000,
+            capacity=150,
+            environment=EventEnvironment.outdoor,
+            start=start + timedelta(hours=i),
+            end=start + timedelta(hours=i + 3),
+            age_rating=12,
+            average_rating=4.5,
+            count_reviews=20,
+            is_active=True,
+            user_id=uuid.uuid4(),
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(rows: List[EventModel], renderer: ORMRenderer) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/current")
+    async def current() -> List[Event]:
+        return rows
+
+    @app.get("/renderer")
+    async def rendered() -> List[Event]:
+        return renderer.response(rows)
+
+    return app
+
+
+async def time_route(app: FastAPI, path: str, iterations: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / iterations
+
+
+def time_call(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+async def run(page: int, iterations: int) -> None:
+    rows = make_rows(page)
+    renderer = ORMRenderer(Event)
+    app = build_app(rows, renderer)
+
+    results = {
+        "route-current": await time_route(app, "/current", iterations),
+        "route-renderer": await time_route(app, "/renderer", iterations),
+        "type-adapter": time_call(lambda: renderer.dump_validated(rows), iterations),
+        "orm-to-bytes": time_call(lambda: renderer.dump_rows(rows), iterations),
+    }
+    baseline = results["route-current"]
+    for name, seconds in results.items():
+        print(f"{name:<16} {seconds * 1000:7.3f}ms/page  x{baseline / seconds:5.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.page, args.iterations))
@@ -0,0 +1,66 @@
+"""Logging throughput: caller-side cost per record and end-to-end drain time.
+
+Compares the colored formatter writing synchronously (the old setup), the
+JSON formatter writing synchronously, and the JSON formatter behind the
+queue used by ``set_logging``. Output goes to ``os.devnull``:
+
+    python -m benchmarks.logging_throughput --records 200000
+"""
+import argparse
+import logging
+import os
+import queue
+import time
+import uuid
+from logging.handlers import QueueListener
+
+from app.log_config import LOGGING_CONFIG, JsonFormatter, LogQueueHandler
+
+
+def colored_formatter() -> logging.Formatter:
+    import colorlog
+
+    options = LOGGING_CONFIG["formatters"]["colored"]
+    return colorlog.ColoredFormatter(options["format"], log_colors=options["log_colors"])
+
+
+def run_variant(name: str, formatter: logging.Formatter, queued: bool, records: int) -> None:
+    stream = open(os.devnull, "w")
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(formatter)
+
+    logger = logging.getLogger(f"benchmarks.logging.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    listener = None
+    if queued:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        logger.handlers = [LogQueueHandler(log_queue)]
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+    else:
+        logger.handlers = [handler]
+
+    user_id = uuid.uuid4()
+    started = time.perf_counter()
+    for i in range(records):
+        logger.info("Event fetched", extra={"event_id": user_id, "user_id": user_id, "count": i})
+    caller = time.perf_counter() - started
+
+    if listener is not None:
+        listener.stop()
+    total = time.perf_counter() - started
+    stream.close()
+
+    print(f"{name:<14} caller={caller / records * 1e6:6.2f}us/record  drained={records / total:>10,.0f} records/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    run_variant("colored-sync", colored_formatter(), False, args.records)
+    run_variant("json-sync", JsonFormatter(), False, args.records)
+    run_variant("json-queued", JsonFormatter(), True, args.records)
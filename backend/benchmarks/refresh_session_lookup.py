@@ -0,0 +1,90 @@
+"""Refresh-session lookup and purge latency on a large ``refresh_session`` table.
+
+Seeds the table through ``generate_series`` (about a third of the rows already
+expired), then times ``refresh_token`` lookups and one purge batch. Run it
+against a throwaway database only:
+
+    MODE=TEST python -m benchmarks.refresh_session_lookup --rows 10000000
+"""
+import argparse
+import asyncio
+import uuid
+
+from sqlalchemy import text
+
+from app.auth.dao import RefreshSessionDAO
+from app.auth.models import RefreshSessionModel
+from app.config import settings
+from app.database import async_session_maker
+from benchmarks.common import print_report, stopwatch
+
+SEED_CHUNK = 1_000_000
+
+
+async def seed(rows: int, user_id: uuid.UUID) -> None:
+    async with async_session_maker() as session:
+        await session.execute(
+            text(
+                'INSERT INTO "user" (id, email, hashed_password, username, is_active, is_verified, is_superuser, is_organizer) '
+                "VALUES (:id, :email, '', 'bench', true, true, false, false)"
+            ),
+            {"id": user_id, "email": f"bench-{user_id}@example.com"}
+        )
+        for start in range(0, rows, SEED_CHUNK):
+            await session.execute(
+                text(
+                    "INSERT INTO refresh_session (refresh_token, expires_in, expires_at, user_id) "
+                    "SELECT gen_random_uuid(), 2592000, now() + (random() * 45 - 15) * interval '1 day', :user_id "
+                    "FROM generate_series(1, :count)"
+                ),
+                {"user_id": user_id, "count": min(SEED_CHUNK, rows - start)}
+            )
+            await session.commit()
+            print(f"seeded {min(start + SEED_CHUNK, rows)}/{rows}")
+        await session.execute(text("ANALYZE refresh_session"))
+        await session.commit()
+
+
+async def run(rows: int, lookups: int, keep: bool) -> None:
+    user_id = uuid.uuid4()
+    await seed(rows, user_id)
+
+    async with async_session_maker() as session:
+        result = await session.execute(
+            text("SELECT refresh_token FROM refresh_session TABLESAMPLE SYSTEM (1) LIMIT :n"),
+            {"n": lookups}
+        )
+        tokens = result.scalars().all()
+
+        samples = []
+        for token in tokens:
+            with stopwatch(samples):
+                await RefreshSessionDAO.find_one_or_none(session, RefreshSessionModel.refresh_token == token)
+        print_report(f"lookup by refresh_token ({rows} rows)", samples)
+
+        plan = await session.execute(
+            text("EXPLAIN ANALYZE SELECT * FROM refresh_session WHERE refresh_token = :token"),
+            {"token": tokens[0]}
+        )
+        print("\n".join(plan.scalars().all()))
+
+    samples = []
+    async with async_session_maker() as session:
+        with stopwatch(samples):
+            deleted = await RefreshSessionDAO.purge_expired(session, settings.REFRESH_SESSION_PURGE_BATCH_SIZE)
+            await session.commit()
+    print_report(f"purge batch ({deleted} rows)", samples)
+
+    if not keep:
+        async with async_session_maker() as session:
+            await session.execute(text('DELETE FROM "user" WHERE id = :id'), {"id": user_id})
+            await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.lookups, args.keep))
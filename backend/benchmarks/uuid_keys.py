@@ -0,0 +1,85 @@
+"""Insert throughput, primary key index size and WAL volume: uuid4 vs uuid7 keys.
+
+Creates two scratch tables shaped like ``events_reviews`` and fills them in
+batches, one keyed by ``gen_random_uuid()`` and one by a UUIDv7 built in SQL
+from ``clock_timestamp()``. Also times the Python generators. Run it against
+a throwaway database only:
+
+    MODE=TEST python -m benchmarks.uuid_keys --rows 10000000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.database import async_session_maker
+from app.utils.uuid7 import uuid7
+
+BATCH = 100_000
+
+UUID7_SQL = (
+    "encode(set_bit(set_bit(overlay(uuid_send(gen_random_uuid()) "
+    "placing substring(int8send((extract(epoch from clock_timestamp()) * 1000)::bigint) from 3) "
+    "from 1 for 6), 52, 1), 53, 1), 'hex')::uuid"
+)
+
+
+def python_generators(count: int) -> None:
+    for name, generate in (("uuid.uuid4", uuid.uuid4), ("uuid7", uuid7)):
+        started = time.perf_counter()
+        for _ in range(count):
+            generate()
+        elapsed = time.perf_counter() - started
+        print(f"{name:<12} {elapsed / count * 1e9:.0f}ns per id")
+
+
+async def fill(table: str, id_sql: str, rows: int) -> None:
+    async with async_session_maker() as session:
+        await session.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        await session.execute(text(
+            f"CREATE TABLE {table} (id uuid PRIMARY KEY, event_id uuid NOT NULL, "
+            "rating int NOT NULL, content text NOT NULL, created_at timestamp DEFAULT now())"
+        ))
+        await session.commit()
+
+        wal_start = (await session.execute(text("SELECT pg_current_wal_lsn()"))).scalar()
+        started = time.perf_counter()
+        for start in range(0, rows, BATCH):
+            await session.execute(
+                text(
+                    f"INSERT INTO {table} (id, event_id, rating, content) "
+                    f"SELECT {id_sql}, gen_random_uuid(), 1 + (random() * 4)::int, 'benchmark review' "
+                    "FROM generate_series(1, :count)"
+                ),
+                {"count": min(BATCH, rows - start)}
+            )
+            await session.commit()
+        elapsed = time.perf_counter() - started
+
+        stats = (await session.execute(text(
+            "SELECT pg_relation_size(:index), "
+            "pg_wal_lsn_diff(pg_current_wal_lsn(), :wal_start)"
+        ), {"index": f"{table}_pkey", "wal_start": wal_start})).one()
+
+        print(
+            f"{table:<16} {rows / elapsed:>10.0f} rows/s  "
+            f"pkey={stats[0] / 2 ** 20:.0f}MiB  wal={stats[1] / 2 ** 20:.0f}MiB"
+        )
+        await session.execute(text(f"DROP TABLE {table}"))
+        await session.commit()
+
+
+async def run(rows: int) -> None:
+    await fill("bench_uuid4", "gen_random_uuid()", rows)
+    await fill("bench_uuid7", UUID7_SQL, rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--generate", type=int, default=1_000_000, help="ids per Python generator timing")
+    args = parser.parse_args()
+    python_generators(args.generate)
+    asyncio.run(run(args.rows))
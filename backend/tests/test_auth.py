@@ -103,6 +103,10 @@ async def test_abort_all():
         assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_jwks():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/api/auth/.well-known/jwks.json")
 
-
-
+        assert response.status_code == 200
+        assert "keys" in response.json()
@@ -0,0 +1,30 @@
+import sys, os; sys.path.append(os.path.dirname(__file__) + '/..')
+from datetime import datetime, timezone
+
+from app.events.partitions import (
+    add_months, month_start, months_to_create, partition_month, partition_name, partitions_to_detach
+)
+
+
+def test_month_arithmetic_wraps_years():
+    month = month_start(datetime(2026, 11, 17, 13, 5, tzinfo=timezone.utc))
+    assert month == datetime(2026, 11, 1, tzinfo=timezone.utc)
+    assert add_months(month, 2) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -11) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert partition_month(partition_name(month)) == month
+    assert partition_month("events_default") is None
+
+
+def test_months_to_create_skips_existing():
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    existing = ["events_default", "events_p2026_10", "events_p2026_12"]
+    assert months_to_create(existing, now, 3) == [
+        datetime(2026, 11, 1, tzinfo=timezone.utc),
+        datetime(2027, 1, 1, tzinfo=timezone.utc),
+    ]
+
+
+def test_partitions_to_detach_keeps_retention_window():
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    existing = ["events_default", "events_p2025_09", "events_p2025_10", "events_p2025_11"]
+    assert partitions_to_detach(existing, now, 12) == ["events_p2025_09"]
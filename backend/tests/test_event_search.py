@@ -0,0 +1,77 @@
+import sys, os; sys.path.append(os.path.dirname(__file__) + '/..')
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from app.events.models import EventEnvironment, EventModel
+from app.events.schemas import EventCreate, EventSearch, EventSort, EventUpdate
+from app.events.service import EventService
+from app.index_audit import compile_literal
+
+
+def where_clause(event: EventSearch) -> str:
+    return compile_literal(select(EventModel.id).filter(*EventService.search_filters(event))).split("WHERE", 1)[1]
+
+
+def test_window_and_location_filters_use_during_and_point():
+    now = datetime(2026, 10, 19, 18, tzinfo=timezone.utc)
+    sql = where_clause(EventSearch(window_start=now, window_end=now + timedelta(hours=4)))
+    assert "events.during && tstzrange('2026-10-19 18:00:00+00:00', '2026-10-19 22:00:00+00:00', '[)')" in sql
+
+    sql = where_clause(EventSearch(happening_now=True, latitude=55.75, longitude=37.62, radius_km=5))
+    assert "events.during @> now()" in sql
+    assert "point(events.longitude, events.latitude) <@ box(" in sql
+
+
+def test_search_rejects_bad_window_and_partial_location():
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    with pytest.raises(ValidationError):
+        EventSearch(window_start=now, window_end=now)
+    with pytest.raises(ValidationError):
+        EventSearch(latitude=55.75, radius_km=5)
+
+
+def test_clusters_reject_inverted_box():
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(EventService.get_clusters(40, 50, 30, 60, zoom=10))
+    assert error.value.status_code == 422
+
+
+def test_every_sort_mode_ends_on_id():
+    for sort in EventSort:
+        location = {"latitude": 55.75, "longitude": 37.62} if sort == EventSort.distance else {}
+        sql = compile_literal(select(EventModel.id).order_by(*EventService.search_order(EventSearch(sort=sort, **location))))
+        assert sql.rstrip().endswith(("events.id", "events.id DESC"))
+
+    with pytest.raises(ValidationError):
+        EventSearch(sort=EventSort.distance)
+
+
+def test_rating_sort_uses_bayesian_score():
+    sql = compile_literal(select(EventModel.id).order_by(*EventService.search_order(EventSearch(sort=EventSort.rating))))
+    assert "ORDER BY events.rating_score DESC NULLS LAST, events.id DESC" in sql
+
+
+def test_facet_key_ignores_sort_only_fields():
+    key = EventService.facet_key(EventSearch(name="fest"))
+    assert EventService.facet_key(EventSearch(name="fest", sort=EventSort.rating)) == key
+    assert EventService.facet_key(EventSearch(name="fest", sort=EventSort.distance, latitude=55.7, longitude=37.6)) == key
+    assert EventService.facet_key(EventSearch(name="fest", latitude=55.7, longitude=37.6, radius_km=5)) != key
+
+
+def test_event_must_not_end_before_it_starts():
+    fields = dict(
+        name="Concert", description="Open air", address="Arbat 10", latitude=55.75, longitude=37.59,
+        capacity=100, environment=EventEnvironment.outdoor, age_rating=12,
+    )
+    start = datetime(2026, 11, 1, 18, tzinfo=timezone.utc)
+    EventCreate(**fields, start=start, end=start)
+    with pytest.raises(ValidationError):
+        EventCreate(**fields, start=start, end=start - timedelta(hours=1))
+    with pytest.raises(ValidationError):
+        EventUpdate(start=start, end=start - timedelta(hours=1))
+    EventUpdate(end=start - timedelta(hours=1))
@@ -0,0 +1,114 @@
+import sys, os; sys.path.append(os.path.dirname(__file__) + '/..')
+import uuid
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.events.suggest import EventSuggestIndex, EventSuggestService, Suggestion
+
+
+def event(name, address="Tverskaya 1"):
+    return Suggestion(uuid.uuid4(), name, address)
+
+
+def test_search_matches_word_prefixes_case_insensitively():
+    index = EventSuggestIndex(max_entries=1000)
+    summer, jazz = event("Summer Fest"), event("Jazz night", "Arbat 10")
+    index.replace([summer, jazz])
+
+    assert index.search("sum", 10) == [summer]
+    assert index.search("FEST", 10) == [summer]
+    assert index.search("arb", 10) == [jazz]
+    assert index.search("  ", 10) == []
+
+
+def test_put_and_remove_keep_index_consistent():
+    index = EventSuggestIndex(max_entries=1000)
+    concert = event("Concert")
+    index.put(concert)
+    index.put(concert._replace(name="Opera"))
+
+    assert index.search("conc", 10) == []
+    assert [found.name for found in index.search("op", 10)] == ["Opera"]
+
+    index.put(concert, is_active=False)
+    assert index.entries == [] and index.events == {} and index.size_bytes == 0
+
+
+def test_index_stops_growing_at_max_entries():
+    index = EventSuggestIndex(max_entries=4)
+    index.replace([event("One", "A"), event("Two", "B"), event("Three", "C")])
+
+    assert len(index.events) == 2
+    assert len(index.entries) <= 4
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def all(self):
+        return self.value
+
+
+class FakeSession:
+    """Answers the ``localtimestamp`` query and then the event query with
+    ``rows``, recording the SQL of each statement."""
+
+    def __init__(self, now, rows, statements):
+        self.results = [now, rows]
+        self.statements = statements
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt))
+        return FakeResult(self.results.pop(0))
+
+
+def fake_session_maker(now, rows, statements):
+    @asynccontextmanager
+    async def session_maker():
+        yield FakeSession(now, rows, statements)
+    return session_maker
+
+
+def row(suggestion, is_active=True):
+    return SimpleNamespace(id=suggestion.id, name=suggestion.name, address=suggestion.address, is_active=is_active)
+
+
+def test_rebuild_then_sync_applies_changes_and_deactivations(monkeypatch):
+    monkeypatch.setattr(EventSuggestService, "synced_at", None)
+    index = EventSuggestIndex(max_entries=1000)
+    concert, opera = event("Concert"), event("Opera")
+    built_at = datetime(2026, 10, 20, 12, 0)
+    statements = []
+
+    assert asyncio.run(EventSuggestService.rebuild(index, fake_session_maker(built_at, [row(concert), row(opera)], statements))) == 2
+    assert EventSuggestService.synced_at == built_at
+    assert "events.is_active = true" in statements[-1]
+
+    renamed = concert._replace(name="Jazz night")
+    synced_at = built_at + timedelta(seconds=30)
+    changed = [row(renamed), row(opera, is_active=False)]
+    assert asyncio.run(EventSuggestService.sync(index, fake_session_maker(synced_at, changed, statements))) == 2
+
+    assert "events.updated_at >=" in statements[-1]
+    assert EventSuggestService.synced_at == synced_at
+    assert index.search("jazz", 10) == [renamed]
+    assert index.search("conc", 10) == []
+    assert index.search("opera", 10) == []
+
+
+def test_sync_without_previous_run_rebuilds(monkeypatch):
+    monkeypatch.setattr(EventSuggestService, "synced_at", None)
+    index = EventSuggestIndex(max_entries=1000)
+    concert = event("Concert")
+    statements = []
+
+    asyncio.run(EventSuggestService.sync(index, fake_session_maker(datetime(2026, 10, 20), [row(concert)], statements)))
+
+    assert "events.is_active = true" in statements[-1]
+    assert index.search("conc", 10) == [concert]
@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.dirname(__file__) + '/..')
+
+from app.index_audit import IndexInfo, find_redundant, find_unused, plan_nodes
+
+
+def index(name, columns, scans=10, is_unique=False, method="btree", predicate=None):
+    return IndexInfo("events", name, scans, 8192, is_unique, method, columns, predicate, f"INDEX {name}")
+
+
+def test_find_redundant():
+    indexes = [
+        index("events_pkey", [1], is_unique=True),
+        index("events_id_idx", [1]),
+        index("events_start_idx", [9]),
+        index("events_start_environment_idx", [9, 8]),
+        index("events_active_start_idx", [9], predicate="is_active"),
+        index("events_name_trgm_idx", [2], method="gin"),
+        index("events_name_idx", [2]),
+    ]
+
+    assert find_redundant(indexes) == {
+        "events_id_idx": "events_pkey",
+        "events_start_idx": "events_start_environment_idx",
+    }
+
+
+def test_find_unused_skips_constraints():
+    indexes = [
+        index("events_pkey", [1], scans=0, is_unique=True),
+        index("events_end_idx", [10], scans=0),
+        index("events_start_idx", [9], scans=3),
+    ]
+
+    assert [item.name for item in find_unused(indexes)] == ["events_end_idx"]
+
+
+def test_plan_nodes():
+    plan = {
+        "Node Type": "Limit",
+        "Plans": [{"Node Type": "Index Scan", "Index Name": "events_active_start_idx"}],
+    }
+
+    assert list(plan_nodes(plan)) == ["Limit", "Index Scan using events_active_start_idx"]
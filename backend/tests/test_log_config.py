@@ -0,0 +1,24 @@
+import sys, os; sys.path.append(os.path.dirname(__file__) + '/..')
+import logging
+
+from app.log_config import RateLimitFilter
+
+
+def warning(msg):
+    return logging.makeLogRecord({"name": "test", "levelno": logging.WARNING, "msg": msg})
+
+
+def test_repeated_warnings_are_suppressed_after_burst():
+    log_filter = RateLimitFilter(per_minute=1, burst=2)
+
+    assert [log_filter.filter(warning("same")) for _ in range(3)] == [True, True, False]
+    assert log_filter.filter(warning("other"))
+
+
+def test_buckets_are_bounded():
+    log_filter = RateLimitFilter(per_minute=1, burst=2, max_keys=100)
+
+    for i in range(1000):
+        log_filter.filter(warning(f"formatted {i}"))
+
+    assert len(log_filter.buckets) == 100
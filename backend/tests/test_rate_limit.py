@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.dirname(__file__) + '/..')
+
+import ipaddress
+
+import pytest
+
+from starlette.requests import Request
+
+from app.auth import rate_limit
+from app.auth.rate_limit import InMemoryRateLimitStore, LoginRateLimiter, client_ip
+from app.config import settings
+from app.exceptions import TooManyRequestsException
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_blocks_after_capacity():
+    store = InMemoryRateLimitStore(max_keys=10)
+
+    for _ in range(3):
+        assert await store.acquire("key", capacity=3, refill_per_second=0.1) == 0
+
+    assert await store.acquire("key", capacity=3, refill_per_second=0.1) > 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_keys_are_evicted():
+    store = InMemoryRateLimitStore(max_keys=2)
+
+    for key in ("a", "b", "c"):
+        await store.acquire(key, capacity=1, refill_per_second=0.1)
+
+    assert list(store.buckets) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_login_limited_by_email():
+    limiter = LoginRateLimiter(InMemoryRateLimitStore(max_keys=100))
+
+    for i in range(settings.LOGIN_RATE_LIMIT_EMAIL_CAPACITY):
+        await limiter.check(f"10.0.0.{i}", "User@example.com")
+
+    with pytest.raises(TooManyRequestsException):
+        await limiter.check("10.0.1.1", "user@example.com")
+
+
+@pytest.mark.asyncio
+async def test_successful_logins_are_refunded():
+    limiter = LoginRateLimiter(InMemoryRateLimitStore(max_keys=100))
+
+    for _ in range(settings.LOGIN_RATE_LIMIT_EMAIL_CAPACITY * 2):
+        await limiter.check("10.0.0.1", "user@example.com")
+        await limiter.succeeded("10.0.0.1", "user@example.com")
+
+
+def request(peer, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+
+def test_forwarded_for_only_trusted_from_configured_proxies(monkeypatch):
+    monkeypatch.setattr(rate_limit, "trusted_proxies", [ipaddress.ip_network("10.1.0.0/16")])
+
+    assert client_ip(request("203.0.113.5", "198.51.100.7")) == "203.0.113.5"
+    assert client_ip(request("10.1.0.2", "198.51.100.7")) == "198.51.100.7"
+    # The client can prepend anything; the hop the proxy appended wins.
+    assert client_ip(request("10.1.0.2", "1.2.3.4, 198.51.100.7, 10.1.0.3")) == "198.51.100.7"
+    assert client_ip(request("10.1.0.2")) == "10.1.0.2"
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.append(os.path.dirname(__file__) + '/..')
+
+import uuid
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.base_dao import BaseDAO
+from app.events.models import EventModel
+from app.events.schemas import Event
+from app.responses import ORMRenderer
+
+
+class EventDao(BaseDAO):
+    model = EventModel
+
+
+def test_sparse_fieldset_columns():
+    renderer = ORMRenderer(Event, EventModel)
+
+    assert renderer.columns(None) is None
+    assert renderer.columns("start, name,latitude") == ("name", "latitude", "start", "id")
+
+    with pytest.raises(HTTPException) as exc:
+        renderer.columns("name,photo_path")
+    assert exc.value.status_code == 422
+
+
+def test_sparse_fieldset_render():
+    renderer = ORMRenderer(Event, EventModel)
+    columns = renderer.columns("name,latitude,longitude")
+    trimmed = renderer.only(columns)
+
+    assert trimmed is renderer.only(columns)
+    assert tuple(trimmed.schema.model_fields) == columns
+
+    row = EventModel(id=uuid.uuid4(), name="Concert", latitude=1.5, longitude=2.5, description="x" * 200)
+    assert orjson.loads(trimmed.dump_row(row)) == {
+        "name": "Concert",
+        "latitude": 1.5,
+        "longitude": 2.5,
+        "id": str(row.id),
+    }
+
+    stmt = EventDao._select(columns)
+    assert [column.name for column in stmt.selected_columns] == list(columns)
+
+
+def test_nested_schema_render():
+    from app.users.models import UserEventFavoritesModel
+    from app.users.schemas import UserEventFavoritesWithEvent
+
+    favorite = UserEventFavoritesModel(id=uuid.uuid4(), user_id=uuid.uuid4(), event_id=uuid.uuid4())
+    favorite.event = EventModel(id=favorite.event_id, name="Concert")
+
+    data = orjson.loads(ORMRenderer(UserEventFavoritesWithEvent).dump_rows([favorite]))
+    assert data[0]["event_id"] == data[0]["event"]["id"] == str(favorite.event_id)
+    assert data[0]["event"]["name"] == "Concert"
+
+
+def test_row_with_extras_render():
+    from app.responses import RowWithExtras
+
+    renderer = ORMRenderer(Event, EventModel)
+    columns = renderer.columns("name") + ("cover_photo", "is_favorite")
+    row = RowWithExtras(EventModel(id=uuid.uuid4(), name="Concert"), cover_photo="https://s3/cover.png", is_favorite=False)
+
+    assert orjson.loads(renderer.only(columns).dump_row(row)) == {
+        "name": "Concert",
+        "id": str(row.id),
+        "cover_photo": "https://s3/cover.png",
+        "is_favorite": False,
+    }
+
+
+def test_response_page_wraps_items():
+    renderer = ORMRenderer(Event, EventModel).only(("id", "name"))
+    row = EventModel(id=uuid.uuid4(), name="Concert")
+    facets = {"environment": {}, "age_rating": {"12": 1}, "rating": {"unrated": 1}}
+
+    assert orjson.loads(renderer.response_page([row], facets=facets).body) == {
+        "items": [{"id": str(row.id), "name": "Concert"}],
+        "facets": facets,
+    }
+
+
+def test_missing_attribute_fails_unless_declared_extra():
+    row = EventModel(id=uuid.uuid4(), name="Concert")
+    data = orjson.loads(ORMRenderer(Event, EventModel).dump_row(row))
+    assert data["cover_photo"] is None and data["photo_path"] is None
+
+    from app.events.schemas import EventCluster
+    with pytest.raises(AttributeError):
+        ORMRenderer(EventCluster).dump_row(row)
@@ -0,0 +1,113 @@
+import sys, os; sys.path.append(os.path.dirname(__file__) + '/..')
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.services.S3_service import EventPhotoService
+
+
+class FakeS3Client:
+    def __init__(self, pages):
+        self.pages = pages
+        self.prefixes = []
+        self.deleted = []
+
+    async def iter_objects(self, prefix="", page_size=1000):
+        self.prefixes.append(prefix)
+        for page in self.pages:
+            yield page
+
+    async def delete_files(self, object_names):
+        self.deleted.extend(object_names)
+
+
+class FakeResult:
+    def __init__(self, names):
+        self.names = names
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self.names)
+
+
+class FakeSession:
+    """Answers ``find_existing_object_names`` with the keys it was given
+    that are in ``known``."""
+
+    def __init__(self, known):
+        self.known = known
+
+    async def execute(self, stmt):
+        names = stmt.compile().params.values()
+        requested = {name for value in names for name in (value if isinstance(value, list) else [value])}
+        return FakeResult(requested & self.known)
+
+
+def fake_session_maker(known):
+    @asynccontextmanager
+    async def session_maker():
+        yield FakeSession(known)
+    return session_maker
+
+
+def obj(key, age_hours):
+    return {"Key": key, "LastModified": datetime.now(timezone.utc) - timedelta(hours=age_hours)}
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setattr(settings, "S3_GC_DELETE_PAUSE_SECONDS", 0)
+    monkeypatch.setattr(settings, "S3_GC_MIN_AGE_HOURS", 24)
+    client = FakeS3Client([
+        [obj("photos/a.png", 48), obj("photos/b.png", 48), obj("photos/new.png", 1)],
+        [obj("photos/c.png", 30), obj("photos/d.png", 25)],
+    ])
+
+    @asynccontextmanager
+    async def get_s3_client():
+        yield client
+
+    monkeypatch.setattr(EventPhotoService, "_get_s3_client", get_s3_client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_orphans_are_old_objects_without_rows(s3_client):
+    known = {"photos/a.png", "photos/d.png"}
+    report = await EventPhotoService.collect_orphans(False, fake_session_maker(known))
+
+    assert s3_client.prefixes == [settings.S3_PHOTO_PREFIX]
+    assert s3_client.deleted == ["photos/b.png", "photos/c.png"]
+    assert report["scanned"] == 5
+    assert report["skipped_recent"] == 1
+    assert report["orphaned"] == report["deleted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_objects_younger_than_min_age_are_kept(s3_client, monkeypatch):
+    monkeypatch.setattr(settings, "S3_GC_MIN_AGE_HOURS", 36)
+    report = await EventPhotoService.collect_orphans(False, fake_session_maker(set()))
+
+    assert s3_client.deleted == ["photos/a.png", "photos/b.png"]
+    assert report["skipped_recent"] == 3
+
+
+@pytest.mark.asyncio
+async def test_dry_run_by_default_deletes_nothing(s3_client):
+    report = await EventPhotoService.collect_orphans(session_maker=fake_session_maker(set()))
+
+    assert s3_client.deleted == []
+    assert report["dry_run"] and report["orphaned"] == 4 and report["deleted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_refuses_to_run_without_prefix(s3_client, monkeypatch):
+    monkeypatch.setattr(settings, "S3_PHOTO_PREFIX", "")
+
+    with pytest.raises(ValueError):
+        await EventPhotoService.collect_orphans(False, fake_session_maker(set()))
+    assert s3_client.prefixes == []
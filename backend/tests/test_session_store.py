@@ -0,0 +1,129 @@
+import sys
+import os
+sys.path.append(os.path.dirname(__file__) + '/..')
+
+import uuid
+import asyncio
+from datetime import timedelta
+
+import fakeredis
+import pytest
+
+from app.auth.session_store import InMemorySessionStore, RedisSessionStore
+from app.config import settings
+from app.exceptions import InvalidTokenException, TokenExpiredException
+
+
+@pytest.mark.asyncio
+async def test_rotate_refresh_token():
+    store = InMemorySessionStore()
+    user_id, token, new_token = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    await store.create(user_id, token, timedelta(days=1))
+
+    assert await store.rotate(token, new_token, timedelta(days=1)) == user_id
+    with pytest.raises(InvalidTokenException):
+        await store.rotate(token, uuid.uuid4(), timedelta(days=1))
+
+
+@pytest.mark.asyncio
+async def test_rotate_expired_refresh_token():
+    store = InMemorySessionStore()
+    token = uuid.uuid4()
+
+    await store.create(uuid.uuid4(), token, timedelta(seconds=-1))
+
+    with pytest.raises(TokenExpiredException):
+        await store.rotate(token, uuid.uuid4(), timedelta(days=1))
+
+
+@pytest.mark.asyncio
+async def test_sessions_per_user_cap():
+    store = InMemorySessionStore()
+    user_id = uuid.uuid4()
+    tokens = [uuid.uuid4() for _ in range(settings.REFRESH_SESSIONS_PER_USER + 1)]
+
+    for token in tokens:
+        await store.create(user_id, token, timedelta(days=1))
+
+    assert await store.revoke(tokens[0]) is None
+    assert await store.revoke(tokens[-1]) == user_id
+
+
+@pytest.mark.asyncio
+async def test_revoke_all():
+    store = InMemorySessionStore()
+    user_id, token = uuid.uuid4(), uuid.uuid4()
+
+    await store.create(user_id, token, timedelta(days=1))
+    await store.revoke_all(user_id)
+
+    with pytest.raises(InvalidTokenException):
+        await store.rotate(token, uuid.uuid4(), timedelta(days=1))
+
+
+@pytest.fixture
+def redis_store():
+    return RedisSessionStore(redis=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+@pytest.mark.asyncio
+async def test_redis_create_and_rotate(redis_store):
+    user_id, token, new_token = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    await redis_store.create(user_id, token, timedelta(days=1))
+
+    assert await redis_store.rotate(token, new_token, timedelta(days=1)) == user_id
+    assert await redis_store.redis.zrange(redis_store._user_key(user_id), 0, -1) == [str(new_token)]
+    with pytest.raises(InvalidTokenException):
+        await redis_store.rotate(token, uuid.uuid4(), timedelta(days=1))
+
+
+@pytest.mark.asyncio
+async def test_redis_sessions_per_user_cap(redis_store):
+    user_id = uuid.uuid4()
+    tokens = [uuid.uuid4() for _ in range(settings.REFRESH_SESSIONS_PER_USER + 1)]
+
+    for token in tokens:
+        await redis_store.create(user_id, token, timedelta(days=1))
+
+    assert await redis_store.redis.get(redis_store._token_key(tokens[0])) is None
+    assert await redis_store.redis.zcard(redis_store._user_key(user_id)) == settings.REFRESH_SESSIONS_PER_USER
+    assert await redis_store.revoke(tokens[0]) is None
+    assert await redis_store.revoke(tokens[-1]) == user_id
+
+
+@pytest.mark.asyncio
+async def test_redis_expired_token_is_invalid(redis_store):
+    token = uuid.uuid4()
+
+    await redis_store.create(uuid.uuid4(), token, timedelta(seconds=1))
+    await asyncio.sleep(1.1)
+
+    with pytest.raises(InvalidTokenException):
+        await redis_store.rotate(token, uuid.uuid4(), timedelta(days=1))
+
+
+@pytest.mark.asyncio
+async def test_redis_revoke(redis_store):
+    user_id, token, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    await redis_store.create(user_id, token, timedelta(days=1))
+    await redis_store.create(user_id, other, timedelta(days=1))
+
+    assert await redis_store.revoke(token) == user_id
+    assert await redis_store.revoke(token) is None
+    assert await redis_store.redis.zrange(redis_store._user_key(user_id), 0, -1) == [str(other)]
+
+
+@pytest.mark.asyncio
+async def test_redis_revoke_all(redis_store):
+    user_id, tokens = uuid.uuid4(), [uuid.uuid4(), uuid.uuid4()]
+
+    for token in tokens:
+        await redis_store.create(user_id, token, timedelta(days=1))
+    await redis_store.revoke_all(user_id)
+
+    assert await redis_store.redis.keys("*") == []
+    with pytest.raises(InvalidTokenException):
+        await redis_store.rotate(tokens[0], uuid.uuid4(), timedelta(days=1))
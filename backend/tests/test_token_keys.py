@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.append(os.path.dirname(__file__) + '/..')
+
+import time
+
+import jwt
+import pytest
+
+from app.auth.keys import TokenKeyRing, generate_private_key
+
+
+def make_key(tmp_path, name: str, algorithm: str) -> str:
+    path = tmp_path / name
+    path.write_bytes(generate_private_key(algorithm))
+    return str(path)
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "EdDSA"])
+def test_asymmetric_round_trip(tmp_path, algorithm):
+    keys = TokenKeyRing(algorithm, "secret", make_key(tmp_path, "key.pem", algorithm), cache_size=10)
+
+    token = keys.encode({"sub": "user", "exp": int(time.time()) + 60})
+
+    assert jwt.get_unverified_header(token)["kid"] == keys.kid
+    assert keys.decode(token)["sub"] == "user"
+    assert keys.jwks()["keys"][0]["kid"] == keys.kid
+
+
+def test_rotated_key_still_verifies(tmp_path):
+    old_key = make_key(tmp_path, "old.pem", "EdDSA")
+    new_key = make_key(tmp_path, "new.pem", "EdDSA")
+    token = TokenKeyRing("EdDSA", "secret", old_key).encode({"sub": "user", "exp": int(time.time()) + 60})
+
+    keys = TokenKeyRing("EdDSA", "secret", new_key, public_key_files=[old_key])
+
+    assert keys.decode(token)["sub"] == "user"
+    assert len(keys.jwks()["keys"]) == 2
+    with pytest.raises(jwt.InvalidTokenError):
+        TokenKeyRing("EdDSA", "secret", new_key).decode(token)
+
+
+def test_expired_token_is_not_served_from_cache():
+    keys = TokenKeyRing("HS256", "secret", cache_size=10)
+    token = keys.encode({"sub": "user", "exp": int(time.time()) - 1})
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        keys.decode(token)
+    assert len(keys._cache) == 0
@@ -0,0 +1,29 @@
+import sys
+import os
+sys.path.append(os.path.dirname(__file__) + '/..')
+
+import time
+import uuid
+from datetime import timezone
+
+from app.utils.uuid7 import uuid7, uuid7_timestamp
+
+
+def test_uuid7_layout():
+    value = uuid7()
+
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert abs(uuid7_timestamp(value).timestamp() - time.time()) < 1
+
+
+def test_uuid7_is_monotonic():
+    values = [uuid7() for _ in range(20000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_timestamp_ignores_other_versions():
+    assert uuid7_timestamp(uuid.uuid4()) is None
+    assert uuid7_timestamp(uuid7()).tzinfo is timezone.utc